@@ -0,0 +1,183 @@
+import random
+from datetime import datetime, timedelta
+
+# Synthetic football-data.org v4 responses for benchmarking. Payloads carry
+# the fields the transforms read, shaped like the real API: a double
+# round-robin season per competition, standings computed from its results,
+# and a top-scorers list. Output is deterministic for a given seed.
+
+FIRST_SEASON = 2015
+KICKOFF_HOURS = (12, 14, 15, 17, 19, 20)
+NATIONALITIES = ["England", "Spain", "Germany", "France", "Brazil", "Argentina", "Portugal", "Netherlands"]
+
+
+def round_robin(team_ids: list) -> list:
+    """Double round-robin fixture list as [(matchday, home_id, away_id), ...] (circle method)"""
+    teams = list(team_ids)
+    if len(teams) % 2:
+        teams.append(None)
+    rounds = len(teams) - 1
+    half = len(teams) // 2
+
+    fixtures = []
+    for matchday in range(1, rounds + 1):
+        for i in range(half):
+            home, away = teams[i], teams[-1 - i]
+            if home is None or away is None:
+                continue
+            if matchday % 2 == 0:
+                home, away = away, home
+            fixtures.append((matchday, home, away))
+            fixtures.append((matchday + rounds, away, home))
+        teams.insert(1, teams.pop())
+    return sorted(fixtures)
+
+
+def _goals(rng: random.Random) -> int:
+    return rng.choices(range(6), weights=(26, 33, 23, 11, 5, 2))[0]
+
+
+def generate_teams(competition_index: int, teams_per_competition: int) -> list:
+    """Teams keep their ids across seasons, as they do in the real API"""
+    teams = []
+    for number in range(1, teams_per_competition + 1):
+        name = f"Synthetic {competition_index} FC {number}"
+        teams.append({
+            "id": competition_index * 1000 + number,
+            "name": name,
+            "shortName": f"S{competition_index} {number}",
+            "tla": f"S{number:02d}",
+            "area": {"name": NATIONALITIES[competition_index % len(NATIONALITIES)]},
+            "founded": 1860 + (number * 7) % 120,
+            "venue": f"{name} Stadium",
+            "clubColors": "Red / White",
+            "website": f"http://www.synthetic-{competition_index}-{number}.example",
+        })
+    return teams
+
+
+def generate_matches(rng: random.Random, teams: list, season: dict, first_match_id: int) -> list:
+    names = {team["id"]: team["name"] for team in teams}
+    season_start = datetime.fromisoformat(season["startDate"])
+
+    matches = []
+    for offset, (matchday, home_id, away_id) in enumerate(round_robin(list(names))):
+        kickoff = season_start + timedelta(days=7 * (matchday - 1) + offset % 3,
+                                           hours=rng.choice(KICKOFF_HOURS))
+        home_ht, away_ht = _goals(rng) // 2, _goals(rng) // 2
+        home_ft, away_ft = home_ht + _goals(rng) // 2, away_ht + _goals(rng) // 2
+        if home_ft > away_ft:
+            winner = "HOME_TEAM"
+        elif away_ft > home_ft:
+            winner = "AWAY_TEAM"
+        else:
+            winner = "DRAW"
+        matches.append({
+            "id": first_match_id + offset,
+            "season": {"id": season["id"]},
+            "matchday": matchday,
+            "stage": "REGULAR_SEASON",
+            "utcDate": kickoff.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "status": "FINISHED",
+            "homeTeam": {"id": home_id, "name": names[home_id]},
+            "awayTeam": {"id": away_id, "name": names[away_id]},
+            "score": {
+                "fullTime": {"home": home_ft, "away": away_ft},
+                "halfTime": {"home": home_ht, "away": away_ht},
+                "winner": winner,
+                "duration": "REGULAR",
+            },
+            "referees": [{"name": f"Referee {rng.randint(1, 40)}"}],
+        })
+    return matches
+
+
+def generate_standings(teams: list, matches: list) -> list:
+    """TOTAL standings table computed from the season's results"""
+    table = {
+        team["id"]: {"team": {"id": team["id"], "name": team["name"]}, "playedGames": 0, "won": 0,
+                     "draw": 0, "lost": 0, "goalsFor": 0, "goalsAgainst": 0, "results": []}
+        for team in teams
+    }
+    for match in matches:
+        full_time = match["score"]["fullTime"]
+        sides = ((match["homeTeam"]["id"], full_time["home"], full_time["away"]),
+                 (match["awayTeam"]["id"], full_time["away"], full_time["home"]))
+        for team_id, scored, conceded in sides:
+            row = table[team_id]
+            row["playedGames"] += 1
+            row["goalsFor"] += scored
+            row["goalsAgainst"] += conceded
+            result = "W" if scored > conceded else "L" if scored < conceded else "D"
+            row["won" if result == "W" else "lost" if result == "L" else "draw"] += 1
+            row["results"].append(result)
+
+    rows = []
+    for row in table.values():
+        results = row.pop("results")
+        row["goalDifference"] = row["goalsFor"] - row["goalsAgainst"]
+        row["points"] = row["won"] * 3 + row["draw"]
+        row["form"] = ",".join(reversed(results[-5:])) or None
+        rows.append(row)
+    rows.sort(key=lambda r: (-r["points"], -r["goalDifference"], -r["goalsFor"], r["team"]["id"]))
+    for position, row in enumerate(rows, start=1):
+        row["position"] = position
+    return [{"stage": "REGULAR_SEASON", "type": "TOTAL", "table": rows}]
+
+
+def generate_scorers(rng: random.Random, teams: list, played: int, limit: int = 10) -> list:
+    candidates = []
+    for team in teams:
+        for slot in range(2):
+            candidates.append({
+                "player": {
+                    "id": team["id"] * 10 + slot,
+                    "name": f"Player {team['id']}-{slot}",
+                    "nationality": rng.choice(NATIONALITIES),
+                },
+                "team": {"id": team["id"], "name": team["name"]},
+                "goals": rng.randint(0, played // 2),
+                "assists": rng.choice([None, rng.randint(0, played // 3)]),
+                "penalties": rng.choice([None, rng.randint(0, 5)]),
+                "playedMatches": rng.randint(played // 2, played),
+            })
+    candidates.sort(key=lambda s: (-s["goals"], s["player"]["id"]))
+    return candidates[:limit]
+
+
+def generate_competition_season(competition_index: int, season_index: int,
+                                teams_per_competition: int = 20, seed: int = 0) -> dict:
+    """One competition-season as {endpoint: payload}, like one entry of FootballAPIClient.extract_all"""
+    rng = random.Random(f"{seed}:{competition_index}:{season_index}")
+    year = FIRST_SEASON + season_index
+    competition = {"id": 9000 + competition_index, "name": f"Synthetic League {competition_index}"}
+    season = {
+        "id": 90000 + competition_index * 100 + season_index,
+        "startDate": f"{year}-08-09",
+        "endDate": f"{year + 1}-05-24",
+    }
+
+    teams = generate_teams(competition_index, teams_per_competition)
+    first_match_id = 10_000_000 + (competition_index * 100 + season_index) * 1000
+    matches = generate_matches(rng, teams, season, first_match_id)
+    played = 2 * (teams_per_competition - 1)
+
+    return {
+        "teams": {"competition": competition, "season": season, "teams": teams},
+        "matches": {"competition": competition, "matches": matches},
+        "standings": {"competition": competition, "season": season,
+                      "standings": generate_standings(teams, matches)},
+        "scorers": {"competition": competition, "season": season,
+                    "scorers": generate_scorers(rng, teams, played)},
+    }
+
+
+def generate_payloads(competitions: int, seasons: int, teams_per_competition: int = 20, seed: int = 0) -> dict:
+    """N competitions x M seasons, keyed 'SYN<competition>_<season year>'"""
+    return {
+        f"SYN{competition_index}_{FIRST_SEASON + season_index}": generate_competition_season(
+            competition_index, season_index, teams_per_competition, seed
+        )
+        for competition_index in range(1, competitions + 1)
+        for season_index in range(seasons)
+    }
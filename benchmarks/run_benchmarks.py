@@ -0,0 +1,263 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from date_dimension import ensure_calendar, payload_date_range
+from frames import persist, row_count, union_all, unpersist
+from schemas import KEY_COLUMNS
+from validators import validate_dataframe
+from payload_generator import generate_payloads
+
+logger = logging.getLogger(__name__)
+
+# Benchmarks the transform engines, validation and the loader backends on
+# synthetic payloads, appending one JSON line per (operation, engine) to a
+# results file so runs from different commits can be compared.
+
+RESULTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results.jsonl')
+
+# transform method -> (endpoint payload it reads, output table, id column validated as in the pipeline)
+TRANSFORMS = {
+    "transform_teams": ("teams", "dim_teams", "team_id"),
+    "transform_matches": ("matches", "fact_matches", "match_id"),
+    "transform_standings": ("standings", "standings_snapshot", "team_id"),
+    "transform_scorers": ("scorers", "dim_scorers", "player_id"),
+}
+
+# output table -> loader method
+LOADS = {
+    "dim_teams": "load_dim_teams",
+    "fact_matches": "load_fact_matches",
+    "standings_snapshot": "load_standings",
+    "dim_scorers": "load_scorers",
+}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def make_transformer(engine: str):
+    if engine == "pandas":
+        from pandas_transformer import PandasDataTransformer
+        return PandasDataTransformer()
+    from data_transformer import FootballDataTransformer
+    return FootballDataTransformer()
+
+
+def make_loader(backend: str, spark):
+    if backend == "copy":
+        from copy_loader import PostgresCopyLoader
+        return PostgresCopyLoader(spark=spark)
+    from data_loader import PostgresDataLoader
+    return PostgresDataLoader(spark=spark)
+
+
+def setup_database(loader) -> None:
+    """
+    Create the warehouse tables in the stand-in database from create_tables.sql,
+    then apply the migrations the loaders depend on (partitioned fact_matches,
+    its merge key, date_id)
+    """
+    from migrate import apply_migrations
+    with open(os.path.join(SCRIPTS_DIR, 'create_tables.sql'), encoding='utf-8') as f:
+        ddl = f.read()
+    with loader.connection() as conn:
+        with conn, conn.cursor() as cur:
+            cur.execute(ddl)
+    apply_migrations(loader)
+    logger.info("Benchmark tables created")
+
+
+class Timings:
+    """Collects repeated measurements of each operation"""
+
+    def __init__(self):
+        self.samples = {}
+
+    def add(self, operation: str, seconds: float, rows: int) -> None:
+        entry = self.samples.setdefault(operation, {"seconds": [], "rows": rows})
+        entry["seconds"].append(seconds)
+
+    def records(self, context: dict) -> list:
+        records = []
+        for operation, entry in self.samples.items():
+            median = statistics.median(entry["seconds"])
+            records.append({
+                **context,
+                "operation": operation,
+                "rows": entry["rows"],
+                "repeat": len(entry["seconds"]),
+                "median_seconds": round(median, 6),
+                "min_seconds": round(min(entry["seconds"]), 6),
+                "max_seconds": round(max(entry["seconds"]), 6),
+                "rows_per_second": round(entry["rows"] / median, 1) if median else None,
+            })
+        return records
+
+
+def run_once(transformer, payloads: dict, timings: Timings, loader=None) -> None:
+    """
+    One pass over every competition-season: transform, validate, then load.
+
+    A transform is timed together with a row count so Spark's lazy plan is
+    actually executed; validation then runs against the persisted output,
+    as it does in the pipeline. Dates are handled as in the pipeline too:
+    the payloads' date range, then ensure_calendar when loading.
+    """
+    outputs = {table: [] for table in LOADS}
+    totals = {name: [0.0, 0] for name in list(TRANSFORMS) + ["validate_dataframe"]}
+
+    try:
+        for label, unit in payloads.items():
+            for method, (endpoint, table, id_column) in TRANSFORMS.items():
+                start = time.perf_counter()
+                df = persist(getattr(transformer, method)(unit[endpoint]))
+                rows = row_count(df)
+                totals[method][0] += time.perf_counter() - start
+                totals[method][1] += rows
+                outputs[table].append(df)
+
+                start = time.perf_counter()
+                validate_dataframe(df, id_column, label, key_columns=KEY_COLUMNS[table])
+                totals["validate_dataframe"][0] += time.perf_counter() - start
+                totals["validate_dataframe"][1] += rows
+
+        for operation, (seconds, rows) in totals.items():
+            timings.add(operation, seconds, rows)
+
+        if loader is None:
+            return
+        # Later passes find the calendar in place, so they time the no-op check
+        start = time.perf_counter()
+        days = ensure_calendar(loader, payload_date_range(payloads))
+        timings.add("ensure_calendar", time.perf_counter() - start, days)
+        for table, method in LOADS.items():
+            df = union_all(outputs[table])
+            rows = row_count(df)
+            start = time.perf_counter()
+            getattr(loader, method)(df, count=rows)
+            timings.add(method, time.perf_counter() - start, rows)
+    finally:
+        for dfs in outputs.values():
+            for df in dfs:
+                unpersist(df)
+
+
+def run_benchmarks(competitions: int, seasons: int, engines: list, repeat: int = 3,
+                   teams_per_competition: int = 20, loader_backend: str = None,
+                   setup_db: bool = False, output: str = RESULTS_PATH) -> list:
+    """
+    Benchmark each engine on N competitions x M seasons of synthetic data.
+
+    With loader_backend set, every pass also loads its outputs into the
+    Postgres configured by POSTGRES_* — point it at a throwaway database.
+    Later passes re-merge identical rows, so upsert timings after the first
+    pass measure the no-change path. Returns the appended result records.
+    """
+    payloads = generate_payloads(competitions, seasons, teams_per_competition)
+    context = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "competitions": competitions,
+        "seasons": seasons,
+        "teams_per_competition": teams_per_competition,
+        "loader": loader_backend,
+    }
+
+    records = []
+    for engine in engines:
+        transformer = make_transformer(engine)
+        loader = None
+        try:
+            if loader_backend:
+                if loader_backend == "jdbc" and transformer.spark is None:
+                    logger.info("JDBC loader needs Spark — skipping load timings for the pandas engine")
+                else:
+                    loader = make_loader(loader_backend, transformer.spark)
+                    if setup_db:
+                        setup_database(loader)
+
+            # Warm-up pass so JVM start-up and first-query planning don't skew the samples
+            run_once(transformer, payloads, Timings())
+            timings = Timings()
+            for _ in range(repeat):
+                run_once(transformer, payloads, timings, loader)
+            records.extend(timings.records({**context, "engine": engine}))
+        finally:
+            if loader:
+                loader.close()
+            transformer.stop()
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'a', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+    logger.info(f"Appended {len(records)} benchmark results to {output}")
+    return records
+
+
+def compare(records: list, output: str = RESULTS_PATH) -> None:
+    """Print each result next to the previous run with the same shape, engine and operation"""
+    def key(record):
+        return (record["engine"], record["operation"], record["competitions"], record["seasons"],
+                record["teams_per_competition"], record["loader"])
+
+    current = {key(record): record for record in records}
+    previous = {}
+    with open(output, encoding='utf-8') as f:
+        for line in f:
+            record = json.loads(line)
+            if key(record) in current and record["timestamp"] < current[key(record)]["timestamp"]:
+                previous[key(record)] = record
+
+    print(f"{'engine':8} {'operation':24} {'rows':>8} {'median s':>10} {'previous':>10} {'change':>8}")
+    for record_key, record in current.items():
+        baseline = previous.get(record_key)
+        if baseline and baseline["median_seconds"]:
+            change = f"{record['median_seconds'] / baseline['median_seconds'] - 1:+.0%}"
+            before = f"{baseline['median_seconds']:.4f}"
+        else:
+            change = before = "-"
+        print(f"{record['engine']:8} {record['operation']:24} {record['rows']:>8} "
+              f"{record['median_seconds']:>10.4f} {before:>10} {change:>8}")
+
+
+def parse_args(argv: list = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the football data transforms and loaders")
+    parser.add_argument("--competitions", type=int, default=3, help="Synthetic competitions (default: 3)")
+    parser.add_argument("--seasons", type=int, default=1, help="Seasons per competition (default: 1)")
+    parser.add_argument("--teams", type=int, default=20, help="Teams per competition (default: 20)")
+    parser.add_argument("--engine", choices=("spark", "pandas", "both"), default="both")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes per engine (default: 3)")
+    parser.add_argument("--loader", choices=("jdbc", "copy"),
+                        help="Also time loads into the Postgres configured by POSTGRES_*")
+    parser.add_argument("--setup-db", action="store_true", help="Run create_tables.sql and the migrations before loading")
+    parser.add_argument("--output", default=RESULTS_PATH, help="JSON Lines results file")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    args = parse_args()
+    engines = ["spark", "pandas"] if args.engine == "both" else [args.engine]
+    results = run_benchmarks(args.competitions, args.seasons, engines, repeat=args.repeat,
+                             teams_per_competition=args.teams, loader_backend=args.loader,
+                             setup_db=args.setup_db, output=args.output)
+    compare(results, args.output)
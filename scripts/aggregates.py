@@ -0,0 +1,146 @@
+import logging
+import os
+
+import psycopg2.errors
+
+logger = logging.getLogger(__name__)
+
+# Dashboard aggregates (migrations/004) are refreshed from the matches a run
+# inserted or changed: only the team-seasons and team pairs those matches
+# involve are recomputed from fact_matches, in one transaction. A full
+# refresh runs the same statements over every match, to seed the tables
+# from history (migrate.py does so once after 004).
+
+AGGREGATE_TABLES = ("agg_team_home_away", "agg_head_to_head", "agg_team_form")
+
+# Serialises refreshes from parallel competitions, which can share team pairs
+REFRESH_LOCK = "SELECT pg_advisory_xact_lock(hashtext('refresh_aggregates'))"
+
+CHANGED_KEYS_SQL = [
+    """
+    CREATE TEMP TABLE changed_matches ON COMMIT DROP AS
+    SELECT competition_id, season_id, home_team_id, away_team_id
+    FROM fact_matches WHERE %(all_matches)s OR match_id = ANY(%(match_ids)s)
+    """,
+    """
+    CREATE TEMP TABLE changed_team_seasons ON COMMIT DROP AS
+    SELECT DISTINCT competition_id, season_id, team_id
+    FROM changed_matches, LATERAL (VALUES (home_team_id), (away_team_id)) AS teams(team_id)
+    WHERE team_id IS NOT NULL
+    """,
+    """
+    CREATE TEMP TABLE changed_pairs ON COMMIT DROP AS
+    SELECT home_team_id AS team_id, away_team_id AS opponent_id FROM changed_matches
+    WHERE home_team_id IS NOT NULL AND away_team_id IS NOT NULL
+    UNION
+    SELECT away_team_id, home_team_id FROM changed_matches
+    WHERE home_team_id IS NOT NULL AND away_team_id IS NOT NULL
+    """,
+]
+
+RESULT_COUNTS = """
+    COUNT(*),
+    COUNT(*) FILTER (WHERE r.goals_for > r.goals_against),
+    COUNT(*) FILTER (WHERE r.goals_for = r.goals_against),
+    COUNT(*) FILTER (WHERE r.goals_for < r.goals_against),
+    SUM(r.goals_for),
+    SUM(r.goals_against)
+"""
+
+POINTS = "SUM(CASE WHEN r.goals_for > r.goals_against THEN 3 WHEN r.goals_for = r.goals_against THEN 1 ELSE 0 END)"
+
+REFRESH_SQL = {
+    "agg_team_home_away": [
+        """
+        DELETE FROM agg_team_home_away a USING changed_team_seasons c
+        WHERE a.competition_id = c.competition_id AND a.season_id = c.season_id AND a.team_id = c.team_id
+        """,
+        f"""
+        INSERT INTO agg_team_home_away (competition_id, season_id, team_id, venue,
+                                        played, won, draw, lost, goals_for, goals_against, points)
+        SELECT r.competition_id, r.season_id, r.team_id, r.venue, {RESULT_COUNTS}, {POINTS}
+        FROM team_match_results r
+        JOIN changed_team_seasons c USING (competition_id, season_id, team_id)
+        GROUP BY r.competition_id, r.season_id, r.team_id, r.venue
+        """,
+    ],
+    "agg_head_to_head": [
+        """
+        DELETE FROM agg_head_to_head a USING changed_pairs c
+        WHERE a.team_id = c.team_id AND a.opponent_id = c.opponent_id
+        """,
+        f"""
+        INSERT INTO agg_head_to_head (team_id, opponent_id,
+                                      played, won, draw, lost, goals_for, goals_against, last_match_date)
+        SELECT r.team_id, r.opponent_id, {RESULT_COUNTS}, MAX(r.match_date)
+        FROM team_match_results r
+        JOIN changed_pairs c USING (team_id, opponent_id)
+        GROUP BY r.team_id, r.opponent_id
+        """,
+    ],
+    "agg_team_form": [
+        """
+        DELETE FROM agg_team_form a USING changed_team_seasons c
+        WHERE a.competition_id = c.competition_id AND a.season_id = c.season_id AND a.team_id = c.team_id
+        """,
+        f"""
+        INSERT INTO agg_team_form (competition_id, season_id, team_id, matches, form,
+                                   won, draw, lost, goals_for, goals_against, points, last_match_date)
+        SELECT r.competition_id, r.season_id, r.team_id, COUNT(*),
+               string_agg(CASE WHEN r.goals_for > r.goals_against THEN 'W'
+                               WHEN r.goals_for = r.goals_against THEN 'D' ELSE 'L' END,
+                          '' ORDER BY r.match_timestamp DESC, r.match_id DESC),
+               COUNT(*) FILTER (WHERE r.goals_for > r.goals_against),
+               COUNT(*) FILTER (WHERE r.goals_for = r.goals_against),
+               COUNT(*) FILTER (WHERE r.goals_for < r.goals_against),
+               SUM(r.goals_for), SUM(r.goals_against), {POINTS}, MAX(r.match_date)
+        FROM (
+            SELECT t.*, row_number() OVER (
+                PARTITION BY t.competition_id, t.season_id, t.team_id
+                ORDER BY t.match_timestamp DESC, t.match_id DESC
+            ) AS recency
+            FROM team_match_results t
+            JOIN changed_team_seasons c USING (competition_id, season_id, team_id)
+        ) r
+        WHERE r.recency <= %(form_matches)s
+        GROUP BY r.competition_id, r.season_id, r.team_id
+        """,
+    ],
+}
+
+
+def refresh_statements() -> list:
+    """Every statement of a refresh, in execution order"""
+    statements = [REFRESH_LOCK, *CHANGED_KEYS_SQL]
+    for table in AGGREGATE_TABLES:
+        statements.extend(REFRESH_SQL[table])
+    return statements
+
+
+def refresh_aggregates(loader, match_ids: list = None, form_matches: int = None,
+                       all_matches: bool = False) -> None:
+    """
+    Recompute the aggregate rows affected by match_ids (the keys an upsert
+    of fact_matches reported as inserted or changed), or every row with
+    all_matches. form_matches is the length of the rolling form window
+    (ETL_FORM_MATCHES, default 5).
+    """
+    if not match_ids and not all_matches:
+        logger.info("No changed matches — aggregates are up to date")
+        return
+    form_matches = form_matches or int(os.getenv('ETL_FORM_MATCHES', '5'))
+    match_ids = list(match_ids or [])
+    params = {"match_ids": match_ids, "form_matches": form_matches, "all_matches": all_matches}
+
+    try:
+        with loader.connection() as conn:
+            with conn, conn.cursor() as cur:
+                for statement in refresh_statements():
+                    cur.execute(statement, params)
+                cur.execute("SELECT COUNT(*) FROM changed_team_seasons")
+                team_seasons = cur.fetchone()[0]
+    except psycopg2.errors.UndefinedTable:
+        logger.warning("Aggregate tables don't exist yet — run migrate.py")
+        return
+    scope = "every match" if all_matches else f"{len(match_ids)} changed match(es)"
+    logger.info(f"Refreshed aggregates for {scope}, {team_seasons} team-season(s)")
@@ -1,7 +1,14 @@
 import requests
 import logging
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+from response_cache import ResponseCache, parse_ttls
 
 load_dotenv()
 
@@ -12,6 +19,36 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Endpoints fetched per competition by a full extraction, in log order
+DEFAULT_ENDPOINTS = ["teams", "matches", "standings", "scorers"]
+
+# Read size for streamed responses; bounds what is buffered ahead of the parser
+STREAM_CHUNK_BYTES = int(os.getenv('FOOTBALL_API_STREAM_CHUNK_BYTES', str(64 * 1024)))
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` requests per `per` seconds"""
+
+    def __init__(self, rate: int, per: float = 60.0):
+        self.capacity = float(rate)
+        self.tokens = float(rate)
+        self.fill_rate = rate / per
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.fill_rate
+            time.sleep(wait)
+
 
 class FootballAPIClient:
 
@@ -22,17 +59,118 @@ class FootballAPIClient:
         if not self.api_key:
             raise ValueError("FOOTBALL_API_KEY not found in environment variables")
         self.headers = {"X-Auth-Token": self.api_key}
-        logger.info("FootballAPIClient initialized")
-    
-    def _make_request(self, endpoint: str) -> dict:
+
+        # Free tier allows 10 requests/minute; paid tiers can raise this via env
+        self.requests_per_minute = int(os.getenv('FOOTBALL_API_REQUESTS_PER_MINUTE', '10'))
+        self.max_workers = int(os.getenv('FOOTBALL_API_MAX_WORKERS', '4'))
+        self.max_retries = int(os.getenv('FOOTBALL_API_MAX_RETRIES', '3'))
+        self.backoff_seconds = float(os.getenv('FOOTBALL_API_BACKOFF_SECONDS', '5'))
+        self.rate_limiter = TokenBucket(self.requests_per_minute, per=60.0)
+
+        # One pooled session reused by every request and extraction thread
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(self.max_workers, 1))
+        self.session.mount("https://", adapter)
+
+        # Set FOOTBALL_API_CACHE_DIR to an empty string to disable the response cache
+        cache_dir = os.getenv('FOOTBALL_API_CACHE_DIR', 'cache/api')
+        ttls = parse_ttls(os.getenv('FOOTBALL_API_CACHE_TTLS', ''))
+        self.cache = ResponseCache(cache_dir, ttls) if cache_dir else None
+
+        # Optional run_metrics.RunMetrics; receives latency and payload size per request
+        self.metrics = None
+
+        logger.info(f"FootballAPIClient initialized ({self.requests_per_minute} requests/minute)")
+
+    def _retry_delay(self, response: requests.Response, attempt: int) -> float:
+        """Seconds to wait before retrying a throttled request"""
+        retry_after = response.headers.get('Retry-After') or response.headers.get('X-RequestCounter-Reset')
+        if retry_after:
+            try:
+                return max(float(retry_after), 1.0)
+            except ValueError:
+                pass
+        return self.backoff_seconds * (2 ** attempt)
+
+    def _record_request(self, endpoint: str, start: float, response: requests.Response = None) -> None:
+        """Report a request to the run metrics; response is None when served from cache"""
+        if self.metrics is None:
+            return
+        payload_bytes = len(response.content) if response is not None else 0
+        self.metrics.record_api_call(endpoint, time.perf_counter() - start, payload_bytes,
+                                     cached=response is None)
+
+    def _get(self, endpoint: str, headers: dict = None, stream: bool = False) -> requests.Response:
+        """GET under the rate limit, retrying throttled (429) responses with backoff"""
+        url = f"{self.BASE_URL}/{endpoint}"
+        options = {"stream": True} if stream else {}
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            response = self.session.get(url, headers=headers or {}, timeout=30, **options)
+            if response.status_code != 429 or attempt == self.max_retries:
+                return response
+            if stream:
+                # Release the connection of a body that will never be read
+                response.close()
+            delay = self._retry_delay(response, attempt)
+            logger.warning(f"Rate limited on {endpoint} — retrying in {delay:.0f}s "
+                           f"(attempt {attempt + 1}/{self.max_retries})")
+            time.sleep(delay)
+
+    def _stream_request(self, endpoint: str, chunk_size: int = None):
+        """
+        GET an endpoint and yield the body in chunks as it arrives, for
+        json_stream to parse incrementally. Never cached, since caching needs
+        the whole payload.
+        """
+        chunk_size = chunk_size or STREAM_CHUNK_BYTES
+        start = time.perf_counter()
+        logger.info(f"Streaming request to: {self.BASE_URL}/{endpoint}")
+        received = 0
+        with self._get(endpoint, stream=True) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                received += len(chunk)
+                yield chunk
+        if self.metrics is not None:
+            self.metrics.record_api_call(endpoint, time.perf_counter() - start, received)
+
+    def _make_request(self, endpoint: str, use_cache: bool = True) -> dict:
+        """GET an endpoint; use_cache=False always fetches and never stores the response"""
         url = f"{self.BASE_URL}/{endpoint}"
+        start = time.perf_counter()
+        use_cache = use_cache and self.cache is not None
+
+        cached = self.cache.get(endpoint) if use_cache else None
+        if cached and self.cache.is_fresh(cached, endpoint):
+            logger.info(f"Serving {endpoint} from cache")
+            self._record_request(endpoint, start)
+            return cached["payload"]
+        conditional_headers = ResponseCache.conditional_headers(cached) if cached else {}
+
         logger.info(f"Making request to: {url}")
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=30)
+            response = self._get(endpoint, headers=conditional_headers)
+
+            if response.status_code == 304 and cached:
+                logger.info(f"Not modified since last fetch — serving {endpoint} from cache")
+                self.cache.touch(endpoint, cached)
+                self._record_request(endpoint, start)
+                return cached["payload"]
+
             response.raise_for_status()
             logger.info(f"Request successful: {response.status_code}")
-            return response.json()
+            payload = response.json()
+            self._record_request(endpoint, start, response)
+            if use_cache:
+                self.cache.put(
+                    endpoint, payload,
+                    etag=response.headers.get('ETag'),
+                    last_modified=response.headers.get('Last-Modified')
+                )
+            return payload
         except requests.exceptions.HTTPError as e:
             logger.error(f"HTTP error occurred: {e}")
             raise
@@ -52,20 +190,54 @@ class FootballAPIClient:
     def get_competition(self, competition_code: str) -> dict:
         return self._make_request(f"competitions/{competition_code}")
     
-    def get_matches(self, competition_code: str = "PL", season: int = None) -> dict:
+    def get_matches(self, competition_code: str = "PL", season: int = None,
+                    date_from: str = None, date_to: str = None, status: str = None) -> dict:
+        """
+        Get matches for a competition.
 
+        date_from/date_to (YYYY-MM-DD) restrict the response to a window of
+        fixtures; status filters by match status, e.g. "IN_PLAY,PAUSED".
+        """
+        return self._make_request(self._matches_endpoint(competition_code, season, date_from, date_to, status))
+
+    def stream_matches(self, competition_code: str = "PL", season: int = None, chunk_size: int = None):
+        """Matches of a competition as raw body chunks (see _stream_request); for large backfills"""
+        return self._stream_request(self._matches_endpoint(competition_code, season), chunk_size)
+
+    @staticmethod
+    def _matches_endpoint(competition_code: str, season: int = None, date_from: str = None,
+                          date_to: str = None, status: str = None) -> str:
         endpoint = f"competitions/{competition_code}/matches"
-        if season:
-            endpoint += f"?season={season}"
-        return self._make_request(endpoint)
+        params = {
+            "season": season,
+            "dateFrom": date_from,
+            "dateTo": date_to,
+            "status": status,
+        }
+        query = urlencode({key: value for key, value in params.items() if value})
+        if query:
+            endpoint += f"?{query}"
+        return endpoint
     
-    def get_standings(self, competition_code: str = "PL") -> dict:
-        """Get current standings for a competition"""
-        return self._make_request(f"competitions/{competition_code}/standings")
+    def get_live_matches(self, competition_codes: list, status: str = "IN_PLAY,PAUSED") -> dict:
+        """In-progress matches across competitions, never served from cache"""
+        query = urlencode({"competitions": ",".join(competition_codes), "status": status}, safe=",")
+        return self._make_request(f"matches?{query}", use_cache=False)
+
+    def get_match(self, match_id: int) -> dict:
+        """Current state of one match, never served from cache"""
+        return self._make_request(f"matches/{match_id}", use_cache=False)
+
+    def get_standings(self, competition_code: str = "PL", use_cache: bool = True) -> dict:
+        """Get current standings for a competition; use_cache=False fetches a fresh table"""
+        return self._make_request(f"competitions/{competition_code}/standings", use_cache=use_cache)
     
-    def get_teams(self, competition_code: str = "PL") -> dict:
-        """Get all teams in a competition"""
-        return self._make_request(f"competitions/{competition_code}/teams")
+    def get_teams(self, competition_code: str = "PL", season: int = None) -> dict:
+        """Get all teams in a competition, for the current or a given season"""
+        endpoint = f"competitions/{competition_code}/teams"
+        if season:
+            endpoint += f"?{urlencode({'season': season})}"
+        return self._make_request(endpoint)
     
     def get_team(self, team_id: int) -> dict:
         """Get details for a specific team"""
@@ -75,6 +247,54 @@ class FootballAPIClient:
         """Get top scorers for a competition"""
         return self._make_request(f"competitions/{competition_code}/scorers")
 
+    def extract_competition(self, competition_code: str, endpoints: list = None, params: dict = None) -> dict:
+        """Fetch the given endpoints for one competition, keyed by endpoint name"""
+        endpoints = endpoints or DEFAULT_ENDPOINTS
+        params = params or {}
+        return {
+            endpoint: self._fetch(competition_code, endpoint, params.get(endpoint))
+            for endpoint in endpoints
+        }
+
+    def extract_all(self, competitions: list, endpoints: list = None, max_workers: int = None,
+                    params: dict = None) -> dict:
+        """
+        Fetch every endpoint for every competition in parallel.
+
+        Requests share the client's token bucket, so concurrency never exceeds
+        the per-minute quota. endpoints is a list for every competition, or a
+        {competition_code: [endpoint, ...]} dict when they differ. params
+        optionally maps {competition_code: {endpoint: kwargs}} for the
+        matching get_* call.
+        Returns {competition_code: {endpoint: payload}}. Any failed request is
+        re-raised once all submitted requests finish.
+        """
+        endpoints = endpoints or DEFAULT_ENDPOINTS
+        if not isinstance(endpoints, dict):
+            endpoints = {code: endpoints for code in competitions}
+        max_workers = max_workers or self.max_workers
+        params = params or {}
+        units = [(code, endpoint) for code in competitions for endpoint in endpoints[code]]
+        logger.info(f"Extracting {len(units)} endpoints with {max_workers} worker(s)")
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                (code, endpoint): executor.submit(
+                    self._fetch, code, endpoint, params.get(code, {}).get(endpoint)
+                )
+                for code, endpoint in units
+            }
+
+        results = {code: {} for code in competitions}
+        for (code, endpoint), future in futures.items():
+            results[code][endpoint] = future.result()
+        return results
+
+    def _fetch(self, competition_code: str, endpoint: str, kwargs: dict = None) -> dict:
+        logger.info(f"[{competition_code}] Extracting {endpoint} data")
+        getter = getattr(self, f"get_{endpoint}")
+        return getter(competition_code, **(kwargs or {}))
+
 
 # Test the client
 if __name__ == "__main__":
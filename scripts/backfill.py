@@ -0,0 +1,231 @@
+import argparse
+import logging
+import os
+import sys
+from datetime import datetime
+from itertools import chain
+
+from aggregates import refresh_aggregates
+from api_client import FootballAPIClient
+from data_transformer import FootballDataTransformer
+from date_dimension import ensure_calendar
+from pandas_transformer import PandasDataTransformer
+from etl_pipeline import COMPETITIONS, LOADER_BACKENDS, STATE_DIR, write_run_metrics
+from frames import distinct_values, persist, unpersist
+from json_stream import JsonArrayStream
+from schemas import KEY_COLUMNS
+from standings_engine import SEASON_KEYS, materialize_season_standings
+from landing_zone import LandingZone
+from run_metrics import RunMetrics
+from state_store import JsonStateStore
+from validators import validate_raw_response, validate_dataframe
+
+logger = logging.getLogger(__name__)
+
+# Historical seasons only need the dimensions and facts that describe them;
+# standings and scorers snapshots are point-in-time and stay with daily runs.
+# Teams are fetched whole; matches are streamed: parsed as the response
+# arrives and transformed and upserted ETL_BACKFILL_BATCH_ROWS at a time, so
+# memory stays bounded by the batch size rather than the season.
+BACKFILL_ENDPOINTS = ["teams"]
+BACKFILL_BATCH_ROWS = int(os.getenv('ETL_BACKFILL_BATCH_ROWS', '5000'))
+
+
+def parse_seasons(values: list) -> list:
+    """['2019-2021', '2023'] -> [2019, 2020, 2021, 2023]"""
+    seasons = set()
+    for value in values:
+        start, _, end = value.partition('-')
+        seasons.update(range(int(start), int(end or start) + 1))
+    return sorted(seasons)
+
+
+def checkpoint_key(competition_code: str, season: int) -> str:
+    return f"{competition_code}:{season}"
+
+
+def pending_units(checkpoint: JsonStateStore, competitions: list, seasons: list) -> list:
+    """(competition, season) units not yet checkpointed, oldest season first per competition"""
+    return [
+        (competition_code, season)
+        for competition_code in competitions
+        for season in seasons
+        if checkpoint.get(checkpoint_key(competition_code, season)) is None
+    ]
+
+
+def backfill_season(competition_code: str, season: int, teams_raw: dict, matches: JsonArrayStream,
+                    transformer, loader, metrics: RunMetrics, batch_size: int = None) -> dict:
+    """
+    Validate, transform and upsert one competition-season, reading matches
+    from a JsonArrayStream in batches of batch_size; returns the loaded row counts
+    """
+    label = f"{competition_code} {season}"
+    batch_size = batch_size or BACKFILL_BATCH_ROWS
+
+    with metrics.stage("validate"):
+        validate_raw_response(teams_raw, "teams", label)
+
+    teams_df = None
+    try:
+        with metrics.stage("transform"):
+            teams_df = persist(transformer.transform_teams(teams_raw))
+        with metrics.stage("validate"):
+            teams_metrics = validate_dataframe(teams_df, "team_id", label,
+                                               key_columns=KEY_COLUMNS["dim_teams"])
+        with metrics.stage("load"):
+            loader.load_dim_teams(teams_df, count=teams_metrics["row_count"])
+    finally:
+        unpersist(teams_df)
+
+    records = iter(matches)
+    with metrics.stage("extract"):
+        first = next(records, None)
+    if first is None:
+        raise ValueError(f"[{label}] API returned an empty list for 'matches'")
+    # The competition precedes the matches in the response, so it is parsed by now
+    match_batches = transformer.transform_match_batches(chain([first], records),
+                                                        matches.header.get('competition', {}), batch_size)
+
+    match_count = 0
+    changed_match_ids = []
+    season_keys = set()
+    match_dates = set()
+    while True:
+        # Pulling a batch also reads its part of the response
+        with metrics.stage("transform"):
+            matches_df = next(match_batches, None)
+        if matches_df is None:
+            break
+        try:
+            matches_df = persist(matches_df)
+            with metrics.stage("validate"):
+                matches_metrics = validate_dataframe(matches_df, "match_id", label,
+                                                     key_columns=KEY_COLUMNS["fact_matches"])
+            with metrics.stage("load"):
+                changed_match_ids += loader.load_fact_matches(matches_df, count=matches_metrics["row_count"])
+            season_keys.update(distinct_values(matches_df, SEASON_KEYS))
+            match_dates.update(day for (day,) in distinct_values(matches_df, ["match_date"]))
+        finally:
+            unpersist(matches_df)
+        match_count += matches_metrics["row_count"]
+
+    with metrics.stage("load"):
+        ensure_calendar(loader, (min(match_dates), max(match_dates)) if match_dates else None)
+        refresh_aggregates(loader, changed_match_ids)
+        if changed_match_ids:
+            for competition_id, season_id in season_keys:
+                materialize_season_standings(loader, competition_id, season_id)
+
+    return {"teams": teams_metrics["row_count"], "matches": match_count}
+
+
+def run_backfill(competitions: list = None, seasons: list = None, reset: bool = False,
+                 engine: str = None, loader_backend: str = None) -> bool:
+    """
+    Load matches, teams and dates for every competition x season.
+
+    Units run one after another under the client's rate limit. Each is
+    checkpointed in state/backfill.json once its upsert commits, so rerunning
+    after an interruption or a failed unit only processes what is missing;
+    reset=True clears the checkpoints of the requested units first. Raw
+    payloads are landed like regular runs. Spark is the default engine,
+    since seasons are transformed in bulk.
+    """
+    competitions = competitions or COMPETITIONS
+    engine = engine or os.getenv('ETL_BACKFILL_ENGINE', 'spark')
+    loader_backend = loader_backend or os.getenv('ETL_LOADER_BACKEND', 'jdbc')
+    checkpoint = JsonStateStore(os.path.join(STATE_DIR, 'backfill.json'))
+    landing = LandingZone(os.getenv('ETL_LANDING_DIR', 'landing'))
+    run_id = LandingZone.new_run_id()
+    metrics = RunMetrics(f"backfill_{run_id}")
+
+    if reset:
+        for competition_code in competitions:
+            for season in seasons:
+                checkpoint.delete(checkpoint_key(competition_code, season))
+
+    units = pending_units(checkpoint, competitions, seasons)
+    total = len(competitions) * len(seasons)
+    logger.info(f"Backfill {run_id}: {len(units)} of {total} competition-season(s) pending")
+    if not units:
+        return True
+
+    transformer = None
+    loader = None
+    failed = []
+    try:
+        api_client = FootballAPIClient()
+        api_client.metrics = metrics
+        if engine == "pandas":
+            transformer = PandasDataTransformer()
+            loader_backend = "copy"
+        else:
+            transformer = FootballDataTransformer()
+        loader = LOADER_BACKENDS[loader_backend](spark=transformer.spark)
+        loader.metrics = metrics
+
+        for number, (competition_code, season) in enumerate(units, start=1):
+            logger.info(f"[{competition_code}] Backfilling season {season} ({number}/{len(units)})")
+            try:
+                with metrics.competition(f"{competition_code}_{season}"):
+                    unit = f"{competition_code}_{season}"
+                    params = {endpoint: {"season": season} for endpoint in BACKFILL_ENDPOINTS}
+                    with metrics.stage("extract"):
+                        payloads = api_client.extract_competition(competition_code, BACKFILL_ENDPOINTS, params)
+                        landing.write_run(run_id, {unit: payloads})
+                    chunks = landing.write_stream(run_id, unit, "matches",
+                                                  api_client.stream_matches(competition_code, season))
+                    counts = backfill_season(competition_code, season, payloads["teams"],
+                                             JsonArrayStream(chunks, "matches"), transformer, loader, metrics)
+            except Exception as e:
+                # Left un-checkpointed, so the next run retries it
+                logger.error(f"[{competition_code}] Season {season} failed: {e}")
+                logger.exception("Full traceback:")
+                failed.append(checkpoint_key(competition_code, season))
+                continue
+
+            checkpoint.set(checkpoint_key(competition_code, season),
+                           {"completed_at": datetime.now().isoformat(), "run_id": run_id, **counts})
+            logger.info(f"[{competition_code}] Season {season} checkpointed")
+    except Exception as e:
+        logger.error(f"Backfill failed: {e}")
+        logger.exception("Full traceback:")
+        metrics.success = False
+        return False
+    finally:
+        if loader:
+            loader.close()
+        if transformer:
+            transformer.stop()
+        if metrics.success is None:
+            metrics.success = not failed
+        write_run_metrics(metrics)
+
+    if failed:
+        logger.error(f"Backfill finished with failed units (rerun to retry): {failed}")
+        return False
+    logger.info("Backfill complete")
+    return True
+
+
+def parse_args(argv: list = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Backfill historical seasons into the warehouse")
+    parser.add_argument("--competitions", nargs="+", metavar="CODE",
+                        help=f"Competition codes to backfill (default: {' '.join(COMPETITIONS)})")
+    parser.add_argument("--seasons", nargs="+", required=True, metavar="YEAR",
+                        help="Season start years, or ranges such as 2019-2023")
+    parser.add_argument("--reset", action="store_true",
+                        help="Forget the checkpoints of the requested units and load them again")
+    parser.add_argument("--engine", choices=("spark", "pandas"),
+                        help="Transform engine (default: ETL_BACKFILL_ENGINE or spark)")
+    parser.add_argument("--loader", choices=sorted(LOADER_BACKENDS),
+                        help="Loader backend (default: ETL_LOADER_BACKEND or jdbc)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    success = run_backfill(args.competitions, parse_seasons(args.seasons), reset=args.reset,
+                           engine=args.engine, loader_backend=args.loader)
+    sys.exit(0 if success else 1)
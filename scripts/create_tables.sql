@@ -101,4 +101,8 @@ CREATE INDEX IF NOT EXISTS idx_scorers_team ON dim_scorers(team_id);
 CREATE INDEX IF NOT EXISTS idx_matches_date ON fact_matches(match_date);
 CREATE INDEX IF NOT EXISTS idx_matches_home_team ON fact_matches(home_team_id);
 CREATE INDEX IF NOT EXISTS idx_matches_away_team ON fact_matches(away_team_id);
-CREATE INDEX IF NOT EXISTS idx_standings_team ON standings_snapshot(team_id);
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_standings_team ON standings_snapshot(team_id);
+
+-- Daily snapshot dedup checks (EXISTS on competition + today's loaded_at range)
+CREATE INDEX IF NOT EXISTS idx_standings_competition_loaded ON standings_snapshot(competition_id, loaded_at);
+CREATE INDEX IF NOT EXISTS idx_scorers_competition_loaded ON dim_scorers(competition_id, loaded_at);
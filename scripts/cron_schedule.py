@@ -0,0 +1,59 @@
+from datetime import datetime
+
+# Minimal five-field cron expressions (minute hour day-of-month month
+# day-of-week) for the daemon's internal scheduler. Each field accepts *,
+# single values, a-b ranges, /step and comma-separated lists; day-of-week
+# counts 0 (or 7) as Sunday. As in cron, when both day fields are
+# restricted a moment matching either one is due.
+
+FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+
+def parse_field(spec: str, low: int, high: int) -> set:
+    """'*/15' -> {0, 15, 30, 45} within [low, high]"""
+    values = set()
+    for part in spec.split(','):
+        span, _, step = part.partition('/')
+        step = int(step) if step else 1
+        if span == '*':
+            start, end = low, high
+        elif '-' in span:
+            start, end = (int(value) for value in span.split('-', 1))
+        else:
+            start = end = int(span)
+            if step > 1:
+                end = high
+        if start < low or end > high or start > end or step < 1:
+            raise ValueError(f"Invalid cron field '{spec}' (allowed {low}-{high})")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """A parsed cron expression; matches() is checked once per minute"""
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields, got '{expression}'")
+        self.expression = expression
+        minutes, hours, days, months, weekdays = (
+            parse_field(spec, low, high) for spec, (low, high) in zip(fields, FIELD_RANGES)
+        )
+        self.minutes, self.hours, self.days, self.months = minutes, hours, days, months
+        self.weekdays = {0 if day == 7 else day for day in weekdays}
+        self.any_day = fields[2] == '*'
+        self.any_weekday = fields[4] == '*'
+
+    def matches(self, moment: datetime) -> bool:
+        if moment.minute not in self.minutes or moment.hour not in self.hours or moment.month not in self.months:
+            return False
+        day_matches = moment.day in self.days
+        # datetime counts Monday=0; cron counts Sunday=0
+        weekday_matches = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day_matches and weekday_matches
+        return day_matches or weekday_matches
+
+    def __repr__(self) -> str:
+        return f"CronSchedule('{self.expression}')"
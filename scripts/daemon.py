@@ -0,0 +1,226 @@
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from flask import Flask, jsonify, request
+
+from api_client import DEFAULT_ENDPOINTS, FootballAPIClient
+from cron_schedule import CronSchedule
+from data_transformer import FootballDataTransformer
+from etl_pipeline import COMPETITIONS, LOADER_BACKENDS, run_etl_pipeline
+from pandas_transformer import PandasDataTransformer
+
+logger = logging.getLogger(__name__)
+
+# Resident pipeline: the API session, transform engine (SparkSession or
+# pandas) and DB pool are created once and reused by every run, so a
+# scheduled or triggered refresh only pays for its own work. Runs are
+# queued and executed one at a time on a single worker, since the warm
+# components are shared.
+
+# Used when ETL_DAEMON_SCHEDULE doesn't name a schedule file
+DEFAULT_SCHEDULE = [
+    {"name": "incremental", "cron": "*/30 * * * *", "incremental": True},
+    {"name": "full", "cron": "0 6 * * *", "incremental": False},
+]
+
+# Finished runs kept for GET /runs
+RUN_HISTORY = 50
+
+
+class ScheduledJob:
+    """
+    A pipeline run (competitions, endpoints, full or incremental) on a cron
+    schedule; endpoints defaults to every endpoint
+    """
+
+    def __init__(self, name: str, cron: str, competitions: list = None, incremental: bool = False,
+                 endpoints: list = None):
+        unknown = set(endpoints or []) - set(DEFAULT_ENDPOINTS)
+        if unknown:
+            raise ValueError(f"Job '{name}' has unknown endpoints {sorted(unknown)}; expected {DEFAULT_ENDPOINTS}")
+        self.name = name
+        self.schedule = CronSchedule(cron)
+        self.competitions = competitions or COMPETITIONS
+        self.incremental = incremental
+        self.endpoints = endpoints
+
+    @classmethod
+    def from_dict(cls, spec: dict) -> "ScheduledJob":
+        return cls(spec["name"], spec["cron"], spec.get("competitions"), spec.get("incremental", False),
+                   spec.get("endpoints"))
+
+
+def load_jobs(path: str = None) -> list:
+    """
+    Jobs from a JSON list like DEFAULT_SCHEDULE, e.g. one entry per
+    competition and stage: {"name": "pl-matches", "cron": "*/10 * * * 6,0",
+    "competitions": ["PL"], "endpoints": ["matches"], "incremental": true}.
+    """
+    path = path or os.getenv('ETL_DAEMON_SCHEDULE')
+    specs = DEFAULT_SCHEDULE
+    if path:
+        with open(path, encoding='utf-8') as f:
+            specs = json.load(f)
+    return [ScheduledJob.from_dict(spec) for spec in specs]
+
+
+class PipelineDaemon:
+    """
+    Keeps pipeline components warm and runs jobs on their schedule or on
+    demand. engine is "spark" or "pandas" (ETL_DAEMON_ENGINE, default
+    spark); the pandas engine always loads through the copy backend, which
+    is also the default here for its connection pool.
+    """
+
+    def __init__(self, jobs: list, engine: str = None, loader_backend: str = None):
+        self.jobs = {job.name: job for job in jobs}
+        engine = engine or os.getenv('ETL_DAEMON_ENGINE', 'spark')
+        loader_backend = loader_backend or os.getenv('ETL_LOADER_BACKEND', 'copy')
+
+        logger.info(f"Starting warm components ({engine} engine, {loader_backend} loader)")
+        self.api_client = FootballAPIClient()
+        if engine == "pandas":
+            self.transformer = PandasDataTransformer()
+            loader_backend = "copy"
+        else:
+            self.transformer = FootballDataTransformer()
+        self.loader = LOADER_BACKENDS[loader_backend](spark=self.transformer.spark)
+
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pipeline")
+        self.lock = threading.Lock()
+        self.runs = deque(maxlen=RUN_HISTORY)
+        self.stopped = threading.Event()
+        self.scheduler = threading.Thread(target=self._schedule_loop, name="scheduler", daemon=True)
+
+    def start(self) -> None:
+        self.scheduler.start()
+        for job in self.jobs.values():
+            logger.info(f"Scheduled '{job.name}': {job.schedule.expression} for {job.competitions}, "
+                        f"{job.endpoints or 'all endpoints'}{' (incremental)' if job.incremental else ''}")
+
+    def submit(self, name: str, competitions: list, incremental: bool, endpoints: list = None) -> dict:
+        """Queue a run; returns its record, which is updated as the run progresses"""
+        run = {"job": name, "competitions": competitions, "incremental": incremental, "endpoints": endpoints,
+               "queued_at": datetime.now().isoformat(), "started_at": None, "finished_at": None, "success": None}
+        with self.lock:
+            self.runs.append(run)
+        self.executor.submit(self._execute, run)
+        logger.info(f"Queued run '{name}' for {competitions}")
+        return dict(run)
+
+    def pending(self, name: str) -> bool:
+        """True while a run of the job is queued or running"""
+        with self.lock:
+            return any(run["job"] == name and run["finished_at"] is None for run in self.runs)
+
+    def _execute(self, run: dict) -> None:
+        with self.lock:
+            run["started_at"] = datetime.now().isoformat()
+        try:
+            success = run_etl_pipeline(run["competitions"], incremental=run["incremental"],
+                                       endpoints=run["endpoints"], api_client=self.api_client,
+                                       transformer=self.transformer, loader=self.loader)
+        except Exception as e:
+            logger.error(f"Run '{run['job']}' failed: {e}")
+            logger.exception("Full traceback:")
+            success = False
+        with self.lock:
+            run["finished_at"] = datetime.now().isoformat()
+            run["success"] = success
+
+    def due_jobs(self, minute: datetime) -> list:
+        return [job for job in self.jobs.values() if job.schedule.matches(minute)]
+
+    def queue_due(self, minute: datetime) -> None:
+        """Queue the jobs due at minute, unless a run of theirs is still pending"""
+        for job in self.due_jobs(minute):
+            if self.pending(job.name):
+                logger.warning(f"Skipping '{job.name}' at {minute:%H:%M} — previous run still pending")
+                continue
+            self.submit(job.name, job.competitions, job.incremental, job.endpoints)
+
+    def _schedule_loop(self) -> None:
+        """Wake at every minute boundary and queue the jobs due then"""
+        while not self.stopped.is_set():
+            now = datetime.now()
+            minute = now.replace(second=0, microsecond=0) + timedelta(minutes=1)
+            if self.stopped.wait((minute - now).total_seconds()):
+                break
+            self.queue_due(minute)
+
+    def recent_runs(self) -> list:
+        with self.lock:
+            return [dict(run) for run in reversed(self.runs)]
+
+    def shutdown(self) -> None:
+        """Stop scheduling, let the queued runs finish, then release the warm components"""
+        self.stopped.set()
+        self.executor.shutdown(wait=True)
+        self.loader.close()
+        self.transformer.stop()
+        logger.info("Daemon stopped")
+
+
+def create_app(daemon: PipelineDaemon) -> Flask:
+    """Local control endpoint: POST /trigger queues a run, GET /runs lists recent ones"""
+    app = Flask(__name__)
+
+    @app.get("/health")
+    def health():
+        return jsonify({"status": "ok", "jobs": sorted(daemon.jobs)})
+
+    @app.get("/runs")
+    def runs():
+        return jsonify(daemon.recent_runs())
+
+    @app.post("/trigger")
+    def trigger():
+        # {"job": "<name>"} runs a scheduled job now; otherwise an ad-hoc
+        # {"competitions": [...], "endpoints": [...], "incremental": bool} run
+        body = request.get_json(silent=True) or {}
+        if "job" in body:
+            job = daemon.jobs.get(body["job"])
+            if job is None:
+                return jsonify({"error": f"Unknown job '{body['job']}'"}), 404
+            run = daemon.submit(job.name, job.competitions, job.incremental, job.endpoints)
+        else:
+            endpoints = body.get("endpoints")
+            unknown = set(endpoints or []) - set(DEFAULT_ENDPOINTS)
+            if unknown:
+                return jsonify({"error": f"Unknown endpoints {sorted(unknown)}"}), 400
+            run = daemon.submit("manual", body.get("competitions") or COMPETITIONS,
+                                bool(body.get("incremental", False)), endpoints)
+        return jsonify(run), 202
+
+    return app
+
+
+def parse_args(argv: list = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Resident ETL daemon with a scheduler and trigger endpoint")
+    parser.add_argument("--schedule", metavar="PATH",
+                        help="JSON job list (default: ETL_DAEMON_SCHEDULE or the built-in schedule)")
+    parser.add_argument("--engine", choices=("spark", "pandas"),
+                        help="Transform engine kept warm (default: ETL_DAEMON_ENGINE or spark)")
+    parser.add_argument("--loader", choices=sorted(LOADER_BACKENDS),
+                        help="Loader backend (default: ETL_LOADER_BACKEND or copy)")
+    parser.add_argument("--port", type=int, default=int(os.getenv('ETL_DAEMON_PORT', '8787')),
+                        help="Port of the trigger endpoint on 127.0.0.1 (default: ETL_DAEMON_PORT or 8787)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    daemon = PipelineDaemon(load_jobs(args.schedule), engine=args.engine, loader_backend=args.loader)
+    daemon.start()
+    try:
+        create_app(daemon).run(host="127.0.0.1", port=args.port)
+    finally:
+        daemon.shutdown()
+    sys.exit(0)
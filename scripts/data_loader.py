@@ -1,14 +1,140 @@
 import os
 import logging
+import time
+import uuid
+from contextlib import contextmanager
+import pandas as pd
+import psycopg2
+import psycopg2.errors
 from pyspark.sql import DataFrame, SparkSession
-from pyspark.sql.functions import col, to_date, current_date
 from dotenv import load_dotenv
 
+from frames import distinct_values, is_pandas, iter_rows, row_count
+from parquet_sink import ParquetLakeSink
+from schemas import TABLE_SCHEMAS
+
 load_dotenv()
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Conflict key per table loaded through the upsert path. fact_matches is
+# partitioned by competition and season (migrations/001), so its key carries
+# both partition columns; the first key column is what upserts report back.
+UPSERT_KEYS = {
+    "dim_teams": ["team_id"],
+    "dim_dates": ["date_id"],
+    "fact_matches": ["match_id", "competition_id", "season_id"],
+    "standings_history": ["competition_id", "season_id", "matchday", "team_id"],
+}
+
+SNAPSHOT_TABLES = ("standings_snapshot", "dim_scorers")
+
+# SNAPSHOT_MODE=cdc keeps the snapshots as SCD type-2 history (migration 006):
+# only versions whose row hash changed are stored, each with its validity interval
+SNAPSHOT_MODES = ("full", "cdc")
+CDC_TABLES = {
+    "standings_snapshot": "standings_scd",
+    "dim_scorers": "scorers_scd",
+}
+CDC_KEYS = {
+    "standings_snapshot": ["competition_id", "season_id", "standing_type", "team_id"],
+    "dim_scorers": ["competition_id", "season_id", "player_id"],
+}
+# Each snapshot is complete for its competition and season; current versions
+# missing from it (a player dropping out of the top scorers) are closed
+CDC_SCOPE = ["competition_id", "season_id"]
+
+
+def build_upsert_sql(table: str, staging_table: str, columns: list, key_columns: list,
+                     update: bool = True) -> str:
+    """
+    Merge a staging table into its target in a single statement.
+
+    Rows whose key is new are inserted. Existing rows are only rewritten when
+    at least one non-key column actually changed, so re-loading an unchanged
+    batch touches nothing; with update=False they are left alone entirely.
+    Returns the keys of inserted or updated rows.
+    """
+    column_list = ", ".join(columns)
+    key_list = ", ".join(key_columns)
+    insert = (
+        f"INSERT INTO {table} ({column_list}) "
+        f"SELECT DISTINCT ON ({key_list}) {column_list} FROM {staging_table} ORDER BY {key_list} "
+    )
+    if not update:
+        return f"{insert}ON CONFLICT ({key_list}) DO NOTHING RETURNING {key_list}"
+
+    update_columns = [c for c in columns if c not in key_columns and c != "loaded_at"]
+
+    assignments = [f"{c} = EXCLUDED.{c}" for c in update_columns]
+    if "loaded_at" in columns:
+        assignments.append("loaded_at = EXCLUDED.loaded_at")
+    current_values = ", ".join(f"{table}.{c}" for c in update_columns)
+    incoming_values = ", ".join(f"EXCLUDED.{c}" for c in update_columns)
+
+    return (
+        f"{insert}"
+        f"ON CONFLICT ({key_list}) DO UPDATE SET {', '.join(assignments)} "
+        f"WHERE ({current_values}) IS DISTINCT FROM ({incoming_values}) "
+        f"RETURNING {key_list}"
+    )
+
+
+def build_replace_today_sql(table_name: str, staging_table: str, columns: list) -> list:
+    """
+    Statements replacing today's rows of a full-mode snapshot table, for the
+    competitions in staging_table, with the staged rows; run in one
+    transaction, so readers see either snapshot whole.
+    """
+    column_list = ", ".join(columns)
+    return [
+        f"DELETE FROM {table_name} WHERE competition_id IN (SELECT DISTINCT competition_id FROM {staging_table}) "
+        f"AND loaded_at >= current_date AND loaded_at < current_date + 1",
+        f"INSERT INTO {table_name} ({column_list}) SELECT {column_list} FROM {staging_table}",
+    ]
+
+
+def build_cdc_sql(history_table: str, staging_table: str, columns: list, key_columns: list) -> list:
+    """
+    Statements merging a staged snapshot into its SCD type-2 history, in
+    execution order and within one transaction.
+
+    Incoming rows are hashed over their non-key values. A current version
+    whose hash differs, or whose key is missing from the snapshot's scope, is
+    closed at the snapshot's loaded_at; a new version is opened for every
+    key left without a current one. Re-merging an unchanged snapshot writes
+    nothing. The last statement's row count is the number of new versions.
+    """
+    value_columns = [c for c in columns if c not in key_columns and c != "loaded_at"]
+    data_columns = key_columns + value_columns
+    column_list = ", ".join(data_columns)
+    key_list = ", ".join(key_columns)
+    scope_list = ", ".join(CDC_SCOPE)
+
+    def same_key(left: str, right: str) -> str:
+        return " AND ".join(f"{left}.{c} = {right}.{c}" for c in key_columns)
+
+    return [
+        f"CREATE TEMP TABLE incoming_snapshot ON COMMIT DROP AS "
+        f"SELECT DISTINCT ON ({key_list}) {column_list}, "
+        f"md5(ROW({', '.join(value_columns)})::text) AS row_hash, "
+        f"COALESCE(loaded_at, CURRENT_TIMESTAMP) AS valid_from "
+        f"FROM {staging_table} WHERE {' AND '.join(f'{c} IS NOT NULL' for c in key_columns)} "
+        f"ORDER BY {key_list}, loaded_at DESC",
+
+        f"UPDATE {history_table} h SET valid_to = i.valid_from FROM incoming_snapshot i "
+        f"WHERE h.valid_to IS NULL AND {same_key('h', 'i')} AND h.row_hash <> i.row_hash",
+
+        f"UPDATE {history_table} h SET valid_to = (SELECT MAX(valid_from) FROM incoming_snapshot) "
+        f"WHERE h.valid_to IS NULL AND ({scope_list}) IN (SELECT {scope_list} FROM incoming_snapshot) "
+        f"AND NOT EXISTS (SELECT 1 FROM incoming_snapshot i WHERE {same_key('h', 'i')})",
+
+        f"INSERT INTO {history_table} ({column_list}, row_hash, valid_from) "
+        f"SELECT {column_list}, row_hash, valid_from FROM incoming_snapshot i "
+        f"WHERE NOT EXISTS (SELECT 1 FROM {history_table} h WHERE h.valid_to IS NULL AND {same_key('h', 'i')})",
+    ]
+
 
 class PostgresDataLoader:
 
@@ -20,6 +146,13 @@ class PostgresDataLoader:
         self.password = os.getenv('POSTGRES_PASSWORD', '')
         self.sslmode = os.getenv('POSTGRES_SSLMODE', 'prefer')
         self.spark = spark
+        # Optional run_metrics.RunMetrics; receives rows and seconds per write
+        self.metrics = None
+        # Optional columnar copy of every write (ETL_PARQUET_LAKE_PATH)
+        self.lake = ParquetLakeSink.from_env()
+        self.snapshot_mode = os.getenv('ETL_SNAPSHOT_MODE', 'full')
+        if self.snapshot_mode not in SNAPSHOT_MODES:
+            raise ValueError(f"ETL_SNAPSHOT_MODE must be one of {SNAPSHOT_MODES}, got '{self.snapshot_mode}'")
 
         self.jdbc_url = (
             f"jdbc:postgresql://{self.host}:{self.port}/{self.database}"
@@ -33,40 +166,91 @@ class PostgresDataLoader:
 
         logger.info(f"PostgresDataLoader initialized for {self.host}:{self.port}/{self.database}")
 
-    def _read_table(self, table: str) -> DataFrame:
-        """Read an existing table from Postgres via JDBC"""
-        return self.spark.read.jdbc(
-            url=self.jdbc_url,
-            table=table,
-            properties=self.connection_properties
+    def _connect(self):
+        """Open a direct psycopg2 connection for statements Spark JDBC can't issue"""
+        return psycopg2.connect(
+            host=self.host,
+            port=self.port,
+            dbname=self.database,
+            user=self.user,
+            password=self.password,
+            sslmode=self.sslmode
         )
 
-    def get_existing_ids(self, table: str, id_column: str):
-        """Return a DataFrame of existing IDs, or None if table doesn't exist or is empty"""
+    @contextmanager
+    def connection(self):
+        """A psycopg2 connection, released on exit; for modules that issue their own SQL"""
+        conn = self._connect()
         try:
-            return self._read_table(table).select(id_column)
-        except Exception as e:
-            logger.warning(f"Could not read existing IDs from {table} (first run?): {e}")
-            return None
+            yield conn
+        finally:
+            conn.close()
+
+    def close(self) -> None:
+        """Release any resources held by the loader"""
+
+    def _record_load(self, table_name: str, rows: int, start: float) -> None:
+        if self.metrics is not None:
+            self.metrics.record_load(table_name, rows, time.perf_counter() - start)
+
+    def _mirror(self, df, table_name: str) -> None:
+        """Merge a batch Postgres accepted into the Parquet lake, when one is configured"""
+        if self.lake is not None:
+            self.lake.write(df, table_name)
 
-    def filter_new_records(self, df: DataFrame, existing_ids_df: DataFrame, id_column: str) -> DataFrame:
-        """Return only records whose id_column value is not already in the database"""
-        if existing_ids_df is None:
+    def _to_spark(self, df, table_name: str) -> DataFrame:
+        """
+        Convert a pandas DataFrame from the lightweight engine for a JDBC write.
+
+        Frames laid out by the table's registered schema are converted against
+        it directly, so nothing is inferred and column types match the table.
+        """
+        if not is_pandas(df):
             return df
-        return df.join(existing_ids_df, on=id_column, how='left_anti')
+        if self.spark is None:
+            raise ValueError("PostgresDataLoader needs a SparkSession to load pandas DataFrames; "
+                             "use the copy backend with the pandas engine")
+        schema = TABLE_SCHEMAS.get(table_name)
+        if schema is None or schema.names != list(df.columns):
+            schema = list(df.columns)
+        return self.spark.createDataFrame(list(iter_rows(df)), schema=schema)
+
+    def loaded_seasons(self) -> list:
+        """[(competition_id, season_id), ...] of every season in fact_matches"""
+        with self.connection() as conn:
+            with conn, conn.cursor() as cur:
+                cur.execute("SELECT DISTINCT competition_id, season_id FROM fact_matches ORDER BY 1, 2")
+                return [tuple(row) for row in cur.fetchall()]
+
+    def read_season_matches(self, competition_id: int, season_id: int) -> pd.DataFrame:
+        """All fact_matches rows of one season, read from its partition"""
+        query = "SELECT * FROM fact_matches WHERE competition_id = %s AND season_id = %s"
+        with self.connection() as conn:
+            with conn, conn.cursor() as cur:
+                cur.execute(query, (competition_id, season_id))
+                columns = [description[0] for description in cur.description]
+                rows = cur.fetchall()
+        return pd.DataFrame.from_records(rows, columns=columns)
 
     def snapshot_exists_today(self, table: str, competition_id: int) -> bool:
-        """Check if today's snapshot is already loaded for this competition"""
+        """
+        Check if today's snapshot is already loaded for this competition.
+
+        Issued as an EXISTS lookup with a sargable loaded_at range, so it is
+        answered from the (competition_id, loaded_at) index. Always False in
+        CDC mode, where re-merging an unchanged snapshot writes nothing.
+        """
+        if self.snapshot_mode == "cdc":
+            return False
+        query = (
+            f"SELECT EXISTS (SELECT 1 FROM {table} WHERE competition_id = %s "
+            f"AND loaded_at >= current_date AND loaded_at < current_date + 1)"
+        )
         try:
-            count = (
-                self._read_table(table)
-                .filter(
-                    (col('competition_id') == competition_id) &
-                    (to_date(col('loaded_at')) == current_date())
-                )
-                .count()
-            )
-            exists = count > 0
+            with self.connection() as conn:
+                with conn, conn.cursor() as cur:
+                    cur.execute(query, (competition_id,))
+                    exists = cur.fetchone()[0]
             if exists:
                 logger.info(f"Snapshot already exists in {table} for competition_id={competition_id} today — skipping")
             return exists
@@ -74,9 +258,13 @@ class PostgresDataLoader:
             logger.warning(f"Could not check snapshot in {table} (first run?): {e}")
             return False
 
-    def load_dataframe(self, df: DataFrame, table_name: str, mode: str = "append") -> None:
+    def load_dataframe(self, df: DataFrame, table_name: str, mode: str = "append", count: int = None) -> None:
+        """Write df to table_name; pass count when already known to skip a Spark count action"""
         try:
-            count = df.count()
+            start = time.perf_counter()
+            df = self._to_spark(df, table_name)
+            if count is None:
+                count = df.count()
             if count == 0:
                 logger.info(f"No new records to load to {table_name}")
                 return
@@ -89,28 +277,173 @@ class PostgresDataLoader:
                 properties=self.connection_properties
             )
 
+            self._record_load(table_name, count, start)
             logger.info(f"Successfully loaded data to {table_name}")
         except Exception as e:
             logger.error(f"Failed to load data to {table_name}: {e}")
             raise
 
-    def load_dim_teams(self, df: DataFrame) -> None:
-        existing = self.get_existing_ids("dim_teams", "team_id")
-        new_teams = self.filter_new_records(df, existing, "team_id")
-        self.load_dataframe(new_teams, "dim_teams", mode="append")
+    def _write_staging(self, conn, df: DataFrame, staging_table: str, table_name: str) -> None:
+        """
+        Fill staging_table with df. conn is the connection holding the merge;
+        the JDBC writer opens its own, backends writing through psycopg2 reuse it.
+        """
+        self._to_spark(df, table_name).write.jdbc(
+            url=self.jdbc_url,
+            table=staging_table,
+            mode="append",
+            properties=self.connection_properties
+        )
+
+    def upsert_dataframe(self, df: DataFrame, table_name: str, update: bool = True, count: int = None) -> list:
+        """
+        Insert new rows and update changed ones, keyed on UPSERT_KEYS[table_name].
+
+        The batch is written to a throwaway UNLOGGED copy of the table and
+        merged with one INSERT ... ON CONFLICT DO UPDATE, instead of reading
+        the target's keys back into Spark. update=False only inserts missing
+        keys. Returns the first key column of the rows inserted or updated.
+        """
+        key_columns = UPSERT_KEYS[table_name]
+
+        def merge(cur, staging_table):
+            cur.execute(build_upsert_sql(table_name, staging_table, list(df.columns), key_columns, update))
+            return [row[0] for row in cur.fetchall()]
+
+        changed = self._merge_staged(df, table_name, merge, count)
+        if changed is None:
+            logger.info(f"No records to upsert to {table_name}")
+            return []
+        self._mirror(df, table_name)
+        logger.info(f"Upserted {table_name}: {len(changed)} rows inserted or changed")
+        return changed
+
+    def merge_snapshot(self, df: DataFrame, table_name: str, count: int = None) -> int:
+        """
+        Merge a standings or scorers snapshot into its SCD type-2 history
+        (CDC_TABLES); returns the number of new versions stored.
+        """
+        history_table = CDC_TABLES[table_name]
+
+        def merge(cur, staging_table):
+            statements = build_cdc_sql(history_table, staging_table, list(df.columns), CDC_KEYS[table_name])
+            for statement in statements:
+                cur.execute(statement)
+            return cur.rowcount
+
+        versions = self._merge_staged(df, table_name, merge, count)
+        if versions is None:
+            logger.info(f"No records to merge into {history_table}")
+            return 0
+        logger.info(f"Merged {table_name} into {history_table}: {versions} new version(s)")
+        return versions
+
+    def replace_snapshot_today(self, df: DataFrame, table_name: str, count: int = None) -> None:
+        """Replace today's snapshot rows of df's competitions in table_name with df"""
+        def merge(cur, staging_table):
+            for statement in build_replace_today_sql(table_name, staging_table, list(df.columns)):
+                cur.execute(statement)
+
+        self._merge_staged(df, table_name, merge, count)
+        logger.info(f"Replaced today's {table_name} snapshot")
+
+    def _merge_staged(self, df: DataFrame, table_name: str, merge, count: int = None):
+        """
+        Write df to a throwaway UNLOGGED copy of table_name, then run
+        merge(cursor, staging_table) in one transaction and return its
+        result; None when df is empty.
+        """
+        staging_table = f"stg_{table_name}_{uuid.uuid4().hex[:8]}"
+
+        if count is None:
+            count = row_count(df)
+        if count == 0:
+            return None
+
+        start = time.perf_counter()
+        with self.connection() as conn:
+            try:
+                with conn, conn.cursor() as cur:
+                    cur.execute(f"CREATE UNLOGGED TABLE {staging_table} (LIKE {table_name} INCLUDING DEFAULTS)")
+
+                logger.info(f"Staging {count} rows for {table_name}")
+                self._write_staging(conn, df, staging_table, table_name)
+
+                with conn, conn.cursor() as cur:
+                    result = merge(cur, staging_table)
+
+                self._record_load(table_name, count, start)
+                return result
+            except Exception as e:
+                logger.error(f"Failed to merge data to {table_name}: {e}")
+                raise
+            finally:
+                self._drop_staging(conn, staging_table)
+
+    def _drop_staging(self, conn, staging_table: str) -> None:
+        try:
+            with conn, conn.cursor() as cur:
+                cur.execute(f"DROP TABLE IF EXISTS {staging_table}")
+        except Exception as e:
+            logger.warning(f"Could not drop staging table {staging_table}: {e}")
+
+    def ensure_match_partitions(self, df: DataFrame) -> None:
+        """Create the competition/season partitions of fact_matches this batch needs"""
+        pairs = distinct_values(df, ["competition_id", "season_id"])
+        try:
+            with self.connection() as conn:
+                with conn, conn.cursor() as cur:
+                    for competition_id, season_id in pairs:
+                        cur.execute("SELECT ensure_match_partition(%s, %s)", (competition_id, season_id))
+        except psycopg2.errors.UndefinedFunction as e:
+            # The upsert that follows needs the partitioned table's key, so stop here
+            raise RuntimeError("fact_matches is not partitioned yet — run migrate.py") from e
+
+    def maintain_partitions(self) -> None:
+        """
+        Create this and next month's snapshot partitions, then roll up and drop
+        partitions older than ETL_SNAPSHOT_RETENTION_MONTHS (default 24, 0 keeps
+        everything). Cheap enough to call at the start of every run.
+        """
+        retain_months = int(os.getenv('ETL_SNAPSHOT_RETENTION_MONTHS', '24'))
+        try:
+            with self.connection() as conn:
+                with conn, conn.cursor() as cur:
+                    for table in SNAPSHOT_TABLES:
+                        cur.execute("SELECT ensure_snapshot_partition(%s, current_date)", (table,))
+                        cur.execute("SELECT ensure_snapshot_partition(%s, (current_date + INTERVAL '1 month')::date)",
+                                    (table,))
+                        if retain_months > 0:
+                            cur.execute("SELECT rollup_snapshot_partitions(%s, %s)", (table, retain_months))
+                            dropped = cur.fetchone()[0]
+                            if dropped:
+                                logger.info(f"Rolled up and dropped {dropped} old partition(s) of {table}")
+        except psycopg2.errors.UndefinedFunction:
+            logger.warning("Snapshot tables are not partitioned yet — run migrate.py")
 
-    def load_dim_dates(self, df: DataFrame) -> None:
-        existing = self.get_existing_ids("dim_dates", "date_id")
-        new_dates = self.filter_new_records(df, existing, "date_id")
-        self.load_dataframe(new_dates, "dim_dates", mode="append")
+    def load_dim_teams(self, df: DataFrame, count: int = None) -> list:
+        return self.upsert_dataframe(df, "dim_teams", count=count)
 
-    def load_fact_matches(self, df: DataFrame) -> None:
-        existing = self.get_existing_ids("fact_matches", "match_id")
-        new_matches = self.filter_new_records(df, existing, "match_id")
-        self.load_dataframe(new_matches, "fact_matches", mode="append")
+    def load_fact_matches(self, df: DataFrame, count: int = None) -> list:
+        self.ensure_match_partitions(df)
+        return self.upsert_dataframe(df, "fact_matches", count=count)
 
-    def load_standings(self, df: DataFrame) -> None:
-        self.load_dataframe(df, "standings_snapshot", mode="append")
+    def load_standings(self, df: DataFrame, count: int = None, replace_today: bool = False) -> None:
+        """
+        Store a standings snapshot. In full mode replace_today swaps out the
+        competition's snapshot of today instead of appending a second one.
+        """
+        if self.snapshot_mode == "cdc":
+            self.merge_snapshot(df, "standings_snapshot", count=count)
+        elif replace_today:
+            self.replace_snapshot_today(df, "standings_snapshot", count=count)
+        else:
+            self.load_dataframe(df, "standings_snapshot", mode="append", count=count)
+        self._mirror(df, "standings_snapshot")
 
-    def load_scorers(self, df: DataFrame) -> None:
-        self.load_dataframe(df, "dim_scorers", mode="append")
+    def load_scorers(self, df: DataFrame, count: int = None) -> None:
+        if self.snapshot_mode == "cdc":
+            self.merge_snapshot(df, "dim_scorers", count=count)
+        else:
+            self.load_dataframe(df, "dim_scorers", mode="append", count=count)
+        self._mirror(df, "dim_scorers")
@@ -26,6 +26,9 @@ import logging
 import findspark
 findspark.init()
 
+from json_stream import batches
+from schemas import column_names, row_schema
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -42,6 +45,7 @@ class FootballDataTransformer:
             .config("spark.executor.extraClassPath", jdbc_jar_path) \
             .config("spark.ui.showConsoleProgress", "false") \
             .config("spark.driver.host", "localhost") \
+            .config("spark.scheduler.mode", "FAIR") \
             .getOrCreate()
         
         self.spark.sparkContext.setLogLevel("ERROR")
@@ -52,68 +56,83 @@ class FootballDataTransformer:
         
         rows = []
         for team in teams:
-            rows.append({
-                'team_id': team['id'],
-                'team_name': team['name'],
-                'short_name': team.get('shortName', ''),
-                'tla': team.get('tla', ''),  # Three-letter acronym
-                'country': team.get('area', {}).get('name', ''),
-                'founded': team.get('founded'),
-                'stadium': team.get('venue', ''),
-                'club_colors': team.get('clubColors', ''),
-                'website': team.get('website', '')
-            })
-        
-        df = self.spark.createDataFrame(rows)
-        df = df.withColumn('loaded_at', current_timestamp())
-        
-        logger.info(f"Transformed {df.count()} team records")
+            rows.append((
+                team['id'],
+                team['name'],
+                team.get('shortName', ''),
+                team.get('tla', ''),  # Three-letter acronym
+                team.get('area', {}).get('name', ''),
+                team.get('founded'),
+                team.get('venue', ''),
+                team.get('clubColors', ''),
+                team.get('website', '')
+            ))
+        
+        df = self.spark.createDataFrame(rows, schema=row_schema('dim_teams'))
+        df = df.withColumn('loaded_at', current_timestamp()) \
+               .select(*column_names('dim_teams'))
+        
+        logger.info(f"Transformed {len(rows)} team records")
         return df
     
     def transform_matches(self, raw_data: dict) -> DataFrame:
-        matches = raw_data.get('matches', [])
-        competition = raw_data.get('competition', {})
+        rows = list(self._match_rows(raw_data.get('matches', []), raw_data.get('competition', {})))
+        df = self._matches_frame(rows)
         
-        rows = []
+        logger.info(f"{len(rows)} match records")
+        return df
+    
+    def transform_match_batches(self, matches, competition: dict, batch_size: int):
+        """
+        Yield fact_matches DataFrames of up to batch_size rows from an
+        iterable of match records (e.g. a json_stream.JsonArrayStream), so
+        only one batch of row tuples is held on the driver at a time.
+        """
+        for rows in batches(self._match_rows(matches, competition), batch_size):
+            df = self._matches_frame(rows)
+            logger.info(f"{len(rows)} match records in batch")
+            yield df
+    
+    @staticmethod
+    def _match_rows(matches, competition: dict):
         for match in matches:
             full_time = match.get('score', {}).get('fullTime', {})
             half_time = match.get('score', {}).get('halfTime', {})
             
-            rows.append({
-                'match_id': match['id'],
-                'competition_id': competition.get('id'),
-                'competition_name': competition.get('name', ''),
-                'season_id': match.get('season', {}).get('id'),
-                'matchday': match.get('matchday'),
-                'stage': match.get('stage', ''),
-                'utc_date': match.get('utcDate'),
-                'status': match.get('status'),
-                'home_team_id': match.get('homeTeam', {}).get('id'),
-                'home_team_name': match.get('homeTeam', {}).get('name', ''),
-                'away_team_id': match.get('awayTeam', {}).get('id'),
-                'away_team_name': match.get('awayTeam', {}).get('name', ''),
-                'home_score_fulltime': full_time.get('home'),
-                'away_score_fulltime': full_time.get('away'),
-                'home_score_halftime': half_time.get('home'),
-                'away_score_halftime': half_time.get('away'),
-                'winner': match.get('score', {}).get('winner'),
-                'duration': match.get('score', {}).get('duration', 'REGULAR'),
-                'referees': ', '.join([r.get('name', '') for r in match.get('referees', [])])
-            })
-        
-        df = self.spark.createDataFrame(rows)
-        
-  
-        df = df.withColumn('match_date', to_date(col('utc_date'))) \
-               .withColumn('match_timestamp', to_timestamp(col('utc_date'))) \
-               .withColumn('day', dayofmonth(col('match_date'))) \
-               .withColumn('month', month(col('match_date'))) \
-               .withColumn('year', year(col('match_date'))) \
-               .withColumn('day_of_week', dayofweek(col('match_date'))) \
-               .withColumn('loaded_at', current_timestamp())
-        
-        logger.info(f"{df.count()} match records")
-        return df
+            yield (
+                match['id'],
+                competition.get('id'),
+                competition.get('name', ''),
+                match.get('season', {}).get('id'),
+                match.get('matchday'),
+                match.get('stage', ''),
+                match.get('utcDate'),
+                match.get('status'),
+                match.get('homeTeam', {}).get('id'),
+                match.get('homeTeam', {}).get('name', ''),
+                match.get('awayTeam', {}).get('id'),
+                match.get('awayTeam', {}).get('name', ''),
+                full_time.get('home'),
+                full_time.get('away'),
+                half_time.get('home'),
+                half_time.get('away'),
+                match.get('score', {}).get('winner'),
+                match.get('score', {}).get('duration', 'REGULAR'),
+                ', '.join([r.get('name', '') for r in match.get('referees', [])])
+            )
+    
+    def _matches_frame(self, rows: list) -> DataFrame:
+        df = self.spark.createDataFrame(rows, schema=row_schema('fact_matches'))
+        
+        return df.withColumn('match_date', to_date(col('utc_date'))) \
+                 .withColumn('match_timestamp', to_timestamp(col('utc_date'))) \
+                 .withColumn('day', dayofmonth(col('match_date'))) \
+                 .withColumn('month', month(col('match_date'))) \
+                 .withColumn('year', year(col('match_date'))) \
+                 .withColumn('day_of_week', dayofweek(col('match_date'))) \
+                 .withColumn('date_id', (col('year') * 10000 + col('month') * 100 + col('day')).cast(IntegerType())) \
+                 .withColumn('loaded_at', current_timestamp()) \
+                 .select(*column_names('fact_matches'))
     
     def transform_standings(self, raw_data: dict) -> DataFrame:
         competition = raw_data.get('competition', {})
@@ -123,51 +142,34 @@ class FootballDataTransformer:
         rows = []
         for standing_type in standings:
             for team in standing_type.get('table', []):
-                rows.append({
-                    'competition_id': competition.get('id', 0),
-                    'competition_name': competition.get('name', ''),
-                    'season_id': season.get('id', 0),
-                    'season_start': season.get('startDate', ''),
-                    'season_end': season.get('endDate', ''),
-                    'standing_type': standing_type.get('type', 'TOTAL'),
-                    'position': team.get('position', 0),
-                    'team_id': team.get('team', {}).get('id', 0),
-                    'team_name': team.get('team', {}).get('name', ''),
-                    'played_games': team.get('playedGames', 0),
-                    'won': team.get('won', 0),
-                    'draw': team.get('draw', 0),
-                    'lost': team.get('lost', 0),
-                    'goals_for': team.get('goalsFor', 0),
-                    'goals_against': team.get('goalsAgainst', 0),
-                    'goal_difference': team.get('goalDifference', 0),
-                    'points': team.get('points', 0),
-                    'form': team.get('form') or ''
-                })
-        
-        df = self.spark.createDataFrame(rows)
-        df = df.withColumn('loaded_at', current_timestamp())
-        
-        logger.info(f"Transformed {df.count()} standing records")
+                rows.append((
+                    competition.get('id', 0),
+                    competition.get('name', ''),
+                    season.get('id', 0),
+                    season.get('startDate', ''),
+                    season.get('endDate', ''),
+                    standing_type.get('type', 'TOTAL'),
+                    team.get('position', 0),
+                    team.get('team', {}).get('id', 0),
+                    team.get('team', {}).get('name', ''),
+                    team.get('playedGames', 0),
+                    team.get('won', 0),
+                    team.get('draw', 0),
+                    team.get('lost', 0),
+                    team.get('goalsFor', 0),
+                    team.get('goalsAgainst', 0),
+                    team.get('goalDifference', 0),
+                    team.get('points', 0),
+                    team.get('form') or ''
+                ))
+        
+        df = self.spark.createDataFrame(rows, schema=row_schema('standings_snapshot'))
+        df = df.withColumn('loaded_at', current_timestamp()) \
+               .select(*column_names('standings_snapshot'))
+        
+        logger.info(f"Transformed {len(rows)} standing records")
         return df
     
-    def create_date_dimension(self, matches_df: DataFrame) -> DataFrame:
-        date_df = matches_df.select(
-            col('match_date').alias('full_date'),
-            col('day'),
-            col('month'),
-            col('year'),
-            col('day_of_week'),
-            col('matchday')
-        ).distinct().filter(col('full_date').isNotNull())
-        
-        date_df = date_df.withColumn(
-            'date_id',
-            (col('year') * 10000 + col('month') * 100 + col('day')).cast(IntegerType())
-        )
-        
-        logger.info(f"Created date dimension with {date_df.count()} records")
-        return date_df
-    
     def stop(self):
         self.spark.stop()
         logger.info("Spark session stopped")
@@ -184,23 +186,24 @@ class FootballDataTransformer:
             player = scorer.get('player', {})
             team = scorer.get('team', {})
             
-            rows.append({
-                'competition_id': competition.get('id'),
-                'competition_name': competition.get('name', ''),
-                'season_id': season.get('id'),
-                'player_id': player.get('id'),
-                'player_name': player.get('name', ''),
-                'nationality': player.get('nationality', ''),
-                'team_id': team.get('id'),
-                'team_name': team.get('name', ''),
-                'goals': scorer.get('goals'),
-                'assists': scorer.get('assists'),
-                'penalties': scorer.get('penalties'),
-                'played_matches': scorer.get('playedMatches')
-            })
-        
-        df = self.spark.createDataFrame(rows)
-        df = df.withColumn('loaded_at', current_timestamp())
-        
-        logger.info(f"{df.count()} scorer records")
+            rows.append((
+                competition.get('id'),
+                competition.get('name', ''),
+                season.get('id'),
+                player.get('id'),
+                player.get('name', ''),
+                player.get('nationality', ''),
+                team.get('id'),
+                team.get('name', ''),
+                scorer.get('goals'),
+                scorer.get('assists'),
+                scorer.get('penalties'),
+                scorer.get('playedMatches')
+            ))
+        
+        df = self.spark.createDataFrame(rows, schema=row_schema('dim_scorers'))
+        df = df.withColumn('loaded_at', current_timestamp()) \
+               .select(*column_names('dim_scorers'))
+        
+        logger.info(f"{len(rows)} scorer records")
         return df
\ No newline at end of file
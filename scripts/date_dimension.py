@@ -0,0 +1,102 @@
+import logging
+import os
+from datetime import date, timedelta
+
+import pandas as pd
+
+from schemas import column_names
+
+logger = logging.getLogger(__name__)
+
+# dim_dates as a calendar: every day of a configurable range, generated in
+# one vectorized pass instead of being derived from each run's matches.
+# Matches reference it through date_id = yyyymmdd, computed arithmetically
+# by the transforms, so loading a run needs no date lookup at all. A run
+# only writes dates when its matches fall outside the stored range.
+
+CALENDAR_START = date.fromisoformat(os.getenv('ETL_CALENDAR_START', '2000-01-01'))
+CALENDAR_END = date.fromisoformat(os.getenv('ETL_CALENDAR_END', '2039-12-31'))
+
+
+def calendar_frame(start: date, end: date) -> pd.DataFrame:
+    """dim_dates rows for every day from start to end inclusive"""
+    days = pd.date_range(start, end, freq='D')
+    calendar = pd.DataFrame({
+        'date_id': (days.year * 10000 + days.month * 100 + days.day).astype('int64'),
+        'full_date': days.date,
+        'day': days.day.astype('int64'),
+        'month': days.month.astype('int64'),
+        'year': days.year.astype('int64'),
+        # pandas counts Monday=0; match Spark's dayofweek (1=Sunday ... 7=Saturday)
+        'day_of_week': ((days.dayofweek + 1) % 7 + 1).astype('int64'),
+        # A calendar day has no matchday; the column is kept for the rows
+        # loaded before the calendar existed
+        'matchday': None,
+    })
+    return calendar[column_names('dim_dates')]
+
+
+def payload_date_range(raw_data: dict) -> tuple:
+    """(first, last) match date across {competition: {endpoint: payload}}, or None without matches"""
+    days = [
+        match['utcDate'][:10]
+        for payloads in raw_data.values()
+        for match in payloads.get('matches', {}).get('matches', [])
+        if match.get('utcDate')
+    ]
+    if not days:
+        return None
+    return date.fromisoformat(min(days)), date.fromisoformat(max(days))
+
+
+def missing_ranges(stored: tuple, needed: tuple) -> list:
+    """
+    [(start, end), ...] of needed not covered by stored, where stored is
+    the contiguous (first, last) range already in dim_dates or None.
+    """
+    if stored is None:
+        return [needed]
+    ranges = []
+    if needed[0] < stored[0]:
+        ranges.append((needed[0], stored[0] - timedelta(days=1)))
+    if needed[1] > stored[1]:
+        ranges.append((stored[1] + timedelta(days=1), needed[1]))
+    return ranges
+
+
+def stored_range(loader) -> tuple:
+    """
+    (first, last) of dim_dates when it holds every day in between, None
+    otherwise (empty, or sparse dates loaded from matches before the calendar).
+    """
+    with loader.connection() as conn:
+        with conn, conn.cursor() as cur:
+            cur.execute("SELECT MIN(full_date), MAX(full_date), COUNT(*) FROM dim_dates")
+            first, last, count = cur.fetchone()
+    if not count or (last - first).days + 1 != count:
+        return None
+    return first, last
+
+
+def ensure_calendar(loader, match_range: tuple = None) -> int:
+    """
+    Make dim_dates cover CALENDAR_START..CALENDAR_END and match_range, the
+    (first, last) match dates of a run; returns the number of days written.
+    Existing dates are never rewritten.
+    """
+    needed = (CALENDAR_START, CALENDAR_END)
+    if match_range is not None:
+        needed = (min(needed[0], match_range[0]), max(needed[1], match_range[1]))
+
+    ranges = missing_ranges(stored_range(loader), needed)
+    if not ranges:
+        logger.info("Calendar already covers the run's dates")
+        return 0
+
+    written = 0
+    for start, end in ranges:
+        logger.info(f"Extending calendar with {start} to {end}")
+        calendar = calendar_frame(start, end)
+        loader.upsert_dataframe(calendar, "dim_dates", update=False, count=len(calendar))
+        written += len(calendar)
+    return written
@@ -0,0 +1,57 @@
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+
+from state_store import JsonStateStore
+
+logger = logging.getLogger(__name__)
+
+# Freshness of slowly changing dimensions (teams barely change within a
+# season). A competition's teams are not requested again until their TTL
+# expires, and a re-requested payload whose content hash matches the last
+# load is neither transformed nor loaded.
+
+
+def content_hash(records) -> str:
+    """Stable hash of a payload's records, independent of key order"""
+    return hashlib.sha256(json.dumps(records, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class DimensionRegistry:
+    """
+    When each (dimension, competition) was last refreshed, and the content
+    hash of what was loaded, persisted under the state directory.
+
+    ttl defaults to ETL_TEAMS_TTL_HOURS (168); a zero TTL requests the
+    payload on every run and relies on the hash alone.
+    """
+
+    def __init__(self, path: str, ttl: timedelta = None):
+        self.store = JsonStateStore(path)
+        if ttl is None:
+            ttl = timedelta(hours=float(os.getenv('ETL_TEAMS_TTL_HOURS', '168')))
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(dimension: str, competition_code: str) -> str:
+        return f"{dimension}:{competition_code}"
+
+    def is_fresh(self, dimension: str, competition_code: str, now: datetime) -> bool:
+        """True while the last refresh is within the TTL"""
+        entry = self.store.get(self._key(dimension, competition_code))
+        if entry is None or not self.ttl:
+            return False
+        return now - datetime.fromisoformat(entry["refreshed_at"]) < self.ttl
+
+    def is_unchanged(self, dimension: str, competition_code: str, digest: str) -> bool:
+        entry = self.store.get(self._key(dimension, competition_code))
+        return entry is not None and entry["content_hash"] == digest
+
+    def record(self, dimension: str, competition_code: str, digest: str, now: datetime = None) -> None:
+        """Mark the dimension refreshed with content digest; call once its load has committed"""
+        self.store.set(self._key(dimension, competition_code), {
+            "refreshed_at": (now or datetime.now()).isoformat(),
+            "content_hash": digest,
+        })
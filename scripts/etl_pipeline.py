@@ -1,13 +1,28 @@
+import argparse
 import logging
+import os
 import sys
-from datetime import datetime
-from functools import reduce
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 
-from api_client import FootballAPIClient
+from aggregates import refresh_aggregates
+from api_client import DEFAULT_ENDPOINTS, FootballAPIClient
 from data_transformer import FootballDataTransformer
+from date_dimension import ensure_calendar, payload_date_range
+from dimension_registry import DimensionRegistry, content_hash
+from pandas_transformer import PandasDataTransformer
 from data_loader import PostgresDataLoader
+from copy_loader import PostgresCopyLoader
+from frames import distinct_values, persist, unpersist
+from schemas import KEY_COLUMNS
+from standings_engine import SEASON_KEYS, materialize_season_standings
+from landing_zone import LandingZone
+from run_metrics import RunMetrics
+from run_state import COMPLETE, FAILED, RunStateStore
+from state_store import JsonStateStore
 from validators import validate_raw_response, validate_dataframe
 
+os.makedirs('logs', exist_ok=True)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -20,119 +35,494 @@ logger = logging.getLogger(__name__)
 
 COMPETITIONS = ["PL", "PD", "BL1"] # Premier League, La Liga, Bundesliga
 
-def run_etl_pipeline(competitions: list = None) -> bool:
-    """Run ETL pipeline for multiple competitions"""
-    
-    if competitions is None:
-        competitions = COMPETITIONS
-    
-    logger.info(f"Starting Football Data ETL Pipeline")
-    logger.info(f"Competitions: {competitions}")
-    logger.info(f"Timestamp: {datetime.now().isoformat()}")
-    
-    api_client = None
-    transformer = None
-    loader = None
-    
-    try:
-        logger.info("Initializing pipeline components")
-        api_client = FootballAPIClient()
-        transformer = FootballDataTransformer()
-        loader = PostgresDataLoader(spark=transformer.spark)
+STATE_DIR = os.getenv('ETL_STATE_DIR', 'state')
+REPORTS_DIR = os.getenv('ETL_REPORTS_DIR', 'reports')
 
-        all_dates_dfs = []
-        
-        for competition_code in competitions:
-            logger.info("\n" + "="*50)
-            logger.info(f"PROCESSING: {competition_code}")
-            logger.info("="*50)
-            
-            # EXTRACT
-            logger.info(f"[{competition_code}] Extracting teams data")
-            teams_raw = api_client.get_teams(competition_code)
-            validate_raw_response(teams_raw, "teams", competition_code)
+# Standings tables can be derived from fact_matches (standings_engine.py)
+# instead of requested from the API on every run
+STANDINGS_FROM_MATCHES = os.getenv('ETL_STANDINGS_FROM_MATCHES', 'false').lower() == 'true'
 
-            logger.info(f"[{competition_code}] Extracting matches data")
-            matches_raw = api_client.get_matches(competition_code)
-            validate_raw_response(matches_raw, "matches", competition_code)
+# Loader backends selectable per deployment via ETL_LOADER_BACKEND or --loader
+LOADER_BACKENDS = {
+    "jdbc": PostgresDataLoader,
+    "copy": PostgresCopyLoader,
+}
 
-            logger.info(f"[{competition_code}] Extracting standings data")
-            standings_raw = api_client.get_standings(competition_code)
-            validate_raw_response(standings_raw, "standings", competition_code)
+ENGINES = ("auto", "spark", "pandas")
 
-            logger.info(f"[{competition_code}] Extracting scorers data")
-            scorers_raw = api_client.get_scorers(competition_code)
-            validate_raw_response(scorers_raw, "scorers", competition_code)
 
-            # TRANSFORM
-            logger.info(f"[{competition_code}] Transforming data")
+def endpoint_record_count(endpoint: str, payload: dict) -> int:
+    """Records in one extracted payload; standings count the rows of every table"""
+    records = payload.get(endpoint, [])
+    if endpoint == "standings":
+        return sum(len(standing.get("table", [])) for standing in records)
+    return len(records)
+
+
+def payload_record_count(raw_data: dict) -> int:
+    """Total records across all extracted payloads, used to size the transform engine"""
+    return sum(
+        endpoint_record_count(endpoint, payload)
+        for payloads in raw_data.values()
+        for endpoint, payload in payloads.items()
+    )
+
+
+def select_engine(engine: str, raw_data: dict) -> str:
+    """
+    Resolve "auto" to a concrete engine: pandas when the run's payloads are
+    small enough that JVM start-up would dominate, Spark otherwise.
+    """
+    if engine != "auto":
+        return engine
+    records = payload_record_count(raw_data)
+    threshold = int(os.getenv('ETL_PANDAS_MAX_RECORDS', '20000'))
+    selected = "pandas" if records <= threshold else "spark"
+    logger.info(f"Engine auto-selection: {records} records (threshold {threshold}) -> {selected}")
+    return selected
 
-            teams_df = transformer.transform_teams(teams_raw)
-            validate_dataframe(teams_df, "team_id", competition_code)
 
-            matches_df = transformer.transform_matches(matches_raw)
-            validate_dataframe(matches_df, "match_id", competition_code)
+def incremental_match_params(sync_state: JsonStateStore, competitions: list, now: datetime) -> dict:
+    """
+    Build a dateFrom/dateTo window per competition from its high-water mark.
+
+    The window opens a few days before the last successful sync, so late
+    score corrections and postponements are picked up again, and runs a few
+    days past today to catch newly scheduled fixtures. Competitions without a
+    mark, or whose window would exceed ETL_INCREMENTAL_MAX_WINDOW_DAYS, fall
+    back to the full season.
+    """
+    lookback = timedelta(days=int(os.getenv('ETL_INCREMENTAL_LOOKBACK_DAYS', '3')))
+    lookahead = timedelta(days=int(os.getenv('ETL_INCREMENTAL_LOOKAHEAD_DAYS', '7')))
+    max_window = timedelta(days=int(os.getenv('ETL_INCREMENTAL_MAX_WINDOW_DAYS', '30')))
+
+    params = {}
+    for competition_code in competitions:
+        last_sync = sync_state.get(competition_code)
+        if not last_sync:
+            logger.info(f"[{competition_code}] No match high-water mark yet — extracting the full season")
+            continue
+
+        date_from = datetime.fromisoformat(last_sync).date() - lookback
+        date_to = now.date() + lookahead
+        if date_to - date_from > max_window:
+            logger.info(f"[{competition_code}] Last sync {last_sync} is too old for a window — extracting the full season")
+            continue
+
+        logger.info(f"[{competition_code}] Incremental match window {date_from} to {date_to}")
+        params[competition_code] = {
+            "matches": {"date_from": date_from.isoformat(), "date_to": date_to.isoformat()}
+        }
+    return params
+
+
+def extract_endpoints(competitions: list, dimensions: DimensionRegistry, now: datetime,
+                      requested: list = None) -> dict:
+    """
+    Endpoints to request per competition, out of requested (default: all):
+    teams are left out while their dimension is within its TTL, standings
+    when ETL_STANDINGS_FROM_MATCHES.
+    """
+    requested = requested or DEFAULT_ENDPOINTS
+    endpoints = {}
+    for competition_code in competitions:
+        endpoints[competition_code] = [
+            e for e in DEFAULT_ENDPOINTS
+            if e in requested and not (STANDINGS_FROM_MATCHES and e == "standings")
+        ]
+        if "teams" in endpoints[competition_code] and dimensions.is_fresh("dim_teams", competition_code, now):
+            logger.info(f"[{competition_code}] Teams refreshed within their TTL — not requesting them")
+            endpoints[competition_code].remove("teams")
+    return endpoints
+
+
+def build_loader(loader_backend: str, spark, parallelism: int) -> PostgresDataLoader:
+    """
+    The LOADER_BACKENDS entry for loader_backend. The copy backend's pool
+    gets at least one connection per competition thread, since an exhausted
+    ThreadedConnectionPool raises instead of waiting.
+    """
+    if loader_backend == "copy":
+        pool_size = int(os.getenv('POSTGRES_POOL_SIZE', '4'))
+        return LOADER_BACKENDS["copy"](spark=spark, max_connections=max(pool_size, parallelism))
+    return LOADER_BACKENDS[loader_backend](spark=spark)
+
+
+def run_unit(run_state: RunStateStore, competition_code: str, stage: str, action) -> None:
+    """
+    Run action unless run_state shows the unit already completed, then record
+    it along with any details dict the action returns.
+    """
+    if run_state is not None and run_state.is_done(competition_code, stage):
+        logger.info(f"[{competition_code}] {stage} already completed in this run — skipping")
+        return
+    details = action()
+    if run_state is not None:
+        run_state.mark_done(competition_code, stage, **(details or {}))
+
+
+def process_competition(competition_code: str, payloads: dict, transformer, loader,
+                        allow_empty_matches: bool = False, metrics: RunMetrics = None,
+                        run_state: RunStateStore = None, dimensions: DimensionRegistry = None) -> None:
+    """
+    Validate, transform and load one competition's extracted payloads
+    ({endpoint: payload}); endpoints missing from payloads are skipped.
+    Stage timings and row counts go to metrics, and loads already recorded
+    in run_state are not repeated. dimensions decides whether teams changed.
+    """
+    metrics = metrics or RunMetrics(competition_code)
+    job_group = f"{metrics.run_id}:{competition_code}"
+    if transformer.spark is not None:
+        spark_context = transformer.spark.sparkContext
+        spark_context.setLocalProperty("spark.scheduler.pool", competition_code)
+        # Tags this thread's jobs so they can be counted per competition
+        spark_context.setJobGroup(job_group, f"ETL {competition_code}")
+
+    logger.info("\n" + "="*50)
+    logger.info(f"PROCESSING: {competition_code}")
+    logger.info("="*50)
+    
+    teams_raw = payloads.get("teams")
+    matches_raw = payloads.get("matches")
+    standings_raw = payloads.get("standings")
+    scorers_raw = payloads.get("scorers")
+
+    with metrics.competition(competition_code), metrics.stage("validate"):
+        if teams_raw is not None:
+            validate_raw_response(teams_raw, "teams", competition_code)
+        if matches_raw is not None:
+            # A windowed request (incremental run, or a replay of one) can legitimately be empty
+            validate_raw_response(matches_raw, "matches", competition_code, allow_empty=allow_empty_matches)
+        if standings_raw is not None:
+            validate_raw_response(standings_raw, "standings", competition_code)
+        if scorers_raw is not None:
+            validate_raw_response(scorers_raw, "scorers", competition_code)
+
+    teams_hash = None
+    if teams_raw is not None and dimensions is not None:
+        teams_hash = content_hash(teams_raw["teams"])
+        if dimensions.is_unchanged("dim_teams", competition_code, teams_hash):
+            logger.info(f"[{competition_code}] Teams unchanged since the last load — skipping transform and load")
+            dimensions.record("dim_teams", competition_code, teams_hash)
+            teams_raw = None
 
-            standings_df = transformer.transform_standings(standings_raw)
-            validate_dataframe(standings_df, "team_id", competition_code)
+    teams_df = matches_df = standings_df = scorers_df = None
+    try:
+        with metrics.competition(competition_code):
+            # TRANSFORM — outputs are persisted so validation, date derivation and
+            # load reuse one computation; validation metrics carry the row counts
+            logger.info(f"[{competition_code}] Transforming data")
+            with metrics.stage("transform"):
+                if teams_raw is not None:
+                    teams_df = persist(transformer.transform_teams(teams_raw))
+                if matches_raw is not None and matches_raw["matches"]:
+                    matches_df = persist(transformer.transform_matches(matches_raw))
+                elif matches_raw is not None:
+                    logger.info(f"[{competition_code}] No matches in the incremental window — nothing to merge")
+                if standings_raw is not None:
+                    standings_df = persist(transformer.transform_standings(standings_raw))
+                if scorers_raw is not None:
+                    scorers_df = persist(transformer.transform_scorers(scorers_raw))
 
-            scorers_df = transformer.transform_scorers(scorers_raw)
-            validate_dataframe(scorers_df, "player_id", competition_code)
+            with metrics.stage("validate"):
+                if teams_df is not None:
+                    teams_metrics = validate_dataframe(teams_df, "team_id", competition_code,
+                                                       key_columns=KEY_COLUMNS["dim_teams"])
+                if matches_df is not None:
+                    matches_metrics = validate_dataframe(matches_df, "match_id", competition_code,
+                                                         key_columns=KEY_COLUMNS["fact_matches"])
+                if standings_df is not None:
+                    standings_metrics = validate_dataframe(standings_df, "team_id", competition_code,
+                                                           key_columns=KEY_COLUMNS["standings_snapshot"])
+                if scorers_df is not None:
+                    scorers_metrics = validate_dataframe(scorers_df, "player_id", competition_code,
+                                                         key_columns=KEY_COLUMNS["dim_scorers"])
 
-            dates_df = transformer.create_date_dimension(matches_df)
+            if teams_df is not None:
+                metrics.record_rows("dim_teams", endpoint_record_count("teams", teams_raw), teams_metrics["row_count"])
+            if matches_raw is not None:
+                metrics.record_rows("fact_matches", endpoint_record_count("matches", matches_raw),
+                                    matches_metrics["row_count"] if matches_df is not None else 0)
+            if standings_df is not None:
+                metrics.record_rows("standings_snapshot", endpoint_record_count("standings", standings_raw),
+                                    standings_metrics["row_count"])
+            if scorers_df is not None:
+                metrics.record_rows("dim_scorers", endpoint_record_count("scorers", scorers_raw),
+                                    scorers_metrics["row_count"])
 
-            all_dates_dfs.append(dates_df)
-            
             # LOAD
             logger.info(f"[{competition_code}] Loading data to database")
+            with metrics.stage("load"):
+                def load_teams():
+                    if teams_df is None:
+                        return
+                    loader.load_dim_teams(teams_df, count=teams_metrics["row_count"])
+                    if dimensions is not None:
+                        dimensions.record("dim_teams", competition_code, teams_hash)
+
+                changed_match_ids = []
+
+                def load_matches():
+                    if matches_df is not None:
+                        changed_match_ids.extend(
+                            loader.load_fact_matches(matches_df, count=matches_metrics["row_count"])
+                        )
+                    return {"changed_match_ids": changed_match_ids}
+
+                def merged_match_ids():
+                    if not changed_match_ids and run_state is not None and run_state.is_done(competition_code, "fact_matches"):
+                        # Matches were merged by an earlier attempt of this run
+                        return run_state.unit(competition_code, "fact_matches").get("changed_match_ids", [])
+                    return changed_match_ids
+
+                def update_aggregates():
+                    refresh_aggregates(loader, merged_match_ids())
+
+                def update_standings_history():
+                    if not merged_match_ids():
+                        logger.info(f"[{competition_code}] No changed matches — standings history is up to date")
+                        return
+                    for season_competition_id, season_id in distinct_values(matches_df, SEASON_KEYS):
+                        materialize_season_standings(loader, season_competition_id, season_id)
+
+                def load_standings():
+                    if standings_df is None:
+                        logger.info(f"[{competition_code}] No standings payload — no snapshot to load")
+                    elif loader.snapshot_exists_today("standings_snapshot", standings_raw["competition"]["id"]):
+                        logger.info(f"[{competition_code}] Standings snapshot already loaded today — skipping")
+                    else:
+                        loader.load_standings(standings_df, count=standings_metrics["row_count"])
+
+                def load_scorers():
+                    if scorers_df is None:
+                        logger.info(f"[{competition_code}] No scorers payload — nothing to load")
+                    elif loader.snapshot_exists_today("dim_scorers", scorers_raw["competition"]["id"]):
+                        logger.info(f"[{competition_code}] Scorers snapshot already loaded today — skipping")
+                    else:
+                        loader.load_scorers(scorers_df, count=scorers_metrics["row_count"])
+
+                run_unit(run_state, competition_code, "dim_teams", load_teams)
+                run_unit(run_state, competition_code, "fact_matches", load_matches)
+                run_unit(run_state, competition_code, "aggregates", update_aggregates)
+                run_unit(run_state, competition_code, "standings_history", update_standings_history)
+                run_unit(run_state, competition_code, "standings_snapshot", load_standings)
+                run_unit(run_state, competition_code, "dim_scorers", load_scorers)
+    finally:
+        for df in (teams_df, matches_df, standings_df, scorers_df):
+            unpersist(df)
+        if transformer.spark is not None:
+            tracker = transformer.spark.sparkContext.statusTracker()
+            metrics.record_spark_jobs(competition_code, len(tracker.getJobIdsForGroup(job_group)))
+
+    logger.info(f"[{competition_code}] Complete")
+
+
+def write_run_metrics(metrics: RunMetrics) -> None:
+    """Write the run report and Prometheus textfile; never fails the run"""
+    textfile = os.getenv('ETL_METRICS_TEXTFILE', os.path.join(REPORTS_DIR, 'etl_pipeline.prom'))
+    try:
+        metrics.write_json(os.path.join(REPORTS_DIR, f"run_{metrics.run_id}.json"))
+        metrics.write_prometheus(textfile)
+    except OSError as e:
+        logger.warning(f"Could not write run metrics: {e}")
 
-            loader.load_dim_teams(teams_df)
-            loader.load_fact_matches(matches_df)
 
-            competition_id = standings_df.select('competition_id').first()[0]
+def run_etl_pipeline(competitions: list = None, max_workers: int = None, replay_run_id: str = None,
+                     incremental: bool = False, loader_backend: str = None, engine: str = None,
+                     parallelism: int = None, resume_run_id: str = None, api_client: FootballAPIClient = None,
+                     transformer=None, loader: PostgresDataLoader = None, endpoints: list = None) -> bool:
+    """
+    Run ETL pipeline for multiple competitions; returns False if any failed.
 
-            if loader.snapshot_exists_today("standings_snapshot", competition_id):
-                logger.info(f"[{competition_code}] Standings snapshot already loaded today — skipping")
+    competitions defaults to COMPETITIONS and endpoints to DEFAULT_ENDPOINTS.
+    max_workers bounds concurrent extraction and parallelism the competitions
+    transformed and loaded at once. replay_run_id and resume_run_id
+    ("latest" for the last unfinished run) reuse landed payloads instead of
+    calling the API. incremental requests matches only around each
+    competition's last sync. engine and loader_backend select the transform engine
+    and LOADER_BACKENDS entry; they are ignored when api_client, transformer
+    and loader are passed in, which the run then leaves open. See the README
+    for the environment settings.
+    """
+    
+    started_at = datetime.now()
+    landing = LandingZone(os.getenv('ETL_LANDING_DIR', 'landing'))
+    sync_state = JsonStateStore(os.path.join(STATE_DIR, 'match_sync.json'))
+    loader_backend = loader_backend or os.getenv('ETL_LOADER_BACKEND', 'jdbc')
+    engine = engine or os.getenv('ETL_ENGINE', 'auto')
+
+    if resume_run_id == "latest":
+        resume_run_id = RunStateStore.latest_unfinished(STATE_DIR)
+        if resume_run_id is None:
+            logger.info("No unfinished run to resume")
+            return True
+    run_id = resume_run_id or replay_run_id or LandingZone.new_run_id()
+
+    # Replays re-load a finished run on purpose, so they keep no run state
+    run_state = None if replay_run_id else RunStateStore(STATE_DIR, run_id)
+    dimensions = None if replay_run_id else DimensionRegistry(os.path.join(STATE_DIR, 'dimensions.json'))
+    if resume_run_id:
+        if not run_state.exists():
+            logger.error(f"No run state recorded for run {run_id} — nothing to resume")
+            return False
+        started_at = run_state.started_at
+        incremental = run_state.options.get("incremental", False)
+        endpoints = run_state.options.get("endpoints")
+        competitions = [
+            competition_code for competition_code in competitions or run_state.options["competitions"]
+            if not run_state.competition_done(competition_code)
+        ]
+        metrics = RunMetrics(f"{run_id}_resume")
+    else:
+        if competitions is None and not replay_run_id:
+            competitions = COMPETITIONS
+        if run_state is not None:
+            run_state.start(competitions=competitions, incremental=incremental, endpoints=endpoints)
+        metrics = RunMetrics(f"{run_id}_replay" if replay_run_id else run_id)
+    
+    logger.info(f"Starting Football Data ETL Pipeline")
+    logger.info(f"Run ID: {run_id}{' (replay)' if replay_run_id else ' (resume)' if resume_run_id else ''}")
+    logger.info(f"Competitions: {competitions or 'all landed'}")
+    logger.info(f"Timestamp: {datetime.now().isoformat()}")
+    
+    # Only components created by this run are closed at the end
+    owns_transformer = transformer is None
+    owns_loader = loader is None
+    
+    try:
+        logger.info("Initializing pipeline components")
+        with metrics.stage("extract"):
+            if replay_run_id:
+                raw_data = landing.read_run(replay_run_id, competitions)
+                competitions = list(raw_data)
             else:
-                loader.load_standings(standings_df)
+                # A resumed run reuses whatever it already landed
+                landed = [c for c in competitions if run_state.is_done(c, "extract")]
+                to_extract = [c for c in competitions if c not in landed]
+                raw_data = landing.read_run(run_id, landed) if landed else {}
+                if to_extract:
+                    api_client = api_client or FootballAPIClient()
+                    api_client.metrics = metrics
+                    params = incremental_match_params(sync_state, to_extract, started_at) if incremental else None
+                    # EXTRACT — all endpoints for all competitions in parallel, under the API rate limit
+                    requested = extract_endpoints(to_extract, dimensions, started_at, endpoints)
+                    extracted = api_client.extract_all(to_extract, endpoints=requested,
+                                                       max_workers=max_workers, params=params)
+                    landing.write_run(run_id, extracted)
+                    for competition_code in to_extract:
+                        run_state.mark_done(competition_code, "extract", landing=landing.find_run_dir(run_id))
+                    raw_data.update(extracted)
+
+        if not competitions:
+            logger.info(f"Run {run_id} has nothing left to process")
+            if run_state is not None:
+                run_state.set_status(COMPLETE)
+            metrics.success = True
+            return True
 
-            if loader.snapshot_exists_today("dim_scorers", competition_id):
-                logger.info(f"[{competition_code}] Scorers snapshot already loaded today — skipping")
+        if transformer is None:
+            if select_engine(engine, raw_data) == "pandas":
+                transformer = PandasDataTransformer()
+                if loader_backend == "jdbc":
+                    logger.info("JDBC loader needs Spark — using the copy backend with the pandas engine")
+                    loader_backend = "copy"
             else:
-                loader.load_scorers(scorers_df)
-            
-            logger.info(f"[{competition_code}] Complete")
+                transformer = FootballDataTransformer()
+        parallelism = parallelism or int(os.getenv('ETL_MAX_PARALLEL_COMPETITIONS', '1'))
+        if loader is None:
+            loader = build_loader(loader_backend, transformer.spark, parallelism)
+        loader.metrics = metrics
+        loader.maintain_partitions()
 
-            # Load dates
-            logger.info("Loading consolidated date dimension")
-        
-        # Union all date dataframes, deduplicate within this run, then filter against DB
-        all_dates = reduce(lambda df1, df2: df1.union(df2), all_dates_dfs)
-        unique_dates = all_dates.dropDuplicates(["date_id"])
+        # The calendar only grows when this run's matches fall outside it
+        with metrics.stage("load"):
+            ensure_calendar(loader, payload_date_range(raw_data))
+        if run_state is not None:
+            for competition_code in competitions:
+                run_state.mark_done(competition_code, "dim_dates")
+
+        allow_empty_matches = incremental or replay_run_id is not None
+        failed = []
 
-        logger.info(f"Checking for new dates to load")
-        loader.load_dim_dates(unique_dates)
+        logger.info(f"Processing {len(competitions)} competition(s) with parallelism {parallelism}")
+        with ThreadPoolExecutor(max_workers=parallelism) as executor:
+            futures = {
+                competition_code: executor.submit(
+                    process_competition, competition_code, raw_data[competition_code],
+                    transformer, loader, allow_empty_matches, metrics, run_state, dimensions
+                )
+                for competition_code in competitions
+            }
+            for competition_code, future in futures.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    # One league failing must not stop the others from loading
+                    logger.error(f"[{competition_code}] Failed: {e}")
+                    logger.exception("Full traceback:")
+                    failed.append(competition_code)
+                    continue
+                if not replay_run_id and "matches" in raw_data[competition_code]:
+                    sync_state.set(competition_code, started_at.isoformat())
+
+        if failed:
+            logger.error(f"ETL pipeline finished with failed competitions: {failed}")
+            if run_state is not None:
+                run_state.set_status(FAILED)
+                logger.error(f"Rerun with --resume {run_id} to retry only the unfinished units")
+            metrics.success = False
+            return False
         
         logger.info("\n" + "="*50)
         logger.info("ETL PIPELINE COMPLETED SUCCESSFULLY")
         logger.info("="*50)
         
+        if run_state is not None:
+            run_state.set_status(COMPLETE)
+        metrics.success = True
         return True
         
     except Exception as e:
         logger.error(f"ETL Pipeline failed: {e}")
         logger.exception("Full traceback:")
+        if run_state is not None:
+            run_state.set_status(FAILED)
+        metrics.success = False
         return False
         
     finally:
-        if transformer:
+        if loader and owns_loader:
+            loader.close()
+        if transformer and owns_transformer:
             transformer.stop()
+        write_run_metrics(metrics)
         logger.info("Pipeline cleanup complete")
 
 
+def parse_args(argv: list = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Football data ETL pipeline")
+    parser.add_argument("--competitions", nargs="+", metavar="CODE",
+                        help=f"Competition codes to process (default: {' '.join(COMPETITIONS)})")
+    parser.add_argument("--replay", metavar="RUN_ID",
+                        help="Transform and load a landed run from disk without calling the API")
+    parser.add_argument("--resume", nargs="?", const="latest", metavar="RUN_ID",
+                        help="Finish a failed run, skipping units it completed (default: latest unfinished run)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only extract matches in a date window around each competition's last sync")
+    parser.add_argument("--loader", choices=sorted(LOADER_BACKENDS),
+                        help="Loader backend (default: ETL_LOADER_BACKEND or jdbc)")
+    parser.add_argument("--engine", choices=ENGINES,
+                        help="Transform engine (default: ETL_ENGINE or auto)")
+    parser.add_argument("--endpoints", nargs="+", choices=DEFAULT_ENDPOINTS, metavar="ENDPOINT",
+                        help=f"Only extract and load these endpoints (default: all of {' '.join(DEFAULT_ENDPOINTS)})")
+    parser.add_argument("--parallel", type=int, metavar="N",
+                        help="Competitions processed concurrently (default: ETL_MAX_PARALLEL_COMPETITIONS or 1)")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    import os
-    os.makedirs('logs', exist_ok=True)
-    
-    success = run_etl_pipeline(COMPETITIONS)
+    args = parse_args()
+    success = run_etl_pipeline(args.competitions, replay_run_id=args.replay, incremental=args.incremental,
+                               loader_backend=args.loader, engine=args.engine, parallelism=args.parallel,
+                               resume_run_id=args.resume, endpoints=args.endpoints)
     sys.exit(0 if success else 1)
\ No newline at end of file
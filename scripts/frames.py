@@ -0,0 +1,49 @@
+from functools import reduce
+
+import pandas as pd
+
+# Helpers that let validators, loaders and the pipeline accept either a Spark
+# DataFrame or a pandas DataFrame produced by the lightweight engine.
+
+
+def is_pandas(df) -> bool:
+    return isinstance(df, pd.DataFrame)
+
+
+def row_count(df) -> int:
+    return len(df) if is_pandas(df) else df.count()
+
+
+def persist(df):
+    """Cache a Spark DataFrame that several actions will reuse; pandas is already materialised"""
+    return df if is_pandas(df) else df.persist()
+
+
+def unpersist(df) -> None:
+    if df is not None and not is_pandas(df):
+        df.unpersist()
+
+
+def iter_rows(df):
+    """Yield each row as a plain tuple in column order, with missing values as None"""
+    if not is_pandas(df):
+        for row in df.toLocalIterator():
+            yield tuple(row)
+        return
+    clean = df.astype(object).where(df.notna(), None)
+    yield from clean.itertuples(index=False, name=None)
+
+
+def union_all(dfs: list):
+    if is_pandas(dfs[0]):
+        return pd.concat(dfs, ignore_index=True)
+    return reduce(lambda df1, df2: df1.union(df2), dfs)
+
+
+def distinct_values(df, columns: list) -> list:
+    """Distinct combinations of columns as tuples, skipping rows with a missing value"""
+    if is_pandas(df):
+        # object dtype hands back plain Python values, which psycopg2 can adapt
+        subset = df[columns].dropna().drop_duplicates().astype(object)
+        return list(subset.itertuples(index=False, name=None))
+    return [tuple(row) for row in df.select(*columns).dropna().distinct().collect()]
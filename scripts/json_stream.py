@@ -0,0 +1,118 @@
+import codecs
+import json
+from itertools import islice
+
+# Incremental parsing of large API responses. The body is decoded as its
+# chunks arrive and the records of one top-level array are handed out as
+# soon as each is complete, so neither the raw body nor the full list of
+# records is ever held in memory — only the record being parsed.
+
+DECODER = json.JSONDecoder()
+WHITESPACE = " \t\n\r"
+
+
+def batches(items, size: int):
+    """Yield lists of up to size items from any iterable, consuming it lazily"""
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class JsonArrayStream:
+    """
+    Iterates the elements of the array field array_key of a JSON object that
+    arrives as byte (or str) chunks, e.g. requests' iter_content().
+
+    Every other top-level field is decoded whole into header as the parser
+    passes it, so fields preceding the array (a matches response's
+    competition) are available once the first element has been yielded.
+    Raises ValueError when the object has no such array.
+    """
+
+    def __init__(self, chunks, array_key: str):
+        self.chunks = iter(chunks)
+        self.array_key = array_key
+        self.header = {}
+        self.buffer = ""
+        self.pos = 0
+        self.exhausted = False
+        self.utf8 = codecs.getincrementaldecoder("utf-8")()
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer; False once the input is exhausted"""
+        if self.exhausted:
+            return False
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            self.exhausted = True
+            # Raises on a body cut off in the middle of a character
+            self.utf8.decode(b"", final=True)
+            return False
+        text = chunk if isinstance(chunk, str) else self.utf8.decode(chunk)
+        # Keep only the unconsumed tail, so the buffer never grows past one record
+        self.buffer = self.buffer[self.pos:] + text
+        self.pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """Next non-whitespace character, reading more input as needed; '' at the end"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, allowed: str) -> str:
+        char = self._peek()
+        if not char or char not in allowed:
+            raise ValueError(f"Malformed JSON stream: expected one of {allowed!r}, got {char or 'end of input'!r}")
+        self.pos += 1
+        return char
+
+    def _value(self):
+        """Decode the next complete value, reading more input until it parses"""
+        self._peek()
+        while True:
+            try:
+                value, end = DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number reaching the end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def _elements(self):
+        self._expect("[")
+        if self._peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self._value()
+            if self._expect(",]") == "]":
+                return
+
+    def __iter__(self):
+        found = False
+        self._expect("{")
+        if self._peek() != "}":
+            while True:
+                key = self._value()
+                self._expect(":")
+                if key == self.array_key:
+                    found = True
+                    yield from self._elements()
+                else:
+                    self.header[key] = self._value()
+                if self._expect(",}") == "}":
+                    break
+        # Read to the end, so whatever tees the chunks (LandingZone.write_stream) completes
+        if self._peek():
+            raise ValueError("Malformed JSON stream: data after the closing brace")
+        if not found:
+            raise ValueError(f"Response has no '{self.array_key}' array")
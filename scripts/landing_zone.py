@@ -0,0 +1,108 @@
+import glob
+import gzip
+import json
+import logging
+import os
+import uuid
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+PAYLOAD_SUFFIX = '.json.gz'
+
+
+class LandingZone:
+    """
+    Compressed, date-partitioned store of raw API payloads.
+
+    Layout: <root>/dt=YYYY-MM-DD/run=<run_id>/<competition>/<endpoint>.json.gz
+
+    Every extraction run lands its payloads here before transformation, so a
+    run can be replayed from disk without touching the API.
+    """
+
+    def __init__(self, root: str = 'landing'):
+        self.root = root
+
+    @staticmethod
+    def new_run_id() -> str:
+        # Microseconds plus a random suffix keep runs started together (e.g.
+        # by the daemon) apart; ids still sort in start order
+        return f"{datetime.now():%Y%m%d_%H%M%S_%f}_{uuid.uuid4().hex[:4]}"
+
+    def _new_run_dir(self, run_id: str) -> str:
+        partition = f"dt={datetime.now().strftime('%Y-%m-%d')}"
+        return os.path.join(self.root, partition, f"run={run_id}")
+
+    def find_run_dir(self, run_id: str) -> str:
+        matches = glob.glob(os.path.join(self.root, 'dt=*', f"run={run_id}"))
+        if not matches:
+            raise FileNotFoundError(f"No landed run '{run_id}' under {self.root}")
+        return matches[0]
+
+    def _payload_path(self, run_id: str, competition_code: str, endpoint: str) -> str:
+        try:
+            run_dir = self.find_run_dir(run_id)
+        except FileNotFoundError:
+            run_dir = self._new_run_dir(run_id)
+
+        directory = os.path.join(run_dir, competition_code)
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, f"{endpoint}{PAYLOAD_SUFFIX}")
+
+    def write(self, run_id: str, competition_code: str, endpoint: str, payload: dict) -> str:
+        path = self._payload_path(run_id, competition_code, endpoint)
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            json.dump(payload, f)
+        return path
+
+    def write_stream(self, run_id: str, competition_code: str, endpoint: str, chunks):
+        """
+        Pass the raw body chunks of a streamed response through while landing
+        them, so the payload is stored without ever being held whole. The
+        file only appears once the stream has been read to the end.
+        """
+        path = self._payload_path(run_id, competition_code, endpoint)
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+                yield chunk
+        os.replace(tmp_path, path)
+
+    def write_run(self, run_id: str, raw_data: dict) -> None:
+        """Land {competition_code: {endpoint: payload}} as produced by FootballAPIClient.extract_all"""
+        for competition_code, payloads in raw_data.items():
+            for endpoint, payload in payloads.items():
+                self.write(run_id, competition_code, endpoint, payload)
+        logger.info(f"Landed raw payloads for run {run_id} under {self.find_run_dir(run_id)}")
+
+    def read(self, run_id: str, competition_code: str, endpoint: str) -> dict:
+        path = os.path.join(self.find_run_dir(run_id), competition_code, f"{endpoint}{PAYLOAD_SUFFIX}")
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return json.load(f)
+
+    def read_run(self, run_id: str, competitions: list = None) -> dict:
+        """Load a landed run back into the {competition_code: {endpoint: payload}} shape"""
+        run_dir = self.find_run_dir(run_id)
+        if competitions is None:
+            competitions = sorted(
+                name for name in os.listdir(run_dir)
+                if os.path.isdir(os.path.join(run_dir, name))
+            )
+
+        raw_data = {}
+        for competition_code in competitions:
+            directory = os.path.join(run_dir, competition_code)
+            if not os.path.isdir(directory):
+                raise FileNotFoundError(f"Run '{run_id}' has no landed data for {competition_code}")
+            endpoints = [
+                filename[:-len(PAYLOAD_SUFFIX)]
+                for filename in sorted(os.listdir(directory))
+                if filename.endswith(PAYLOAD_SUFFIX)
+            ]
+            raw_data[competition_code] = {
+                endpoint: self.read(run_id, competition_code, endpoint) for endpoint in endpoints
+            }
+        logger.info(f"Replaying run {run_id} for {competitions}")
+        return raw_data
@@ -0,0 +1,189 @@
+import argparse
+import logging
+import os
+import sys
+import threading
+from collections import defaultdict
+
+from aggregates import refresh_aggregates
+from api_client import FootballAPIClient
+from copy_loader import PostgresCopyLoader
+from etl_pipeline import COMPETITIONS, STANDINGS_FROM_MATCHES
+from frames import distinct_values
+from pandas_transformer import PandasDataTransformer
+from standings_engine import SEASON_KEYS, materialize_season_standings
+from validators import validate_raw_response
+
+logger = logging.getLogger(__name__)
+
+# Match-day mode: a long-running loop that polls only the in-play matches of
+# the configured competitions and upserts the few whose score or status
+# changed since the previous poll. Batches are tiny, so they always go
+# through the pandas engine and the COPY loader. Aggregates and standings
+# are only refreshed when a match finishes.
+
+LIVE_STATUSES = ("IN_PLAY", "PAUSED")
+
+
+def match_state(match: dict) -> tuple:
+    """The fields a live update can change: status and every score"""
+    score = match.get('score', {})
+    full_time = score.get('fullTime', {})
+    half_time = score.get('halfTime', {})
+    return (
+        match.get('status'),
+        full_time.get('home'), full_time.get('away'),
+        half_time.get('home'), half_time.get('away'),
+        score.get('winner'), score.get('duration'),
+    )
+
+
+def changed_matches(previous: dict, matches: list) -> list:
+    """Matches whose state differs from previous ({match_id: match_state}); unseen matches count as changed"""
+    return [match for match in matches if previous.get(match['id']) != match_state(match)]
+
+
+def newly_finished(previous: dict, matches: list) -> list:
+    """Matches that reached FINISHED since the previous poll"""
+    return [
+        match for match in matches
+        if match.get('status') == "FINISHED"
+        and (previous.get(match['id']) or (None,))[0] != "FINISHED"
+    ]
+
+
+class LiveMatchPoller:
+    """
+    Polls IN_PLAY/PAUSED matches and applies the changes as micro-batches.
+
+    State is the last seen match_state per tracked match. A match that drops
+    out of the live response is fetched once more on its own, so its final
+    score and FINISHED status are recorded. interval is the polling period
+    while matches are live (ETL_LIVE_POLL_SECONDS, 30), idle_interval when
+    none are (ETL_LIVE_IDLE_SECONDS, 300); neither goes below one request's
+    share of the client's per-minute quota.
+    """
+
+    def __init__(self, client: FootballAPIClient, transformer, loader, competitions: list = None,
+                 interval: float = None, idle_interval: float = None):
+        self.client = client
+        self.transformer = transformer
+        self.loader = loader
+        self.competitions = competitions or COMPETITIONS
+        min_interval = 60.0 / client.requests_per_minute
+        self.interval = max(interval or float(os.getenv('ETL_LIVE_POLL_SECONDS', '30')), min_interval)
+        self.idle_interval = max(idle_interval or float(os.getenv('ETL_LIVE_IDLE_SECONDS', '300')), min_interval)
+        self.state = {}
+        self.stopped = threading.Event()
+
+    def poll(self) -> dict:
+        """One polling cycle; returns {"live", "changed", "finished"} match counts"""
+        live = self.client.get_live_matches(self.competitions, status=",".join(LIVE_STATUSES))["matches"]
+        live_ids = {match['id'] for match in live}
+        dropped = [self.client.get_match(match_id) for match_id in self.state if match_id not in live_ids]
+        matches = live + dropped
+
+        changed = changed_matches(self.state, matches)
+        finished = newly_finished(self.state, matches)
+        if changed:
+            self.apply(changed)
+        if finished:
+            self.refresh_finished(finished)
+
+        self.state = {
+            match['id']: match_state(match) for match in matches
+            if match.get('status') in LIVE_STATUSES
+        }
+        return {"live": len(live), "changed": len(changed), "finished": len(finished)}
+
+    def apply(self, matches: list) -> None:
+        """Upsert changed matches into fact_matches, one micro-batch per competition"""
+        for competition_code, group in self._by_competition(matches).items():
+            raw = {"competition": group[0].get('competition', {}), "matches": group}
+            matches_df = self.transformer.transform_matches(raw)
+            changed_ids = self.loader.load_fact_matches(matches_df, count=len(matches_df))
+            logger.info(f"[{competition_code}] Live update: {len(changed_ids)} match(es) changed")
+
+    def refresh_finished(self, matches: list) -> None:
+        """Refresh what depends on final results for the competitions of finished matches"""
+        for competition_code, group in self._by_competition(matches).items():
+            logger.info(f"[{competition_code}] {len(group)} match(es) finished — refreshing standings")
+            refresh_aggregates(self.loader, [match['id'] for match in group])
+
+            raw = {"competition": group[0].get('competition', {}), "matches": group}
+            for competition_id, season_id in distinct_values(self.transformer.transform_matches(raw), SEASON_KEYS):
+                materialize_season_standings(self.loader, competition_id, season_id)
+
+            if not STANDINGS_FROM_MATCHES:
+                # The cached table predates the result that just came in
+                standings_raw = self.client.get_standings(competition_code, use_cache=False)
+                validate_raw_response(standings_raw, "standings", competition_code)
+                standings_df = self.transformer.transform_standings(standings_raw)
+                # Several kick-off slots finish per matchday; keep one snapshot per day
+                self.loader.load_standings(standings_df, count=len(standings_df), replace_today=True)
+
+    @staticmethod
+    def _by_competition(matches: list) -> dict:
+        groups = defaultdict(list)
+        for match in matches:
+            groups[match.get('competition', {}).get('code')].append(match)
+        return groups
+
+    def run(self, max_polls: int = None) -> None:
+        """Poll until stop() is called (or max_polls cycles); a failed poll is logged and retried"""
+        polls = 0
+        while not self.stopped.is_set() and (max_polls is None or polls < max_polls):
+            try:
+                counts = self.poll()
+                logger.info(f"Live poll: {counts['live']} live, {counts['changed']} changed, "
+                            f"{counts['finished']} finished")
+                delay = self.interval if self.state else self.idle_interval
+            except Exception as e:
+                logger.error(f"Live poll failed: {e}")
+                logger.exception("Full traceback:")
+                delay = self.interval
+            polls += 1
+            if max_polls is None or polls < max_polls:
+                self.stopped.wait(delay)
+
+    def stop(self) -> None:
+        self.stopped.set()
+
+
+def run_live_mode(competitions: list = None, interval: float = None) -> bool:
+    """Follow live matches until interrupted; False if the loop could not start"""
+    loader = None
+    try:
+        client = FootballAPIClient()
+        loader = PostgresCopyLoader()
+        poller = LiveMatchPoller(client, PandasDataTransformer(), loader,
+                                 competitions=competitions, interval=interval)
+        logger.info(f"Live mode for {poller.competitions}: polling every {poller.interval:.0f}s "
+                    f"({poller.idle_interval:.0f}s when nothing is live)")
+        poller.run()
+        return True
+    except KeyboardInterrupt:
+        logger.info("Live mode stopped")
+        return True
+    except Exception as e:
+        logger.error(f"Live mode failed: {e}")
+        logger.exception("Full traceback:")
+        return False
+    finally:
+        if loader:
+            loader.close()
+
+
+def parse_args(argv: list = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Poll in-play matches and apply live score updates")
+    parser.add_argument("--competitions", nargs="+", metavar="CODE",
+                        help=f"Competition codes to follow (default: {' '.join(COMPETITIONS)})")
+    parser.add_argument("--interval", type=float, metavar="SECONDS",
+                        help="Seconds between polls while matches are live (default: ETL_LIVE_POLL_SECONDS or 30)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    success = run_live_mode(args.competitions, interval=args.interval)
+    sys.exit(0 if success else 1)
@@ -0,0 +1,109 @@
+import argparse
+import glob
+import logging
+import os
+import sys
+
+from aggregates import refresh_aggregates
+from copy_loader import PostgresCopyLoader
+from data_loader import PostgresDataLoader
+from standings_engine import materialize_all_standings
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+
+# Applied on top of create_tables.sql, in file-name order, each in its own
+# transaction; applied versions are recorded in schema_migrations
+
+
+def seed_aggregates(loader: PostgresDataLoader) -> None:
+    refresh_aggregates(loader, all_matches=True)
+
+
+# Backfills of derived tables from rows loaded before their migration. Each
+# runs once after the migrations naming it, and again on demand (--seed).
+SEEDS = {
+    "aggregates": seed_aggregates,
+    "standings_history": materialize_all_standings,
+}
+MIGRATION_SEEDS = {
+    "004_aggregate_tables": ["aggregates"],
+    "005_standings_history": ["standings_history"],
+    # Tables computed before 008 counted postponed fixtures by matchday number
+    "008_standings_current_by_date": ["standings_history"],
+}
+
+
+def migration_files(directory: str = MIGRATIONS_DIR) -> list:
+    """[(version, path), ...] sorted by version, e.g. ('001_partition_fact_matches', ...)"""
+    paths = sorted(glob.glob(os.path.join(directory, '*.sql')))
+    return [(os.path.basename(path)[:-len('.sql')], path) for path in paths]
+
+
+def pending_migrations(applied: set, directory: str = MIGRATIONS_DIR) -> list:
+    return [(version, path) for version, path in migration_files(directory) if version not in applied]
+
+
+def seeds_for(versions: list) -> list:
+    """Names of the seeds the given migrations call for, in SEEDS order"""
+    wanted = {name for version in versions for name in MIGRATION_SEEDS.get(version, [])}
+    return [name for name in SEEDS if name in wanted]
+
+
+def run_seeds(loader: PostgresDataLoader, names: list) -> None:
+    for name in names:
+        logger.info(f"Seeding {name} from existing data")
+        SEEDS[name](loader)
+
+
+def apply_migrations(loader: PostgresDataLoader, directory: str = MIGRATIONS_DIR) -> list:
+    """
+    Apply every migration not yet recorded, then the seeds they call for
+    once the schema is complete; returns the versions applied
+    """
+    with loader.connection() as conn:
+        with conn, conn.cursor() as cur:
+            cur.execute(
+                "CREATE TABLE IF NOT EXISTS schema_migrations ("
+                "version VARCHAR(200) PRIMARY KEY, applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+            )
+            cur.execute("SELECT version FROM schema_migrations")
+            applied = {row[0] for row in cur.fetchall()}
+
+        versions = []
+        for version, path in pending_migrations(applied, directory):
+            with open(path, encoding='utf-8') as f:
+                statements = f.read()
+            logger.info(f"Applying migration {version}")
+            with conn, conn.cursor() as cur:
+                cur.execute(statements)
+                cur.execute("INSERT INTO schema_migrations (version) VALUES (%s)", (version,))
+            versions.append(version)
+
+    logger.info(f"Applied {len(versions)} migration(s)" if versions else "Schema is up to date")
+    run_seeds(loader, seeds_for(versions))
+    return versions
+
+
+def parse_args(argv: list = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Apply pending schema migrations")
+    parser.add_argument("--seed", nargs="+", choices=list(SEEDS), default=[], metavar="NAME",
+                        help=f"Also rebuild these derived tables from existing data ({', '.join(SEEDS)})")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args()
+
+    # Seeds write pandas frames, which the copy backend loads without a SparkSession
+    loader = PostgresCopyLoader()
+    try:
+        versions = apply_migrations(loader)
+        run_seeds(loader, [name for name in args.seed if name not in seeds_for(versions)])
+    except Exception as e:
+        logger.error(f"Migration failed: {e}")
+        sys.exit(1)
+    finally:
+        loader.close()
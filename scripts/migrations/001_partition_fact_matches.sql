@@ -0,0 +1,70 @@
+-- Partition fact_matches by competition (LIST), sub-partitioned by season (LIST).
+-- A partitioned table's primary key must contain its partition keys, so the
+-- key becomes (match_id, competition_id, season_id); a match never changes
+-- competition or season, so upserts on it behave as before.
+
+CREATE OR REPLACE FUNCTION ensure_match_partition(p_competition_id INTEGER, p_season_id INTEGER)
+RETURNS VOID AS $$
+DECLARE
+    competition_partition TEXT := format('fact_matches_c%s', p_competition_id);
+    season_partition TEXT := format('fact_matches_c%s_s%s', p_competition_id, p_season_id);
+BEGIN
+    IF to_regclass(competition_partition) IS NULL THEN
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF fact_matches FOR VALUES IN (%s) PARTITION BY LIST (season_id)',
+            competition_partition, p_competition_id
+        );
+    END IF;
+    IF to_regclass(season_partition) IS NULL THEN
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF %I FOR VALUES IN (%s)',
+            season_partition, competition_partition, p_season_id
+        );
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+ALTER TABLE fact_matches RENAME TO fact_matches_unpartitioned;
+
+CREATE TABLE fact_matches (
+    match_id INTEGER NOT NULL,
+    competition_id INTEGER NOT NULL,
+    competition_name VARCHAR(100),
+    season_id INTEGER NOT NULL,
+    matchday INTEGER,
+    stage VARCHAR(50),
+    utc_date VARCHAR(50),
+    match_date DATE,
+    match_timestamp TIMESTAMP,
+    status VARCHAR(20),
+    home_team_id INTEGER,
+    home_team_name VARCHAR(100),
+    away_team_id INTEGER,
+    away_team_name VARCHAR(100),
+    home_score_fulltime INTEGER,
+    away_score_fulltime INTEGER,
+    home_score_halftime INTEGER,
+    away_score_halftime INTEGER,
+    winner VARCHAR(20),
+    duration VARCHAR(20),
+    referees VARCHAR(200),
+    day INTEGER,
+    month INTEGER,
+    year INTEGER,
+    day_of_week INTEGER,
+    loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (match_id, competition_id, season_id)
+) PARTITION BY LIST (competition_id);
+
+SELECT ensure_match_partition(competition_id, season_id)
+FROM (SELECT DISTINCT competition_id, season_id FROM fact_matches_unpartitioned) AS existing;
+
+INSERT INTO fact_matches SELECT * FROM fact_matches_unpartitioned;
+
+DROP TABLE fact_matches_unpartitioned;
+
+-- Team lookups stay B-tree; the time column gets a BRIN index, which is tiny
+-- and effective because matches are loaded roughly in kickoff order
+CREATE INDEX IF NOT EXISTS idx_matches_home_team ON fact_matches(home_team_id);
+CREATE INDEX IF NOT EXISTS idx_matches_away_team ON fact_matches(away_team_id);
+CREATE INDEX IF NOT EXISTS brin_matches_date ON fact_matches USING BRIN (match_date);
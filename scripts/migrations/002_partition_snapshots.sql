@@ -0,0 +1,107 @@
+-- Partition the daily snapshot tables by loaded_at month (RANGE), so the
+-- daily dedup check and dashboard queries on recent snapshots only scan the
+-- current month, and old months can be rolled up and dropped whole.
+-- The surrogate id keeps its sequence; the primary key gains loaded_at
+-- because it must contain the partition key.
+
+CREATE OR REPLACE FUNCTION ensure_snapshot_partition(p_table TEXT, p_month DATE)
+RETURNS VOID AS $$
+DECLARE
+    month_start DATE := date_trunc('month', p_month)::DATE;
+    partition_name TEXT := format('%s_y%sm%s', p_table, to_char(month_start, 'YYYY'), to_char(month_start, 'MM'));
+BEGIN
+    IF to_regclass(partition_name) IS NULL THEN
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+            partition_name, p_table, month_start, (month_start + INTERVAL '1 month')::DATE
+        );
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Standings
+ALTER SEQUENCE standings_snapshot_id_seq OWNED BY NONE;
+ALTER TABLE standings_snapshot RENAME TO standings_snapshot_unpartitioned;
+
+CREATE TABLE standings_snapshot (
+    id INTEGER NOT NULL DEFAULT nextval('standings_snapshot_id_seq'),
+    competition_id INTEGER,
+    competition_name VARCHAR(100),
+    season_id INTEGER,
+    season_start VARCHAR(20),
+    season_end VARCHAR(20),
+    standing_type VARCHAR(20),
+    position INTEGER,
+    team_id INTEGER,
+    team_name VARCHAR(100),
+    played_games INTEGER,
+    won INTEGER,
+    draw INTEGER,
+    lost INTEGER,
+    goals_for INTEGER,
+    goals_against INTEGER,
+    goal_difference INTEGER,
+    points INTEGER,
+    form VARCHAR(20),
+    loaded_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, loaded_at)
+) PARTITION BY RANGE (loaded_at);
+
+ALTER SEQUENCE standings_snapshot_id_seq OWNED BY standings_snapshot.id;
+
+SELECT ensure_snapshot_partition('standings_snapshot', month)
+FROM (
+    SELECT DISTINCT date_trunc('month', loaded_at)::DATE AS month FROM standings_snapshot_unpartitioned
+    WHERE loaded_at IS NOT NULL
+    UNION SELECT date_trunc('month', CURRENT_DATE)::DATE
+) AS months;
+
+INSERT INTO standings_snapshot SELECT * FROM standings_snapshot_unpartitioned;
+DROP TABLE standings_snapshot_unpartitioned;
+
+-- Scorers
+ALTER SEQUENCE dim_scorers_id_seq OWNED BY NONE;
+ALTER TABLE dim_scorers RENAME TO dim_scorers_unpartitioned;
+
+CREATE TABLE dim_scorers (
+    id INTEGER NOT NULL DEFAULT nextval('dim_scorers_id_seq'),
+    competition_id INTEGER,
+    competition_name VARCHAR(100),
+    season_id INTEGER,
+    player_id INTEGER,
+    player_name VARCHAR(100),
+    nationality VARCHAR(50),
+    team_id INTEGER,
+    team_name VARCHAR(100),
+    goals INTEGER,
+    assists INTEGER,
+    penalties INTEGER,
+    played_matches INTEGER,
+    loaded_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, loaded_at)
+) PARTITION BY RANGE (loaded_at);
+
+ALTER SEQUENCE dim_scorers_id_seq OWNED BY dim_scorers.id;
+
+SELECT ensure_snapshot_partition('dim_scorers', month)
+FROM (
+    SELECT DISTINCT date_trunc('month', loaded_at)::DATE AS month FROM dim_scorers_unpartitioned
+    WHERE loaded_at IS NOT NULL
+    UNION SELECT date_trunc('month', CURRENT_DATE)::DATE
+) AS months;
+
+INSERT INTO dim_scorers SELECT * FROM dim_scorers_unpartitioned;
+DROP TABLE dim_scorers_unpartitioned;
+
+-- Indexes, created on the parents so every partition inherits them
+CREATE INDEX IF NOT EXISTS idx_standings_team ON standings_snapshot(team_id);
+CREATE INDEX IF NOT EXISTS idx_scorers_competition ON dim_scorers(competition_id);
+CREATE INDEX IF NOT EXISTS idx_scorers_team ON dim_scorers(team_id);
+
+-- Daily snapshot dedup checks (EXISTS on competition + today's loaded_at range)
+CREATE INDEX IF NOT EXISTS idx_standings_competition_loaded ON standings_snapshot(competition_id, loaded_at);
+CREATE INDEX IF NOT EXISTS idx_scorers_competition_loaded ON dim_scorers(competition_id, loaded_at);
+
+-- Snapshots are append-only in loaded_at order, the ideal case for BRIN
+CREATE INDEX IF NOT EXISTS brin_standings_loaded ON standings_snapshot USING BRIN (loaded_at);
+CREATE INDEX IF NOT EXISTS brin_scorers_loaded ON dim_scorers USING BRIN (loaded_at);
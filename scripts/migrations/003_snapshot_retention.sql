@@ -0,0 +1,100 @@
+-- Retention for the monthly snapshot partitions: months older than the
+-- retention window are rolled up to their last snapshot per team/player
+-- (enough for month-over-month trends), then dropped whole instead of being
+-- DELETEd row by row.
+
+CREATE TABLE IF NOT EXISTS standings_monthly (
+    month DATE NOT NULL,
+    competition_id INTEGER NOT NULL,
+    competition_name VARCHAR(100),
+    season_id INTEGER NOT NULL,
+    standing_type VARCHAR(20) NOT NULL,
+    position INTEGER,
+    team_id INTEGER NOT NULL,
+    team_name VARCHAR(100),
+    played_games INTEGER,
+    won INTEGER,
+    draw INTEGER,
+    lost INTEGER,
+    goals_for INTEGER,
+    goals_against INTEGER,
+    goal_difference INTEGER,
+    points INTEGER,
+    form VARCHAR(20),
+    loaded_at TIMESTAMP,
+    PRIMARY KEY (month, competition_id, season_id, standing_type, team_id)
+);
+
+CREATE TABLE IF NOT EXISTS scorers_monthly (
+    month DATE NOT NULL,
+    competition_id INTEGER NOT NULL,
+    competition_name VARCHAR(100),
+    season_id INTEGER NOT NULL,
+    player_id INTEGER NOT NULL,
+    player_name VARCHAR(100),
+    nationality VARCHAR(50),
+    team_id INTEGER,
+    team_name VARCHAR(100),
+    goals INTEGER,
+    assists INTEGER,
+    penalties INTEGER,
+    played_matches INTEGER,
+    loaded_at TIMESTAMP,
+    PRIMARY KEY (month, competition_id, season_id, player_id)
+);
+
+-- Partitions of p_table, with the month each one covers (from the
+-- <table>_yYYYYmMM names ensure_snapshot_partition gives them)
+CREATE OR REPLACE FUNCTION snapshot_partitions(p_table TEXT)
+RETURNS TABLE (partition_name TEXT, month DATE) AS $$
+    SELECT child.relname::TEXT,
+           to_date(substring(child.relname FROM '_y(\d{4}m\d{2})$'), 'YYYY"m"MM')
+    FROM pg_inherits
+    JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    WHERE parent.relname = p_table
+      AND child.relname ~ '_y\d{4}m\d{2}$'
+    ORDER BY 2;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION rollup_snapshot_partitions(p_table TEXT, p_retain_months INTEGER)
+RETURNS INTEGER AS $$
+DECLARE
+    cutoff DATE := (date_trunc('month', CURRENT_DATE) - make_interval(months => p_retain_months))::DATE;
+    part RECORD;
+    dropped INTEGER := 0;
+BEGIN
+    FOR part IN SELECT * FROM snapshot_partitions(p_table) WHERE month < cutoff LOOP
+        IF p_table = 'standings_snapshot' THEN
+            EXECUTE format(
+                'INSERT INTO standings_monthly '
+                'SELECT DISTINCT ON (competition_id, season_id, standing_type, team_id) '
+                '%L::DATE, competition_id, competition_name, season_id, standing_type, position, team_id, '
+                'team_name, played_games, won, draw, lost, goals_for, goals_against, goal_difference, '
+                'points, form, loaded_at '
+                'FROM %I WHERE competition_id IS NOT NULL AND season_id IS NOT NULL AND team_id IS NOT NULL '
+                'ORDER BY competition_id, season_id, standing_type, team_id, loaded_at DESC '
+                'ON CONFLICT DO NOTHING',
+                part.month, part.partition_name
+            );
+        ELSIF p_table = 'dim_scorers' THEN
+            EXECUTE format(
+                'INSERT INTO scorers_monthly '
+                'SELECT DISTINCT ON (competition_id, season_id, player_id) '
+                '%L::DATE, competition_id, competition_name, season_id, player_id, player_name, '
+                'nationality, team_id, team_name, goals, assists, penalties, played_matches, loaded_at '
+                'FROM %I WHERE competition_id IS NOT NULL AND season_id IS NOT NULL AND player_id IS NOT NULL '
+                'ORDER BY competition_id, season_id, player_id, loaded_at DESC '
+                'ON CONFLICT DO NOTHING',
+                part.month, part.partition_name
+            );
+        ELSE
+            RAISE EXCEPTION 'No roll-up defined for %', p_table;
+        END IF;
+
+        EXECUTE format('DROP TABLE %I', part.partition_name);
+        dropped := dropped + 1;
+    END LOOP;
+    RETURN dropped;
+END;
+$$ LANGUAGE plpgsql;
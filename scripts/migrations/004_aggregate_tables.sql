@@ -0,0 +1,67 @@
+-- Precomputed dashboard aggregates, maintained by aggregates.py for only the
+-- teams, pairs and seasons touched by each run's changed matches.
+
+-- One row per team per finished match, the shape every aggregate reads
+CREATE OR REPLACE VIEW team_match_results AS
+SELECT competition_id, season_id, match_id, match_date, match_timestamp,
+       home_team_id AS team_id, away_team_id AS opponent_id, 'HOME' AS venue,
+       home_score_fulltime AS goals_for, away_score_fulltime AS goals_against
+FROM fact_matches
+WHERE status = 'FINISHED' AND home_score_fulltime IS NOT NULL AND away_score_fulltime IS NOT NULL
+UNION ALL
+SELECT competition_id, season_id, match_id, match_date, match_timestamp,
+       away_team_id, home_team_id, 'AWAY',
+       away_score_fulltime, home_score_fulltime
+FROM fact_matches
+WHERE status = 'FINISHED' AND home_score_fulltime IS NOT NULL AND away_score_fulltime IS NOT NULL;
+
+-- Home/away splits per team and season
+CREATE TABLE IF NOT EXISTS agg_team_home_away (
+    competition_id INTEGER NOT NULL,
+    season_id INTEGER NOT NULL,
+    team_id INTEGER NOT NULL,
+    venue VARCHAR(4) NOT NULL,
+    played INTEGER,
+    won INTEGER,
+    draw INTEGER,
+    lost INTEGER,
+    goals_for INTEGER,
+    goals_against INTEGER,
+    points INTEGER,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (competition_id, season_id, team_id, venue)
+);
+
+-- All-time head-to-head per ordered team pair, across competitions; each
+-- pair is stored from both sides so lookups filter on team_id alone
+CREATE TABLE IF NOT EXISTS agg_head_to_head (
+    team_id INTEGER NOT NULL,
+    opponent_id INTEGER NOT NULL,
+    played INTEGER,
+    won INTEGER,
+    draw INTEGER,
+    lost INTEGER,
+    goals_for INTEGER,
+    goals_against INTEGER,
+    last_match_date DATE,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (team_id, opponent_id)
+);
+
+-- Rolling form over each team's last N finished matches in a season
+CREATE TABLE IF NOT EXISTS agg_team_form (
+    competition_id INTEGER NOT NULL,
+    season_id INTEGER NOT NULL,
+    team_id INTEGER NOT NULL,
+    matches INTEGER,
+    form VARCHAR(20),
+    won INTEGER,
+    draw INTEGER,
+    lost INTEGER,
+    goals_for INTEGER,
+    goals_against INTEGER,
+    points INTEGER,
+    last_match_date DATE,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (competition_id, season_id, team_id)
+);
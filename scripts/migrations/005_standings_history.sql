@@ -0,0 +1,34 @@
+-- League tables per matchday, rebuilt from fact_matches by standings_engine.py
+
+CREATE TABLE IF NOT EXISTS standings_history (
+    competition_id INTEGER NOT NULL,
+    season_id INTEGER NOT NULL,
+    matchday INTEGER NOT NULL,
+    as_of_date DATE,
+    position INTEGER,
+    team_id INTEGER NOT NULL,
+    team_name VARCHAR(100),
+    played_games INTEGER,
+    won INTEGER,
+    draw INTEGER,
+    lost INTEGER,
+    goals_for INTEGER,
+    goals_against INTEGER,
+    goal_difference INTEGER,
+    points INTEGER,
+    form VARCHAR(20),
+    loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (competition_id, season_id, matchday, team_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_standings_history_team ON standings_history(team_id);
+
+-- The latest computed table of each season
+CREATE OR REPLACE VIEW standings_current AS
+SELECT h.*
+FROM standings_history h
+JOIN (
+    SELECT competition_id, season_id, MAX(matchday) AS matchday
+    FROM standings_history
+    GROUP BY competition_id, season_id
+) latest USING (competition_id, season_id, matchday);
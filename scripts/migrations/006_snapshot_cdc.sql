@@ -0,0 +1,72 @@
+-- SCD type-2 history for the standings and scorers snapshots, written by
+-- the loader when ETL_SNAPSHOT_MODE=cdc. A version is valid from valid_from
+-- until valid_to (NULL while current); row_hash covers the non-key values.
+
+CREATE TABLE IF NOT EXISTS standings_scd (
+    competition_id INTEGER NOT NULL,
+    season_id INTEGER NOT NULL,
+    standing_type VARCHAR(20) NOT NULL,
+    team_id INTEGER NOT NULL,
+    competition_name VARCHAR(100),
+    season_start VARCHAR(20),
+    season_end VARCHAR(20),
+    position INTEGER,
+    team_name VARCHAR(100),
+    played_games INTEGER,
+    won INTEGER,
+    draw INTEGER,
+    lost INTEGER,
+    goals_for INTEGER,
+    goals_against INTEGER,
+    goal_difference INTEGER,
+    points INTEGER,
+    form VARCHAR(20),
+    row_hash CHAR(32) NOT NULL,
+    valid_from TIMESTAMP NOT NULL,
+    valid_to TIMESTAMP,
+    PRIMARY KEY (competition_id, season_id, standing_type, team_id, valid_from)
+);
+
+CREATE TABLE IF NOT EXISTS scorers_scd (
+    competition_id INTEGER NOT NULL,
+    season_id INTEGER NOT NULL,
+    player_id INTEGER NOT NULL,
+    competition_name VARCHAR(100),
+    player_name VARCHAR(100),
+    nationality VARCHAR(50),
+    team_id INTEGER,
+    team_name VARCHAR(100),
+    goals INTEGER,
+    assists INTEGER,
+    penalties INTEGER,
+    played_matches INTEGER,
+    row_hash CHAR(32) NOT NULL,
+    valid_from TIMESTAMP NOT NULL,
+    valid_to TIMESTAMP,
+    PRIMARY KEY (competition_id, season_id, player_id, valid_from)
+);
+
+-- At most one current version per key; also serves the merge's lookups
+CREATE UNIQUE INDEX IF NOT EXISTS uq_standings_scd_current
+    ON standings_scd(competition_id, season_id, standing_type, team_id) WHERE valid_to IS NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS uq_scorers_scd_current
+    ON scorers_scd(competition_id, season_id, player_id) WHERE valid_to IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_standings_scd_validity ON standings_scd(valid_from, valid_to);
+CREATE INDEX IF NOT EXISTS idx_scorers_scd_validity ON scorers_scd(valid_from, valid_to);
+
+-- Full snapshots as they stood at the end of each day since the first
+-- version; filter on snapshot_date, e.g. WHERE snapshot_date = '2025-03-01'
+CREATE OR REPLACE VIEW standings_snapshot_as_of AS
+SELECT d.day::DATE AS snapshot_date, h.*
+FROM generate_series((SELECT MIN(valid_from)::DATE FROM standings_scd), CURRENT_DATE, INTERVAL '1 day') AS d(day)
+JOIN standings_scd h
+  ON h.valid_from < d.day + INTERVAL '1 day'
+ AND (h.valid_to IS NULL OR h.valid_to >= d.day + INTERVAL '1 day');
+
+CREATE OR REPLACE VIEW scorers_snapshot_as_of AS
+SELECT d.day::DATE AS snapshot_date, h.*
+FROM generate_series((SELECT MIN(valid_from)::DATE FROM scorers_scd), CURRENT_DATE, INTERVAL '1 day') AS d(day)
+JOIN scorers_scd h
+  ON h.valid_from < d.day + INTERVAL '1 day'
+ AND (h.valid_to IS NULL OR h.valid_to >= d.day + INTERVAL '1 day');
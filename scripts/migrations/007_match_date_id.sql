@@ -0,0 +1,10 @@
+-- fact_matches references the dim_dates calendar through date_id (yyyymmdd),
+-- computed by the transforms; existing rows are backfilled from their date
+-- parts. Added on the partitioned parent, so every partition gets it.
+
+ALTER TABLE fact_matches ADD COLUMN IF NOT EXISTS date_id INTEGER;
+
+UPDATE fact_matches SET date_id = year * 10000 + month * 100 + day
+WHERE date_id IS NULL AND year IS NOT NULL AND month IS NOT NULL AND day IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_matches_date_id ON fact_matches(date_id);
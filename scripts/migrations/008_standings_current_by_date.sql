@@ -0,0 +1,12 @@
+-- Matchday tables are point-in-time since postponed fixtures count on the
+-- date they were played, so the current table is the one with the latest
+-- as_of_date, not the highest matchday number
+
+CREATE OR REPLACE VIEW standings_current AS
+SELECT h.*
+FROM standings_history h
+JOIN (
+    SELECT DISTINCT ON (competition_id, season_id) competition_id, season_id, matchday
+    FROM standings_history
+    ORDER BY competition_id, season_id, as_of_date DESC NULLS LAST, matchday DESC
+) latest USING (competition_id, season_id, matchday);
@@ -0,0 +1,192 @@
+import logging
+
+import pandas as pd
+from pyspark.sql.types import IntegerType
+
+from json_stream import batches
+from schemas import column_names, row_schema
+
+logger = logging.getLogger(__name__)
+
+
+def _frame(rows: list, table: str) -> pd.DataFrame:
+    """
+    Build a DataFrame from row tuples laid out by schemas.row_schema(table).
+
+    IntegerType fields become nullable Int64, so missing ids/scores stay NULL
+    and column types don't drift with the data in a given run.
+    """
+    schema = row_schema(table)
+    df = pd.DataFrame.from_records(rows, columns=schema.names)
+    for field in schema.fields:
+        if isinstance(field.dataType, IntegerType):
+            df[field.name] = df[field.name].astype('Int64')
+    return df
+
+
+class PandasDataTransformer:
+    """
+    Spark-free implementation of the FootballDataTransformer contract.
+
+    Produces pandas DataFrames with the same columns and values as the Spark
+    engine, without starting a JVM. Intended for daily runs of a few hundred
+    rows per league; large backfills should keep using Spark.
+
+    Date parts are derived from utcDate in UTC.
+    """
+
+    spark = None
+
+    def __init__(self):
+        logger.info("Pandas transform engine initialized")
+
+    def transform_teams(self, raw_data: dict) -> pd.DataFrame:
+        rows = [
+            (
+                team['id'],
+                team['name'],
+                team.get('shortName', ''),
+                team.get('tla', ''),
+                team.get('area', {}).get('name', ''),
+                team.get('founded'),
+                team.get('venue', ''),
+                team.get('clubColors', ''),
+                team.get('website', '')
+            )
+            for team in raw_data.get('teams', [])
+        ]
+        df = _frame(rows, 'dim_teams')
+        df['loaded_at'] = pd.Timestamp.now()
+        df = df[column_names('dim_teams')]
+
+        logger.info(f"Transformed {len(df)} team records")
+        return df
+
+    def transform_matches(self, raw_data: dict) -> pd.DataFrame:
+        rows = list(self._match_rows(raw_data.get('matches', []), raw_data.get('competition', {})))
+        df = self._matches_frame(rows)
+
+        logger.info(f"{len(df)} match records")
+        return df
+
+    def transform_match_batches(self, matches, competition: dict, batch_size: int):
+        """
+        Yield fact_matches DataFrames of up to batch_size rows from an
+        iterable of match records (e.g. a json_stream.JsonArrayStream), so
+        only one batch of row tuples is held at a time.
+        """
+        for rows in batches(self._match_rows(matches, competition), batch_size):
+            df = self._matches_frame(rows)
+            logger.info(f"{len(df)} match records in batch")
+            yield df
+
+    @staticmethod
+    def _match_rows(matches, competition: dict):
+        for match in matches:
+            score = match.get('score', {})
+            full_time = score.get('fullTime', {})
+            half_time = score.get('halfTime', {})
+            yield (
+                match['id'],
+                competition.get('id'),
+                competition.get('name', ''),
+                match.get('season', {}).get('id'),
+                match.get('matchday'),
+                match.get('stage', ''),
+                match.get('utcDate'),
+                match.get('status'),
+                match.get('homeTeam', {}).get('id'),
+                match.get('homeTeam', {}).get('name', ''),
+                match.get('awayTeam', {}).get('id'),
+                match.get('awayTeam', {}).get('name', ''),
+                full_time.get('home'),
+                full_time.get('away'),
+                half_time.get('home'),
+                half_time.get('away'),
+                score.get('winner'),
+                score.get('duration', 'REGULAR'),
+                ', '.join([r.get('name', '') for r in match.get('referees', [])])
+            )
+
+    @staticmethod
+    def _matches_frame(rows: list) -> pd.DataFrame:
+        df = _frame(rows, 'fact_matches')
+
+        timestamps = pd.to_datetime(df['utc_date'], utc=True, errors='coerce').dt.tz_localize(None)
+        df['match_date'] = timestamps.dt.date.where(timestamps.notna(), None)
+        df['match_timestamp'] = timestamps
+        df['day'] = timestamps.dt.day.astype('Int64')
+        df['month'] = timestamps.dt.month.astype('Int64')
+        df['year'] = timestamps.dt.year.astype('Int64')
+        # pandas counts Monday=0; match Spark's dayofweek (1=Sunday ... 7=Saturday)
+        df['day_of_week'] = ((timestamps.dt.dayofweek + 1) % 7 + 1).astype('Int64')
+        df['date_id'] = df['year'] * 10000 + df['month'] * 100 + df['day']
+        df['loaded_at'] = pd.Timestamp.now()
+        return df[column_names('fact_matches')]
+
+    def transform_standings(self, raw_data: dict) -> pd.DataFrame:
+        competition = raw_data.get('competition', {})
+        season = raw_data.get('season', {})
+
+        rows = []
+        for standing_type in raw_data.get('standings', []):
+            for team in standing_type.get('table', []):
+                rows.append((
+                    competition.get('id', 0),
+                    competition.get('name', ''),
+                    season.get('id', 0),
+                    season.get('startDate', ''),
+                    season.get('endDate', ''),
+                    standing_type.get('type', 'TOTAL'),
+                    team.get('position', 0),
+                    team.get('team', {}).get('id', 0),
+                    team.get('team', {}).get('name', ''),
+                    team.get('playedGames', 0),
+                    team.get('won', 0),
+                    team.get('draw', 0),
+                    team.get('lost', 0),
+                    team.get('goalsFor', 0),
+                    team.get('goalsAgainst', 0),
+                    team.get('goalDifference', 0),
+                    team.get('points', 0),
+                    team.get('form') or ''
+                ))
+        df = _frame(rows, 'standings_snapshot')
+        df['loaded_at'] = pd.Timestamp.now()
+        df = df[column_names('standings_snapshot')]
+
+        logger.info(f"Transformed {len(df)} standing records")
+        return df
+
+    def stop(self):
+        logger.info("Pandas transform engine stopped")
+
+    def transform_scorers(self, raw_data: dict) -> pd.DataFrame:
+        """Transform top scorers data"""
+        competition = raw_data.get('competition', {})
+        season = raw_data.get('season', {})
+
+        rows = []
+        for scorer in raw_data.get('scorers', []):
+            player = scorer.get('player', {})
+            team = scorer.get('team', {})
+            rows.append((
+                competition.get('id'),
+                competition.get('name', ''),
+                season.get('id'),
+                player.get('id'),
+                player.get('name', ''),
+                player.get('nationality', ''),
+                team.get('id'),
+                team.get('name', ''),
+                scorer.get('goals'),
+                scorer.get('assists'),
+                scorer.get('penalties'),
+                scorer.get('playedMatches')
+            ))
+        df = _frame(rows, 'dim_scorers')
+        df['loaded_at'] = pd.Timestamp.now()
+        df = df[column_names('dim_scorers')]
+
+        logger.info(f"{len(df)} scorer records")
+        return df
@@ -0,0 +1,202 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import date
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pyspark.sql.types import DateType, IntegerType, StringType, TimestampType
+
+from frames import is_pandas
+from schemas import TABLE_SCHEMAS
+
+logger = logging.getLogger(__name__)
+
+# Columnar copy of the warehouse for bulk dashboard refreshes and ad-hoc
+# analysis: every table the loader writes is mirrored as hive-partitioned
+# Parquet under ETL_PARQUET_LAKE_PATH, e.g.
+#   fact_matches/competition_id=2021/season_id=1564/part-<ns>-<id>.parquet
+# Writes merge into the partitions they touch, so each partition stays one
+# compacted file however small the batches (live mode) are.
+
+PARTITION_COLUMNS = {
+    "dim_teams": [],
+    "dim_dates": [],
+    "fact_matches": ["competition_id", "season_id"],
+    "standings_history": ["competition_id", "season_id"],
+    "standings_snapshot": ["competition_id", "season_id", "snapshot_date"],
+    "dim_scorers": ["competition_id", "season_id", "snapshot_date"],
+}
+
+# Row identity within a partition; the latest write of a key wins. Snapshot
+# partitions are per day, so a day keeps its latest snapshot.
+MERGE_KEYS = {
+    "dim_teams": ["team_id"],
+    "dim_dates": ["date_id"],
+    "fact_matches": ["match_id"],
+    "standings_history": ["matchday", "team_id"],
+    "standings_snapshot": ["standing_type", "team_id"],
+    "dim_scorers": ["player_id"],
+}
+
+ARROW_TYPES = {
+    IntegerType: pa.int32(),
+    StringType: pa.string(),
+    DateType: pa.date32(),
+    TimestampType: pa.timestamp("us"),
+}
+
+# Same marker Spark and Hive use for a NULL partition value
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+
+def to_arrow(df, table_name: str) -> pa.Table:
+    """
+    Convert a Spark or pandas DataFrame, casting the columns registered in
+    TABLE_SCHEMAS to their warehouse types so both engines write identical
+    files. Unregistered columns keep their inferred type.
+    """
+    if not is_pandas(df):
+        df = df.toPandas()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    schema = TABLE_SCHEMAS.get(table_name)
+    for field in schema.fields if schema else []:
+        index = table.schema.get_field_index(field.name)
+        if index >= 0:
+            table = table.set_column(index, field.name, table.column(index).cast(ARROW_TYPES[type(field.dataType)]))
+    return table
+
+
+def partition_value(value) -> str:
+    if value is None:
+        return NULL_PARTITION
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return value.isoformat() if isinstance(value, date) else str(value)
+
+
+def latest_per_key(table: pa.Table, key_columns: list) -> pa.Table:
+    """Keep the last row of every key, in original row order"""
+    numbered = table.append_column("__row", pa.array(range(table.num_rows), pa.int64()))
+    latest = numbered.group_by(key_columns).aggregate([("__row", "max")]).column("__row_max")
+    return table.take(sorted(latest.to_pylist()))
+
+
+class ParquetLakeSink:
+    """Mirrors loader writes into a partitioned Parquet lake rooted at path"""
+
+    def __init__(self, path: str, compression: str = None):
+        self.path = path
+        self.compression = compression or os.getenv('ETL_PARQUET_COMPRESSION', 'snappy')
+        # One lock per partition directory: parallel competitions share the
+        # unpartitioned dimensions, and a merge is read-modify-write
+        self.locks = {}
+        self.locks_lock = threading.Lock()
+
+    def _lock(self, directory: str) -> threading.Lock:
+        with self.locks_lock:
+            return self.locks.setdefault(directory, threading.Lock())
+
+    @classmethod
+    def from_env(cls) -> "ParquetLakeSink":
+        """The sink configured by ETL_PARQUET_LAKE_PATH, or None when the lake is disabled"""
+        path = os.getenv('ETL_PARQUET_LAKE_PATH')
+        return cls(path) if path else None
+
+    def write(self, df, table_name: str) -> int:
+        """Merge df into the lake copy of table_name; returns the number of partitions rewritten"""
+        table = to_arrow(df, table_name)
+        if table.num_rows == 0:
+            return 0
+        partition_columns = PARTITION_COLUMNS[table_name]
+        if "snapshot_date" in partition_columns:
+            table = table.append_column("snapshot_date", self._snapshot_dates(table))
+
+        start = time.perf_counter()
+        table_dir = os.path.join(self.path, table_name)
+        partitions = self._split(table, partition_columns)
+        for partition, batch in partitions.items():
+            self._merge_partition(os.path.join(table_dir, partition), batch, MERGE_KEYS[table_name])
+        logger.info(f"Lake: merged {table.num_rows} rows into {len(partitions)} partition(s) of {table_name} "
+                    f"in {time.perf_counter() - start:.2f}s")
+        return len(partitions)
+
+    @staticmethod
+    def _snapshot_dates(table: pa.Table) -> pa.Array:
+        """Snapshot day of each row: the date of loaded_at, today where it is missing"""
+        today = date.today()
+        if "loaded_at" not in table.column_names:
+            return pa.array([today] * table.num_rows, pa.date32())
+        loaded = table.column("loaded_at").to_pylist()
+        return pa.array([value.date() if value else today for value in loaded], pa.date32())
+
+    @staticmethod
+    def _split(table: pa.Table, partition_columns: list) -> dict:
+        """{relative partition directory: its rows, without the partition columns}"""
+        if not partition_columns:
+            return {"": table}
+        rows_by_partition = {}
+        values = zip(*(table.column(c).to_pylist() for c in partition_columns))
+        for row, partition in enumerate(values):
+            rows_by_partition.setdefault(partition, []).append(row)
+        data = table.drop_columns(partition_columns)
+        return {
+            os.path.join(*(f"{c}={partition_value(v)}" for c, v in zip(partition_columns, partition))):
+                data.take(rows)
+            for partition, rows in rows_by_partition.items()
+        }
+
+    def _merge_partition(self, directory: str, batch: pa.Table, key_columns: list) -> None:
+        """
+        Rewrite a partition as one file holding its existing rows plus batch.
+
+        Files written under an older schema are promoted to the union of all
+        columns, so columns added (or dropped) upstream read back as NULL
+        instead of failing; widening type changes are promoted too. The new
+        file is renamed into place before the old ones are removed, so a
+        crash in between leaves duplicates that the next write compacts away.
+        """
+        with self._lock(directory):
+            os.makedirs(directory, exist_ok=True)
+            existing = sorted(data_files(directory))
+            merged = pa.concat_tables([pq.read_table(f) for f in existing] + [batch], promote_options="permissive")
+            merged = latest_per_key(merged, key_columns)
+
+            name = f"part-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.parquet"
+            temp_path = os.path.join(directory, f".{name}.tmp")
+            pq.write_table(merged, temp_path, compression=self.compression)
+            os.replace(temp_path, os.path.join(directory, name))
+            for path in existing:
+                # Already gone if another process sharing the lake compacted it
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def read_table(self, table_name: str) -> pa.Table:
+        """The lake copy of table_name, partition columns included, under the union of its file schemas"""
+        table_dir = os.path.join(self.path, table_name)
+        files = data_files(table_dir, recursive=True)
+        if not files:
+            return pa.table({})
+        # Discovery takes the first file's schema; widen it to every file's
+        discovered = ds.dataset(table_dir, format="parquet", partitioning="hive")
+        schema = pa.unify_schemas([discovered.schema] + [pq.read_schema(f) for f in files],
+                                  promote_options="permissive")
+        return ds.dataset(table_dir, schema=schema, format="parquet", partitioning="hive").to_table()
+
+
+def data_files(directory: str, recursive: bool = False) -> list:
+    """Parquet files under directory, skipping in-flight temporary files"""
+    if not os.path.isdir(directory):
+        return []
+    if not recursive:
+        return [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".parquet")]
+    return [
+        os.path.join(root, name)
+        for root, _, names in os.walk(directory)
+        for name in names if name.endswith(".parquet")
+    ]
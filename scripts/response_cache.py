@@ -0,0 +1,108 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Seconds a cached response is served without contacting the API.
+# Teams barely change within a season; standings move with every result.
+DEFAULT_TTLS = {
+    "competitions": 24 * 3600,
+    "teams": 3 * 24 * 3600,
+    "matches": 10 * 60,
+    "standings": 5 * 60,
+    "scorers": 30 * 60,
+    "default": 0,
+}
+
+
+def parse_ttls(spec: str) -> dict:
+    """Parse 'teams=259200,standings=300' into {'teams': 259200, 'standings': 300}"""
+    ttls = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        kind, _, seconds = item.partition('=')
+        ttls[kind.strip()] = int(seconds)
+    return ttls
+
+
+class ResponseCache:
+    """
+    On-disk cache of API responses keyed by endpoint and query string.
+
+    Each entry keeps the payload together with its ETag / Last-Modified
+    validators so that stale entries can be revalidated with a conditional
+    request instead of being downloaded again.
+    """
+
+    def __init__(self, cache_dir: str, ttls: dict = None):
+        self.cache_dir = cache_dir
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def cache_key(endpoint: str) -> str:
+        """Normalise the query string so parameter order doesn't split the cache"""
+        parts = urlsplit(endpoint)
+        query = urlencode(sorted(parse_qsl(parts.query)))
+        return f"{parts.path}?{query}" if query else parts.path
+
+    @staticmethod
+    def endpoint_kind(endpoint: str) -> str:
+        """'competitions/PL/standings?season=2023' -> 'standings'"""
+        path = urlsplit(endpoint).path.rstrip('/')
+        return path.rsplit('/', 1)[-1] if '/' in path else path
+
+    def ttl_for(self, endpoint: str) -> int:
+        return self.ttls.get(self.endpoint_kind(endpoint), self.ttls["default"])
+
+    def _path(self, endpoint: str) -> str:
+        digest = hashlib.sha256(self.cache_key(endpoint).encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def get(self, endpoint: str) -> dict:
+        """Return the cached entry for an endpoint, or None"""
+        try:
+            with open(self._path(endpoint), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache entry for {endpoint}: {e}")
+            return None
+
+    def is_fresh(self, entry: dict, endpoint: str) -> bool:
+        return time.time() - entry["fetched_at"] < self.ttl_for(endpoint)
+
+    @staticmethod
+    def conditional_headers(entry: dict) -> dict:
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(self, endpoint: str, payload: dict, etag: str = None, last_modified: str = None) -> None:
+        self._write(endpoint, {
+            "endpoint": self.cache_key(endpoint),
+            "fetched_at": time.time(),
+            "etag": etag,
+            "last_modified": last_modified,
+            "payload": payload,
+        })
+
+    def touch(self, endpoint: str, entry: dict) -> None:
+        """Restart the TTL of an entry the API confirmed unchanged (HTTP 304)"""
+        self._write(endpoint, {**entry, "fetched_at": time.time()})
+
+    def _write(self, endpoint: str, entry: dict) -> None:
+        # Write-then-rename so concurrent readers never see a partial file
+        path = self._path(endpoint)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
@@ -0,0 +1,192 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+RUN_LABEL = "all"
+
+
+def endpoint_labels(endpoint: str) -> tuple:
+    """'competitions/PL/matches?dateFrom=...' -> ('PL', 'matches')"""
+    parts = endpoint.split('?', 1)[0].strip('/').split('/')
+    if len(parts) >= 3 and parts[0] == 'competitions':
+        return parts[1], parts[2]
+    if len(parts) == 2 and parts[0] == 'competitions':
+        return parts[1], 'competition'
+    return RUN_LABEL, parts[0]
+
+
+def _prometheus_labels(**labels) -> str:
+    body = ','.join(f'{key}="{value}"' for key, value in labels.items())
+    return f"{{{body}}}" if body else ''
+
+
+class RunMetrics:
+    """
+    Thread-safe collector of per-run performance metrics.
+
+    Records stage wall time, API latency and payload size, rows in/out per
+    table, Spark job counts and load throughput. Measurements taken inside
+    a stage() block are attributed to that block's competition, which keeps
+    attribution correct when competitions run on parallel threads.
+    """
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self.started_at = time.time()
+        self.success = None
+        self.lock = threading.Lock()
+        self._local = threading.local()
+
+        self.stages = defaultdict(float)
+        self.api_calls = defaultdict(lambda: {"requests": 0, "cached": 0, "seconds": 0.0, "bytes": 0})
+        self.rows = defaultdict(dict)
+        self.loads = defaultdict(lambda: {"rows": 0, "seconds": 0.0})
+        self.spark_jobs = {}
+
+    @property
+    def current_competition(self) -> str:
+        return getattr(self._local, 'competition', RUN_LABEL)
+
+    @contextmanager
+    def competition(self, competition_code: str):
+        """Attribute measurements on this thread to a competition"""
+        previous = self.current_competition
+        self._local.competition = competition_code
+        try:
+            yield
+        finally:
+            self._local.competition = previous
+
+    @contextmanager
+    def stage(self, stage: str, competition_code: str = None):
+        """Time a block; repeated blocks for the same stage and competition add up"""
+        competition_code = competition_code or self.current_competition
+        start = time.perf_counter()
+        try:
+            with self.competition(competition_code):
+                yield
+        finally:
+            seconds = time.perf_counter() - start
+            with self.lock:
+                self.stages[(competition_code, stage)] += seconds
+            logger.info(f"[{competition_code}] {stage} took {seconds:.2f}s")
+
+    def record_api_call(self, endpoint: str, seconds: float, payload_bytes: int, cached: bool = False) -> None:
+        key = endpoint_labels(endpoint)
+        with self.lock:
+            entry = self.api_calls[key]
+            entry["requests"] += 1
+            entry["cached"] += int(cached)
+            entry["seconds"] += seconds
+            entry["bytes"] += payload_bytes
+
+    def record_rows(self, table: str, rows_in: int = None, rows_out: int = None) -> None:
+        key = (self.current_competition, table)
+        with self.lock:
+            if rows_in is not None:
+                self.rows[key]["rows_in"] = rows_in
+            if rows_out is not None:
+                self.rows[key]["rows_out"] = rows_out
+
+    def record_load(self, table: str, rows: int, seconds: float) -> None:
+        key = (self.current_competition, table)
+        with self.lock:
+            self.loads[key]["rows"] += rows
+            self.loads[key]["seconds"] += seconds
+
+    def record_spark_jobs(self, competition_code: str, jobs: int) -> None:
+        with self.lock:
+            self.spark_jobs[competition_code] = jobs
+
+    def report(self) -> dict:
+        with self.lock:
+            return {
+                "run_id": self.run_id,
+                "started_at": datetime.fromtimestamp(self.started_at).isoformat(),
+                "duration_seconds": round(time.time() - self.started_at, 3),
+                "success": self.success,
+                "stages": [
+                    {"competition": competition, "stage": stage, "seconds": round(seconds, 3)}
+                    for (competition, stage), seconds in self.stages.items()
+                ],
+                "api": [
+                    {"competition": competition, "endpoint": endpoint, **values}
+                    for (competition, endpoint), values in sorted(self.api_calls.items())
+                ],
+                "tables": [
+                    {"competition": competition, "table": table, **values}
+                    for (competition, table), values in sorted(self.rows.items())
+                ],
+                "loads": [
+                    {
+                        "competition": competition, "table": table, **values,
+                        "rows_per_second": values["rows"] / values["seconds"] if values["seconds"] else None,
+                    }
+                    for (competition, table), values in sorted(self.loads.items())
+                ],
+                "spark_jobs": dict(self.spark_jobs),
+            }
+
+    def prometheus_lines(self) -> list:
+        report = self.report()
+        lines = []
+
+        def metric(name: str, help_text: str, samples: list) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in samples:
+                lines.append(f"{name}{_prometheus_labels(**labels)} {value}")
+
+        metric("etl_run_duration_seconds", "Wall time of the last ETL run",
+               [({}, report["duration_seconds"])])
+        metric("etl_run_success", "1 if the last ETL run succeeded",
+               [({}, int(bool(report["success"])))])
+        metric("etl_run_timestamp_seconds", "Start time of the last ETL run",
+               [({}, int(self.started_at))])
+        metric("etl_stage_duration_seconds", "Wall time per pipeline stage and competition",
+               [({"competition": s["competition"], "stage": s["stage"]}, s["seconds"])
+                for s in report["stages"]])
+        metric("etl_api_request_seconds", "Summed API latency per endpoint",
+               [({"competition": a["competition"], "endpoint": a["endpoint"]}, round(a["seconds"], 3))
+                for a in report["api"]])
+        metric("etl_api_requests", "API requests per endpoint, including cache hits",
+               [({"competition": a["competition"], "endpoint": a["endpoint"]}, a["requests"])
+                for a in report["api"]])
+        metric("etl_api_payload_bytes", "Downloaded payload bytes per endpoint",
+               [({"competition": a["competition"], "endpoint": a["endpoint"]}, a["bytes"])
+                for a in report["api"]])
+        metric("etl_table_rows", "Rows in (raw records) and out (transformed rows) per table",
+               [({"competition": t["competition"], "table": t["table"], "direction": direction[5:]}, t[direction])
+                for t in report["tables"] for direction in ("rows_in", "rows_out") if direction in t])
+        metric("etl_load_rows_per_second", "Load throughput per table",
+               [({"competition": l["competition"], "table": l["table"]}, round(l["rows_per_second"], 1))
+                for l in report["loads"] if l["rows_per_second"] is not None])
+        metric("etl_spark_jobs", "Spark jobs launched per competition",
+               [({"competition": competition}, jobs) for competition, jobs in report["spark_jobs"].items()])
+        return lines
+
+    def write_json(self, path: str) -> None:
+        self._atomic_write(path, json.dumps(self.report(), indent=2))
+        logger.info(f"Run report written to {path}")
+
+    def write_prometheus(self, path: str) -> None:
+        # Textfile collectors may read at any moment, so always replace atomically
+        self._atomic_write(path, "\n".join(self.prometheus_lines()) + "\n")
+        logger.info(f"Prometheus metrics written to {path}")
+
+    @staticmethod
+    def _atomic_write(path: str, content: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
@@ -0,0 +1,77 @@
+import glob
+import logging
+import os
+from datetime import datetime
+
+from state_store import JsonStateStore
+
+logger = logging.getLogger(__name__)
+
+RUNNING = "running"
+FAILED = "failed"
+COMPLETE = "complete"
+
+# Units a competition must finish before its part of a run is done; "extract"
+# is recorded too, with a pointer to the landed payloads
+LOAD_UNITS = ("dim_teams", "fact_matches", "aggregates", "standings_history", "standings_snapshot",
+              "dim_scorers", "dim_dates")
+
+
+class RunStateStore:
+    """
+    Per-run record of completed (competition, stage) units.
+
+    One JSON document per run under <state_dir>/runs/. A rerun of a failed
+    run reads it to skip what already completed: extraction is replaced by
+    the landed payloads it points at, and finished loads are not repeated.
+    """
+
+    def __init__(self, state_dir: str, run_id: str):
+        self.run_id = run_id
+        self.store = JsonStateStore(os.path.join(state_dir, 'runs', f"{run_id}.json"))
+
+    @staticmethod
+    def _unit_key(competition_code: str, stage: str) -> str:
+        return f"unit:{competition_code}:{stage}"
+
+    @staticmethod
+    def latest_unfinished(state_dir: str) -> str:
+        """Most recent run that did not complete, or None"""
+        paths = sorted(glob.glob(os.path.join(state_dir, 'runs', '*.json')), reverse=True)
+        for path in paths:
+            if JsonStateStore(path).get("status") != COMPLETE:
+                return os.path.basename(path)[:-len('.json')]
+        return None
+
+    def start(self, **options) -> None:
+        """Record a new run and the options a resume must reuse"""
+        self.store.set("started_at", datetime.now().isoformat())
+        self.store.set("options", options)
+        self.store.set("status", RUNNING)
+
+    def exists(self) -> bool:
+        return self.store.get("started_at") is not None
+
+    @property
+    def started_at(self) -> datetime:
+        return datetime.fromisoformat(self.store.get("started_at"))
+
+    @property
+    def options(self) -> dict:
+        return self.store.get("options", {})
+
+    def set_status(self, status: str) -> None:
+        self.store.set("status", status)
+
+    def mark_done(self, competition_code: str, stage: str, **details) -> None:
+        self.store.set(self._unit_key(competition_code, stage),
+                       {"completed_at": datetime.now().isoformat(), **details})
+
+    def is_done(self, competition_code: str, stage: str) -> bool:
+        return self.store.get(self._unit_key(competition_code, stage)) is not None
+
+    def unit(self, competition_code: str, stage: str) -> dict:
+        return self.store.get(self._unit_key(competition_code, stage))
+
+    def competition_done(self, competition_code: str) -> bool:
+        return all(self.is_done(competition_code, stage) for stage in LOAD_UNITS)
@@ -0,0 +1,168 @@
+from pyspark.sql.types import (
+    StructType, StructField, StringType, IntegerType,
+    TimestampType, DateType
+)
+
+# Output schemas, one per warehouse table, in create_tables.sql column order.
+# Serial surrogate keys (standings_snapshot.id, dim_scorers.id) are assigned
+# by Postgres and therefore not part of the DataFrame.
+
+DIM_TEAMS_SCHEMA = StructType([
+    StructField('team_id', IntegerType()),
+    StructField('team_name', StringType()),
+    StructField('short_name', StringType()),
+    StructField('tla', StringType()),
+    StructField('country', StringType()),
+    StructField('founded', IntegerType()),
+    StructField('stadium', StringType()),
+    StructField('club_colors', StringType()),
+    StructField('website', StringType()),
+    StructField('loaded_at', TimestampType()),
+])
+
+DIM_DATES_SCHEMA = StructType([
+    StructField('date_id', IntegerType()),
+    StructField('full_date', DateType()),
+    StructField('day', IntegerType()),
+    StructField('month', IntegerType()),
+    StructField('year', IntegerType()),
+    StructField('day_of_week', IntegerType()),
+    StructField('matchday', IntegerType()),
+])
+
+FACT_MATCHES_SCHEMA = StructType([
+    StructField('match_id', IntegerType()),
+    StructField('competition_id', IntegerType()),
+    StructField('competition_name', StringType()),
+    StructField('season_id', IntegerType()),
+    StructField('matchday', IntegerType()),
+    StructField('stage', StringType()),
+    StructField('utc_date', StringType()),
+    StructField('match_date', DateType()),
+    StructField('match_timestamp', TimestampType()),
+    StructField('status', StringType()),
+    StructField('home_team_id', IntegerType()),
+    StructField('home_team_name', StringType()),
+    StructField('away_team_id', IntegerType()),
+    StructField('away_team_name', StringType()),
+    StructField('home_score_fulltime', IntegerType()),
+    StructField('away_score_fulltime', IntegerType()),
+    StructField('home_score_halftime', IntegerType()),
+    StructField('away_score_halftime', IntegerType()),
+    StructField('winner', StringType()),
+    StructField('duration', StringType()),
+    StructField('referees', StringType()),
+    StructField('day', IntegerType()),
+    StructField('month', IntegerType()),
+    StructField('year', IntegerType()),
+    StructField('day_of_week', IntegerType()),
+    StructField('date_id', IntegerType()),
+    StructField('loaded_at', TimestampType()),
+])
+
+STANDINGS_SNAPSHOT_SCHEMA = StructType([
+    StructField('competition_id', IntegerType()),
+    StructField('competition_name', StringType()),
+    StructField('season_id', IntegerType()),
+    StructField('season_start', StringType()),
+    StructField('season_end', StringType()),
+    StructField('standing_type', StringType()),
+    StructField('position', IntegerType()),
+    StructField('team_id', IntegerType()),
+    StructField('team_name', StringType()),
+    StructField('played_games', IntegerType()),
+    StructField('won', IntegerType()),
+    StructField('draw', IntegerType()),
+    StructField('lost', IntegerType()),
+    StructField('goals_for', IntegerType()),
+    StructField('goals_against', IntegerType()),
+    StructField('goal_difference', IntegerType()),
+    StructField('points', IntegerType()),
+    StructField('form', StringType()),
+    StructField('loaded_at', TimestampType()),
+])
+
+DIM_SCORERS_SCHEMA = StructType([
+    StructField('competition_id', IntegerType()),
+    StructField('competition_name', StringType()),
+    StructField('season_id', IntegerType()),
+    StructField('player_id', IntegerType()),
+    StructField('player_name', StringType()),
+    StructField('nationality', StringType()),
+    StructField('team_id', IntegerType()),
+    StructField('team_name', StringType()),
+    StructField('goals', IntegerType()),
+    StructField('assists', IntegerType()),
+    StructField('penalties', IntegerType()),
+    StructField('played_matches', IntegerType()),
+    StructField('loaded_at', TimestampType()),
+])
+
+# Computed by standings_engine from fact_matches rather than by a transform
+STANDINGS_HISTORY_SCHEMA = StructType([
+    StructField('competition_id', IntegerType()),
+    StructField('season_id', IntegerType()),
+    StructField('matchday', IntegerType()),
+    StructField('as_of_date', DateType()),
+    StructField('position', IntegerType()),
+    StructField('team_id', IntegerType()),
+    StructField('team_name', StringType()),
+    StructField('played_games', IntegerType()),
+    StructField('won', IntegerType()),
+    StructField('draw', IntegerType()),
+    StructField('lost', IntegerType()),
+    StructField('goals_for', IntegerType()),
+    StructField('goals_against', IntegerType()),
+    StructField('goal_difference', IntegerType()),
+    StructField('points', IntegerType()),
+    StructField('form', StringType()),
+    StructField('loaded_at', TimestampType()),
+])
+
+TABLE_SCHEMAS = {
+    'dim_teams': DIM_TEAMS_SCHEMA,
+    'dim_dates': DIM_DATES_SCHEMA,
+    'fact_matches': FACT_MATCHES_SCHEMA,
+    'standings_snapshot': STANDINGS_SNAPSHOT_SCHEMA,
+    'dim_scorers': DIM_SCORERS_SCHEMA,
+    'standings_history': STANDINGS_HISTORY_SCHEMA,
+}
+
+# Columns that must never be NULL in a transform output; checked in the
+# single validation pass before loading
+KEY_COLUMNS = {
+    'dim_teams': ['team_id'],
+    'dim_dates': ['date_id'],
+    'fact_matches': ['match_id', 'competition_id', 'season_id'],
+    'standings_snapshot': ['competition_id', 'team_id'],
+    'dim_scorers': ['competition_id', 'player_id'],
+    'standings_history': ['competition_id', 'season_id', 'matchday', 'team_id'],
+}
+
+# Columns computed by the engine after the raw rows are built, rather than
+# emitted by the transform's row tuples
+DERIVED_COLUMNS = {
+    'dim_teams': {'loaded_at'},
+    'dim_dates': {'date_id'},
+    'fact_matches': {'match_date', 'match_timestamp', 'day', 'month', 'year', 'day_of_week', 'date_id',
+                     'loaded_at'},
+    'standings_snapshot': {'loaded_at'},
+    'dim_scorers': {'loaded_at'},
+    'standings_history': {'loaded_at'},
+}
+
+# Built once at import so transforms never re-derive them per call
+ROW_SCHEMAS = {
+    table: StructType([field for field in schema.fields if field.name not in DERIVED_COLUMNS[table]])
+    for table, schema in TABLE_SCHEMAS.items()
+}
+
+
+def column_names(table: str) -> list:
+    """Output column order for a table"""
+    return TABLE_SCHEMAS[table].names
+
+
+def row_schema(table: str) -> StructType:
+    """Schema of the tuples a transform emits for a table, in emission order"""
+    return ROW_SCHEMAS[table]
@@ -0,0 +1,201 @@
+import logging
+
+import numpy as np
+import pandas as pd
+import psycopg2.errors
+
+from schemas import column_names
+
+logger = logging.getLogger(__name__)
+
+# League tables rebuilt from fact_matches: one row per team per matchday,
+# computed for a whole season at once with grouped cumulative sums rather
+# than a loop over matchdays. Tables are point-in-time: a matchday's table
+# stands at the date the matchday was played (as_of_date) and counts every
+# finished match played by then, whatever its scheduled matchday, so a
+# postponed fixture joins the first table dated on or after its kickoff.
+
+FORM_LENGTH = 5
+# A matchday was played on the last kickoff date within this many days of its
+# most common date; a fixture rescheduled further away doesn't move it
+MATCHDAY_SPAN_DAYS = 3
+SEASON_KEYS = ["competition_id", "season_id"]
+COUNT_COLUMNS = ["played_games", "won", "draw", "lost", "goals_for", "goals_against", "points"]
+
+# Ranking order within a matchday. Overall criteria only: head-to-head rules
+# differ per league and are not applied.
+TIEBREAKERS = [("points", False), ("goal_difference", False), ("goals_for", False),
+               ("won", False), ("team_name", True)]
+
+
+def team_results(matches: pd.DataFrame) -> pd.DataFrame:
+    """One row per team per finished league match, with the result from that team's side"""
+    finished = matches[
+        (matches["status"] == "FINISHED")
+        & matches["matchday"].notna()
+        & matches["match_date"].notna()
+        & matches["home_score_fulltime"].notna()
+        & matches["away_score_fulltime"].notna()
+    ]
+    shared = finished[SEASON_KEYS + ["match_id", "matchday", "match_date", "match_timestamp"]]
+    home = shared.assign(
+        team_id=finished["home_team_id"], team_name=finished["home_team_name"],
+        goals_for=finished["home_score_fulltime"], goals_against=finished["away_score_fulltime"],
+    )
+    away = shared.assign(
+        team_id=finished["away_team_id"], team_name=finished["away_team_name"],
+        goals_for=finished["away_score_fulltime"], goals_against=finished["home_score_fulltime"],
+    )
+    results = pd.concat([home, away], ignore_index=True)
+    for column in SEASON_KEYS + ["match_id", "matchday", "team_id", "goals_for", "goals_against"]:
+        results[column] = results[column].astype("int64")
+
+    difference = results["goals_for"] - results["goals_against"]
+    results["played_games"] = 1
+    results["won"] = (difference > 0).astype("int64")
+    results["draw"] = (difference == 0).astype("int64")
+    results["lost"] = (difference < 0).astype("int64")
+    results["points"] = 3 * results["won"] + results["draw"]
+    results["result"] = np.select([difference > 0, difference == 0], ["W", "D"], "L")
+    return results
+
+
+def _form(results: pd.DataFrame, form_length: int) -> pd.DataFrame:
+    """Form string (most recent first) per team at the end of each matchday it played"""
+    ordered = results.sort_values(SEASON_KEYS + ["team_id", "match_timestamp", "match_id"])
+    # Grouped cumsum has no string kernel; a plain Series.cumsum concatenates
+    history = ordered.groupby(SEASON_KEYS + ["team_id"])["result"].transform(lambda results: results.cumsum())
+    at_matchday = (
+        ordered.assign(history=history)
+        .groupby(SEASON_KEYS + ["team_id", "matchday"], as_index=False)["history"].last()
+    )
+    at_matchday["form"] = at_matchday["history"].map(lambda h: ",".join(reversed(h[-form_length:])))
+    return at_matchday.drop(columns="history")
+
+
+def matchday_dates(results: pd.DataFrame) -> pd.DataFrame:
+    """The date each matchday was played (as_of_date), per season, from its fixtures' kickoff dates"""
+    fixtures = results.drop_duplicates(SEASON_KEYS + ["match_id"])
+    fixtures = fixtures.assign(match_date=pd.to_datetime(fixtures["match_date"]))
+
+    def played_on(days: pd.Series):
+        common = days.mode().min()
+        return days[(days - common).abs() <= pd.Timedelta(days=MATCHDAY_SPAN_DAYS)].max()
+
+    return (
+        fixtures.groupby(SEASON_KEYS + ["matchday"])["match_date"].agg(played_on)
+        .rename("as_of_date").reset_index()
+    )
+
+
+def assign_tables(results: pd.DataFrame, matchdays: pd.DataFrame) -> tuple:
+    """
+    Move every result to the matchday whose table first counts it: the
+    earliest as_of_date on or after the day it was played. Results played
+    after the season's latest matchday date go to that matchday, whose
+    as_of_date then moves to the latest of them. Returns (results, matchdays).
+    """
+    results = results.assign(match_date=pd.to_datetime(results["match_date"]))
+    # One target per date; later matchdays sharing it count the same results.
+    # merge_asof needs the dates sorted across the whole frame, by= keeps seasons apart
+    targets = (
+        matchdays.sort_values(["as_of_date", "matchday"])
+        .drop_duplicates(SEASON_KEYS + ["as_of_date"])
+        .rename(columns={"matchday": "table_matchday"})
+    )
+    assigned = pd.merge_asof(
+        results.drop(columns="matchday").sort_values("match_date"), targets,
+        left_on="match_date", right_on="as_of_date", by=SEASON_KEYS, direction="forward",
+    ).drop(columns="as_of_date")
+
+    latest = targets.groupby(SEASON_KEYS, as_index=False).last()[SEASON_KEYS + ["table_matchday"]]
+    assigned = assigned.merge(latest, how="left", on=SEASON_KEYS, suffixes=("", "_latest"))
+    assigned["matchday"] = assigned["table_matchday"].fillna(assigned["table_matchday_latest"]).astype("int64")
+    assigned = assigned.drop(columns=["table_matchday", "table_matchday_latest"])
+
+    last_played = assigned.groupby(SEASON_KEYS + ["matchday"], as_index=False)["match_date"].max()
+    matchdays = matchdays.merge(last_played, how="left", on=SEASON_KEYS + ["matchday"])
+    matchdays["as_of_date"] = matchdays[["as_of_date", "match_date"]].max(axis=1)
+    return assigned, matchdays.drop(columns="match_date")
+
+
+def standings_by_matchday(matches: pd.DataFrame, form_length: int = FORM_LENGTH) -> pd.DataFrame:
+    """
+    Standings after every matchday of every season in matches (fact_matches
+    columns), laid out as the standings_history table.
+    """
+    results = team_results(matches)
+    if results.empty:
+        return pd.DataFrame(columns=column_names("standings_history"))
+    results, matchdays = assign_tables(results, matchday_dates(results))
+
+    per_matchday = results.groupby(SEASON_KEYS + ["team_id", "matchday"], as_index=False)[COUNT_COLUMNS].sum()
+
+    # Every team appears on every matchday of its season, played or not;
+    # totals accumulate in date order, which matchday numbers need not follow
+    teams = results[SEASON_KEYS + ["team_id"]].drop_duplicates()
+    table = (
+        teams.merge(matchdays, on=SEASON_KEYS)
+        .merge(per_matchday, how="left", on=SEASON_KEYS + ["team_id", "matchday"])
+        .sort_values(SEASON_KEYS + ["team_id", "as_of_date", "matchday"], ignore_index=True)
+    )
+    table[COUNT_COLUMNS] = table[COUNT_COLUMNS].fillna(0).astype("int64")
+    table[COUNT_COLUMNS] = table.groupby(SEASON_KEYS + ["team_id"])[COUNT_COLUMNS].cumsum()
+    table["goal_difference"] = table["goals_for"] - table["goals_against"]
+    table["as_of_date"] = table["as_of_date"].dt.date
+
+    table = table.merge(_form(results, form_length), how="left", on=SEASON_KEYS + ["team_id", "matchday"])
+    table["form"] = table.groupby(SEASON_KEYS + ["team_id"])["form"].ffill().fillna("")
+
+    latest_names = (
+        results.sort_values("match_timestamp").groupby(SEASON_KEYS + ["team_id"], as_index=False)["team_name"].last()
+    )
+    table = table.merge(latest_names, on=SEASON_KEYS + ["team_id"])
+
+    table = table.sort_values(
+        SEASON_KEYS + ["matchday"] + [column for column, _ in TIEBREAKERS],
+        ascending=[True] * (len(SEASON_KEYS) + 1) + [ascending for _, ascending in TIEBREAKERS],
+        ignore_index=True,
+    )
+    table["position"] = table.groupby(SEASON_KEYS + ["matchday"]).cumcount() + 1
+    table["loaded_at"] = pd.Timestamp.now()
+    return table[column_names("standings_history")]
+
+
+def standings_as_of(matches: pd.DataFrame, as_of, form_length: int = FORM_LENGTH) -> pd.DataFrame:
+    """The table per season counting every match finished on or before the date as_of"""
+    played = matches[pd.to_datetime(matches["match_date"]) <= pd.Timestamp(as_of)]
+    table = standings_by_matchday(played, form_length)
+    if table.empty:
+        return table
+    latest = (
+        table.sort_values(SEASON_KEYS + ["as_of_date", "matchday"])
+        .groupby(SEASON_KEYS, as_index=False).last()[SEASON_KEYS + ["matchday"]]
+    )
+    return table.merge(latest, on=SEASON_KEYS + ["matchday"]).reset_index(drop=True)[table.columns]
+
+
+def materialize_season_standings(loader, competition_id: int, season_id: int) -> int:
+    """Rebuild standings_history for one season from the warehouse; returns the rows written"""
+    matches = loader.read_season_matches(competition_id, season_id)
+    table = standings_by_matchday(matches)
+    if table.empty:
+        logger.info(f"No finished matches for competition {competition_id} season {season_id} — no standings")
+        return 0
+    try:
+        loader.upsert_dataframe(table, "standings_history", count=len(table))
+    except psycopg2.errors.UndefinedTable:
+        logger.warning("standings_history doesn't exist yet — run migrate.py")
+        return 0
+    logger.info(f"Materialized {table['matchday'].nunique()} matchday table(s) for "
+                f"competition {competition_id} season {season_id}")
+    return len(table)
+
+
+def materialize_all_standings(loader) -> int:
+    """Rebuild standings_history for every season in fact_matches; returns the rows written"""
+    seasons = loader.loaded_seasons()
+    written = sum(materialize_season_standings(loader, competition_id, season_id)
+                  for competition_id, season_id in seasons)
+    logger.info(f"Materialized standings history for {len(seasons)} season(s)")
+    return written
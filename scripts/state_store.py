@@ -0,0 +1,55 @@
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class JsonStateStore:
+    """
+    Small key/value document persisted as a JSON file.
+
+    Used for pipeline bookkeeping that has to survive between runs (sync
+    high-water marks, checkpoints). Writes go to a temp file and are renamed
+    into place, so an interrupted run never leaves a truncated state file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self._data = self._read()
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _flush(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def get(self, key: str, default=None):
+        with self.lock:
+            return self._data.get(key, default)
+
+    def set(self, key: str, value) -> None:
+        with self.lock:
+            self._data[key] = value
+            self._flush()
+
+    def delete(self, key: str) -> None:
+        with self.lock:
+            if self._data.pop(key, None) is not None:
+                self._flush()
+
+    def all(self) -> dict:
+        with self.lock:
+            return dict(self._data)
@@ -1,15 +1,20 @@
 import logging
 from pyspark.sql import DataFrame
+from pyspark.sql import functions as F
+
+from frames import is_pandas
 
 logger = logging.getLogger(__name__)
 
 
-def validate_raw_response(raw_data: dict, list_key: str, label: str) -> None:
+def validate_raw_response(raw_data: dict, list_key: str, label: str, allow_empty: bool = False) -> None:
     """
     Checkpoint after extraction.
 
     Checks that the API response contains the expected top-level list key
-    and that the list is non-empty.
+    and that the list is non-empty. allow_empty accepts an empty list, for
+    filtered requests (e.g. an incremental match window) where no records is
+    a valid answer.
 
     Raises ValueError on failure so the pipeline aborts the competition run.
     """
@@ -20,31 +25,65 @@ def validate_raw_response(raw_data: dict, list_key: str, label: str) -> None:
         raise ValueError(f"[{label}] API response missing required key '{list_key}'")
 
     records = raw_data[list_key]
+    if not records and allow_empty:
+        logger.info(f"[{label}] Extract checkpoint passed — no records in '{list_key}' for this request")
+        return
     if not records:
         raise ValueError(f"[{label}] API returned an empty list for '{list_key}'")
 
     logger.info(f"[{label}] Extract checkpoint passed — {len(records)} records in '{list_key}'")
 
 
-def validate_dataframe(df: DataFrame, id_column: str, label: str) -> None:
+def compute_metrics(df: DataFrame, key_columns: list) -> dict:
+    """
+    Row count and per-column null counts in a single aggregation pass.
+
+    Returns {"row_count": int, "null_counts": {column: int}}. Accepts Spark
+    or pandas DataFrames.
+    """
+    if is_pandas(df):
+        return {
+            "row_count": len(df),
+            "null_counts": {column: int(df[column].isna().sum()) for column in key_columns},
+        }
+
+    result = df.agg(
+        F.count(F.lit(1)).alias("row_count"),
+        *[F.sum(F.when(F.col(column).isNull(), 1).otherwise(0)).alias(column) for column in key_columns]
+    ).first()
+    return {
+        "row_count": result["row_count"],
+        "null_counts": {column: result[column] or 0 for column in key_columns},
+    }
+
+
+def validate_dataframe(df: DataFrame, id_column: str, label: str, key_columns: list = None) -> dict:
     """
     Checkpoint after transformation.
 
     Checks that:
     - The DataFrame has at least one row
-    - The id_column has no null values (would break deduplication / joins)
+    - The id_column (and any other key_columns) has no null values
+      (would break deduplication / joins)
 
+    Count and null checks share one aggregation pass. Returns the metrics
+    from compute_metrics so callers can reuse the row count for logging
+    and load decisions instead of counting again.
     Raises ValueError on failure so the pipeline aborts the competition run.
     """
-    count = df.count()
+    key_columns = [id_column] + [c for c in (key_columns or []) if c != id_column]
+    metrics = compute_metrics(df, key_columns)
+
+    count = metrics["row_count"]
     if count == 0:
         raise ValueError(f"[{label}] Transform produced an empty DataFrame")
 
-    null_count = df.filter(df[id_column].isNull()).count()
-    if null_count > 0:
-        raise ValueError(
-            f"[{label}] Found {null_count} null value(s) in id column '{id_column}' — "
-            "this would corrupt deduplication logic"
-        )
+    for column, nulls in metrics["null_counts"].items():
+        if nulls > 0:
+            raise ValueError(
+                f"[{label}] Found {nulls} null value(s) in key column '{column}' — "
+                "this would corrupt deduplication logic"
+            )
 
-    logger.info(f"[{label}] Transform checkpoint passed — {count} rows, no nulls in '{id_column}'")
+    logger.info(f"[{label}] Transform checkpoint passed — {count} rows, no nulls in {key_columns}")
+    return metrics
@@ -1,5 +1,12 @@
+import os
+import sys
+
 import pytest
 from pyspark.sql import SparkSession
+
+# Pipeline modules import each other by bare name, as they do when run from scripts/
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, 'scripts'))
+
 from scripts.data_transformer import FootballDataTransformer
 
 
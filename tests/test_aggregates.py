@@ -0,0 +1,77 @@
+from contextlib import contextmanager
+
+from scripts.aggregates import AGGREGATE_TABLES, refresh_aggregates, refresh_statements
+
+
+class RecordingLoader:
+    def __init__(self):
+        self.connections = 0
+
+    def connection(self):
+        self.connections += 1
+        raise AssertionError("no statements expected")
+
+
+def test_refresh_takes_the_lock_before_reading_changed_keys():
+    statements = refresh_statements()
+    assert "pg_advisory_xact_lock" in statements[0]
+    assert "match_id = ANY(%(match_ids)s)" in statements[1]
+
+def test_each_aggregate_is_deleted_then_recomputed_for_changed_keys_only():
+    statements = refresh_statements()
+    for table in AGGREGATE_TABLES:
+        delete = next(i for i, s in enumerate(statements) if f"DELETE FROM {table} " in s)
+        insert = next(i for i, s in enumerate(statements) if f"INSERT INTO {table} " in s)
+        assert delete < insert
+        assert "USING changed_" in statements[delete]
+        assert "JOIN changed_" in statements[insert]
+
+def test_form_window_is_parameterised():
+    form_insert = next(s for s in refresh_statements() if "INSERT INTO agg_team_form" in s)
+    assert "recency <= %(form_matches)s" in form_insert
+
+def test_nothing_to_refresh_without_changed_matches():
+    loader = RecordingLoader()
+    refresh_aggregates(loader, [])
+    assert loader.connections == 0
+
+
+class StatementCursor:
+    def __init__(self, executed):
+        self.executed = executed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, statement, params=None):
+        self.executed.append((statement, params))
+
+    def fetchone(self):
+        return (3,)
+
+
+class StatementConnection(StatementCursor):
+    def cursor(self):
+        return StatementCursor(self.executed)
+
+
+class StatementLoader:
+    def __init__(self):
+        self.executed = []
+
+    @contextmanager
+    def connection(self):
+        yield StatementConnection(self.executed)
+
+
+def test_full_refresh_covers_every_match_without_ids():
+    loader = StatementLoader()
+    refresh_aggregates(loader, all_matches=True)
+    changed_matches = loader.executed[1]
+    assert "%(all_matches)s OR match_id = ANY(%(match_ids)s)" in changed_matches[0]
+    assert changed_matches[1]["all_matches"] is True
+    assert changed_matches[1]["match_ids"] == []
+
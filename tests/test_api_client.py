@@ -0,0 +1,223 @@
+import time
+
+import pytest
+import requests
+
+from scripts import api_client
+from scripts.api_client import FootballAPIClient, TokenBucket
+from scripts.response_cache import ResponseCache, parse_ttls
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, payload=None, headers=None):
+        self.status_code = status_code
+        self._payload = payload or {}
+        self.headers = headers or {}
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error")
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    monkeypatch.setenv("FOOTBALL_API_KEY", "test-key")
+    monkeypatch.setenv("FOOTBALL_API_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("FOOTBALL_API_REQUESTS_PER_MINUTE", "600")
+    monkeypatch.setattr(api_client.time, "sleep", lambda seconds: None)
+    return FootballAPIClient()
+
+
+
+# TokenBucket
+
+def test_token_bucket_allows_burst_up_to_capacity():
+    bucket = TokenBucket(rate=5, per=60.0)
+    start = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    assert time.monotonic() - start < 0.5
+
+def test_token_bucket_blocks_when_empty():
+    bucket = TokenBucket(rate=2, per=0.2)
+    bucket.acquire()
+    bucket.acquire()
+    start = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.05
+
+
+
+# _make_request
+
+def test_make_request_retries_after_429(client, monkeypatch):
+    responses = [
+        FakeResponse(429, headers={"Retry-After": "3"}),
+        FakeResponse(200, {"teams": [{"id": 1}]}),
+    ]
+    monkeypatch.setattr(client.session, "get", lambda *args, **kwargs: responses.pop(0))
+    assert client._make_request("competitions/PL/teams") == {"teams": [{"id": 1}]}
+    assert responses == []
+
+def test_make_request_gives_up_after_max_retries(client, monkeypatch):
+    calls = []
+
+    def fake_get(*args, **kwargs):
+        calls.append(args)
+        return FakeResponse(429)
+
+    monkeypatch.setattr(client.session, "get", fake_get)
+    with pytest.raises(requests.exceptions.HTTPError):
+        client._make_request("competitions/PL/teams")
+    assert len(calls) == client.max_retries + 1
+
+def test_retry_delay_prefers_retry_after_header(client):
+    assert client._retry_delay(FakeResponse(429, headers={"Retry-After": "12"}), attempt=0) == 12.0
+
+def test_retry_delay_falls_back_to_exponential_backoff(client):
+    assert client._retry_delay(FakeResponse(429), attempt=2) == client.backoff_seconds * 4
+
+
+
+# Response cache
+
+def test_fresh_cache_entry_skips_the_network(client, monkeypatch):
+    client.cache.put("competitions/PL/teams", {"teams": [{"id": 57}]})
+    monkeypatch.setattr(client.session, "get", lambda *args, **kwargs: pytest.fail("network hit"))
+    assert client._make_request("competitions/PL/teams") == {"teams": [{"id": 57}]}
+
+def test_stale_cache_entry_is_revalidated_and_304_served_from_disk(client, monkeypatch):
+    client.cache.ttls["standings"] = 0
+    client.cache.put("competitions/PL/standings", {"standings": [1]}, etag='"abc"',
+                     last_modified="Sat, 01 Jun 2024 10:00:00 GMT")
+    sent_headers = {}
+
+    def fake_get(url, headers=None, timeout=None):
+        sent_headers.update(headers)
+        return FakeResponse(304)
+
+    monkeypatch.setattr(client.session, "get", fake_get)
+    assert client._make_request("competitions/PL/standings") == {"standings": [1]}
+    assert sent_headers == {"If-None-Match": '"abc"', "If-Modified-Since": "Sat, 01 Jun 2024 10:00:00 GMT"}
+
+def test_successful_response_is_written_to_cache(client, monkeypatch):
+    monkeypatch.setattr(client.session, "get",
+                        lambda *args, **kwargs: FakeResponse(200, {"scorers": []}, {"ETag": '"v1"'}))
+    client._make_request("competitions/PL/scorers")
+    entry = client.cache.get("competitions/PL/scorers")
+    assert entry["payload"] == {"scorers": []}
+    assert entry["etag"] == '"v1"'
+
+def test_live_matches_bypass_the_cache(client, monkeypatch):
+    endpoint = "matches?competitions=PL,BL1&status=IN_PLAY,PAUSED"
+    client.cache.put(endpoint, {"matches": ["stale"]})
+    requested = []
+
+    def fake_get(url, headers=None, timeout=None):
+        requested.append(url)
+        return FakeResponse(200, {"matches": []})
+
+    monkeypatch.setattr(client.session, "get", fake_get)
+    assert client.get_live_matches(["PL", "BL1"]) == {"matches": []}
+    assert requested == [f"{client.BASE_URL}/{endpoint}"]
+    assert client.cache.get(endpoint)["payload"] == {"matches": ["stale"]}
+
+def test_standings_can_bypass_the_cache(client, monkeypatch):
+    endpoint = "competitions/PL/standings"
+    client.cache.put(endpoint, {"standings": ["stale"]})
+    requested = []
+
+    def fake_get(url, headers=None, timeout=None):
+        requested.append(url)
+        return FakeResponse(200, {"standings": []})
+
+    monkeypatch.setattr(client.session, "get", fake_get)
+    assert client.get_standings("PL")["standings"] == ["stale"]
+    assert client.get_standings("PL", use_cache=False) == {"standings": []}
+    assert requested == [f"{client.BASE_URL}/{endpoint}"]
+    assert client.cache.get(endpoint)["payload"] == {"standings": ["stale"]}
+
+def test_cache_key_ignores_query_parameter_order():
+    assert ResponseCache.cache_key("matches?b=2&a=1") == ResponseCache.cache_key("matches?a=1&b=2")
+
+def test_ttl_is_chosen_by_endpoint_kind(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttls=parse_ttls("teams=100, standings=5"))
+    assert cache.ttl_for("competitions/PL/teams") == 100
+    assert cache.ttl_for("competitions/PL/standings?season=2023") == 5
+    assert cache.ttl_for("teams/57/unknown") == 0
+
+
+
+# get_matches
+
+def test_get_matches_builds_window_query(client, monkeypatch):
+    requested = []
+    monkeypatch.setattr(client, "_make_request", lambda endpoint, use_cache=True: requested.append(endpoint) or {})
+    client.get_matches("PL", date_from="2024-05-01", date_to="2024-05-10")
+    assert requested == ["competitions/PL/matches?dateFrom=2024-05-01&dateTo=2024-05-10"]
+
+def test_get_matches_without_filters_requests_full_season(client, monkeypatch):
+    requested = []
+    monkeypatch.setattr(client, "_make_request", lambda endpoint, use_cache=True: requested.append(endpoint) or {})
+    client.get_matches("PL")
+    assert requested == ["competitions/PL/matches"]
+
+def test_get_teams_for_a_season(client, monkeypatch):
+    requested = []
+    monkeypatch.setattr(client, "_make_request", lambda endpoint, use_cache=True: requested.append(endpoint) or {})
+    client.get_teams("PL", season=2019)
+    client.get_teams("PL")
+    assert requested == ["competitions/PL/teams?season=2019", "competitions/PL/teams"]
+
+
+
+# extract_all
+
+def test_extract_all_returns_every_endpoint_per_competition(client, monkeypatch):
+    monkeypatch.setattr(client, "_make_request", lambda endpoint, use_cache=True: {"endpoint": endpoint})
+    results = client.extract_all(["PL", "BL1"], max_workers=4)
+    assert set(results) == {"PL", "BL1"}
+    assert set(results["PL"]) == {"teams", "matches", "standings", "scorers"}
+    assert results["BL1"]["standings"] == {"endpoint": "competitions/BL1/standings"}
+
+def test_extract_all_passes_per_competition_params(client, monkeypatch):
+    monkeypatch.setattr(client, "_make_request", lambda endpoint, use_cache=True: {"endpoint": endpoint})
+    params = {"PL": {"matches": {"date_from": "2024-05-01", "date_to": "2024-05-10"}}}
+    results = client.extract_all(["PL", "PD"], endpoints=["matches"], params=params)
+    assert results["PL"]["matches"]["endpoint"].endswith("?dateFrom=2024-05-01&dateTo=2024-05-10")
+    assert results["PD"]["matches"]["endpoint"] == "competitions/PD/matches"
+
+def test_extract_all_accepts_endpoints_per_competition(client, monkeypatch):
+    monkeypatch.setattr(client, "_make_request", lambda endpoint, use_cache=True: {"endpoint": endpoint})
+    results = client.extract_all(["PL", "PD"], endpoints={"PL": ["matches"], "PD": ["teams", "matches"]})
+    assert set(results["PL"]) == {"matches"}
+    assert set(results["PD"]) == {"teams", "matches"}
+
+def test_stream_matches_yields_the_body_in_chunks_without_caching(client, monkeypatch):
+    class StreamedResponse(FakeResponse):
+        body = b'{"matches": [{"id": 1}]}'
+
+        def iter_content(self, chunk_size):
+            return (self.body[i:i + chunk_size] for i in range(0, len(self.body), chunk_size))
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    requested = []
+
+    def fake_get(url, headers=None, timeout=None, stream=False):
+        requested.append((url, stream))
+        return StreamedResponse()
+
+    monkeypatch.setattr(client.session, "get", fake_get)
+    chunks = list(client.stream_matches("PL", season=2023, chunk_size=10))
+    assert b"".join(chunks) == StreamedResponse.body
+    assert max(len(chunk) for chunk in chunks) == 10
+    assert requested == [(f"{client.BASE_URL}/competitions/PL/matches?season=2023", True)]
+    assert client.cache.get("competitions/PL/matches?season=2023") is None
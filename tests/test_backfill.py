@@ -0,0 +1,62 @@
+import json
+from datetime import date
+
+import pytest
+
+from scripts import backfill
+from scripts.backfill import checkpoint_key, parse_seasons, pending_units
+from scripts.json_stream import JsonArrayStream
+from scripts.landing_zone import LandingZone
+from scripts.pandas_transformer import PandasDataTransformer
+from scripts.run_metrics import RunMetrics
+from scripts.state_store import JsonStateStore
+
+
+@pytest.fixture
+def checkpoint(tmp_path):
+    return JsonStateStore(str(tmp_path / "backfill.json"))
+
+
+def test_parse_seasons_expands_ranges():
+    assert parse_seasons(["2019-2021", "2023", "2020"]) == [2019, 2020, 2021, 2023]
+
+def test_pending_units_skip_checkpointed_seasons(checkpoint):
+    checkpoint.set(checkpoint_key("PL", 2020), {"completed_at": "2024-06-01T12:00:00"})
+    assert pending_units(checkpoint, ["PL", "BL1"], [2020, 2021]) == [
+        ("PL", 2021), ("BL1", 2020), ("BL1", 2021)
+    ]
+
+def test_checkpoints_survive_a_restart(checkpoint, tmp_path):
+    checkpoint.set(checkpoint_key("PL", 2020), {"completed_at": "2024-06-01T12:00:00"})
+    reopened = JsonStateStore(str(tmp_path / "backfill.json"))
+    assert pending_units(reopened, ["PL"], [2020]) == []
+
+def test_streamed_matches_are_loaded_in_batches(monkeypatch, tmp_path, raw_teams, raw_matches):
+    class FakeLoader:
+        def __init__(self):
+            self.match_batches = []
+
+        def load_dim_teams(self, df, count=None):
+            return df["team_id"].tolist()
+
+        def load_fact_matches(self, df, count=None):
+            self.match_batches.append(df["match_id"].tolist())
+            return df["match_id"].tolist()
+
+    calendar_ranges = []
+    monkeypatch.setattr(backfill, "ensure_calendar", lambda loader, match_range: calendar_ranges.append(match_range))
+    monkeypatch.setattr(backfill, "refresh_aggregates", lambda loader, ids: None)
+    monkeypatch.setattr(backfill, "materialize_season_standings", lambda *args: None)
+
+    landing = LandingZone(str(tmp_path))
+    body = json.dumps(raw_matches).encode()
+    chunks = landing.write_stream("run1", "PL_2023", "matches", (body[i:i + 50] for i in range(0, len(body), 50)))
+    loader = FakeLoader()
+    counts = backfill.backfill_season("PL", 2023, raw_teams, JsonArrayStream(chunks, "matches"),
+                                      PandasDataTransformer(), loader, RunMetrics("test"), batch_size=1)
+
+    assert counts == {"teams": 2, "matches": 2}
+    assert loader.match_batches == [[417406], [417407]]
+    assert calendar_ranges == [(date(2023, 8, 11), date(2023, 8, 12))]
+    # The streamed body was landed as it was read
+    assert landing.read("run1", "PL_2023", "matches") == raw_matches
@@ -0,0 +1,39 @@
+from datetime import datetime
+
+import pytest
+
+from scripts.cron_schedule import CronSchedule, parse_field
+
+
+def test_parse_field_steps_ranges_and_lists():
+    assert parse_field("*/15", 0, 59) == {0, 15, 30, 45}
+    assert parse_field("1-5", 0, 7) == {1, 2, 3, 4, 5}
+    assert parse_field("0,30", 0, 59) == {0, 30}
+    assert parse_field("10/20", 0, 59) == {10, 30, 50}
+
+@pytest.mark.parametrize("spec", ["60", "5-1", "*/0", "x"])
+def test_parse_field_rejects_invalid_specs(spec):
+    with pytest.raises(ValueError):
+        parse_field(spec, 0, 59)
+
+def test_expression_needs_five_fields():
+    with pytest.raises(ValueError):
+        CronSchedule("*/5 * * *")
+
+def test_matches_minute_and_hour():
+    schedule = CronSchedule("0 6 * * *")
+    assert schedule.matches(datetime(2024, 8, 31, 6, 0))
+    assert not schedule.matches(datetime(2024, 8, 31, 6, 1))
+    assert not schedule.matches(datetime(2024, 8, 31, 7, 0))
+
+def test_weekday_counts_sunday_as_zero_or_seven():
+    # 2024-09-01 is a Sunday
+    assert CronSchedule("*/10 * * * 0").matches(datetime(2024, 9, 1, 15, 20))
+    assert CronSchedule("*/10 * * * 6-7").matches(datetime(2024, 9, 1, 15, 20))
+    assert not CronSchedule("*/10 * * * 1-5").matches(datetime(2024, 9, 1, 15, 20))
+
+def test_restricted_day_fields_match_either():
+    schedule = CronSchedule("0 0 1 * 1")
+    assert schedule.matches(datetime(2024, 10, 1, 0, 0))   # 1st, a Tuesday
+    assert schedule.matches(datetime(2024, 10, 7, 0, 0))   # a Monday
+    assert not schedule.matches(datetime(2024, 10, 8, 0, 0))
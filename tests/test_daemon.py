@@ -0,0 +1,105 @@
+import threading
+from datetime import datetime
+
+import pytest
+
+from scripts import daemon as daemon_module
+from scripts.daemon import PipelineDaemon, ScheduledJob, create_app
+
+
+class FakeClient:
+    pass
+
+
+class FakeTransformer:
+    spark = None
+
+    def stop(self):
+        pass
+
+
+class FakeLoader:
+    def __init__(self, spark=None):
+        pass
+
+    def close(self):
+        pass
+
+
+class BlockingPipeline:
+    """Stands in for run_etl_pipeline; each run waits until released"""
+
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+
+    def __call__(self, competitions, incremental=False, endpoints=None, **components):
+        self.calls.append((competitions, incremental, endpoints))
+        self.release.wait(5)
+        return True
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    pipeline = BlockingPipeline()
+    monkeypatch.setattr(daemon_module, "FootballAPIClient", FakeClient)
+    monkeypatch.setattr(daemon_module, "PandasDataTransformer", FakeTransformer)
+    monkeypatch.setitem(daemon_module.LOADER_BACKENDS, "copy", FakeLoader)
+    monkeypatch.setattr(daemon_module, "run_etl_pipeline", pipeline)
+    return pipeline
+
+
+@pytest.fixture
+def daemon(pipeline):
+    jobs = [ScheduledJob("incremental", "*/30 * * * *", ["PL"], incremental=True),
+            ScheduledJob("full", "0 6 * * *", ["PL", "PD"], endpoints=["standings"])]
+    daemon = PipelineDaemon(jobs, engine="pandas")
+    yield daemon
+    pipeline.release.set()
+    daemon.shutdown()
+
+
+def test_job_rejects_unknown_endpoints():
+    with pytest.raises(ValueError):
+        ScheduledJob("bad", "0 6 * * *", endpoints=["standings", "fixtures"])
+
+def test_due_jobs_follow_their_schedules(daemon):
+    assert {job.name for job in daemon.due_jobs(datetime(2024, 8, 31, 6, 0))} == {"incremental", "full"}
+    assert [job.name for job in daemon.due_jobs(datetime(2024, 8, 31, 6, 30))] == ["incremental"]
+    assert daemon.due_jobs(datetime(2024, 8, 31, 6, 1)) == []
+
+def test_submitted_run_is_pending_until_it_finishes(daemon, pipeline):
+    run = daemon.submit("full", ["PL"], False, ["standings"])
+    assert run["finished_at"] is None
+    assert daemon.pending("full")
+    assert not daemon.pending("incremental")
+
+    pipeline.release.set()
+    daemon.executor.shutdown(wait=True)
+    assert not daemon.pending("full")
+    assert pipeline.calls == [(["PL"], False, ["standings"])]
+    assert daemon.recent_runs()[0]["success"] is True
+
+def test_scheduler_skips_a_job_whose_last_run_is_pending(daemon, pipeline):
+    daemon.submit("incremental", ["PL"], True)
+    daemon.queue_due(datetime(2024, 8, 31, 6, 0))
+
+    pipeline.release.set()
+    daemon.executor.shutdown(wait=True)
+    assert [run["job"] for run in daemon.recent_runs()] == ["full", "incremental"]
+    assert pipeline.calls == [(["PL"], True, None), (["PL", "PD"], False, ["standings"])]
+
+def test_trigger_runs_a_scheduled_job(daemon):
+    response = create_app(daemon).test_client().post("/trigger", json={"job": "full"})
+    assert response.status_code == 202
+    assert response.get_json()["endpoints"] == ["standings"]
+
+def test_trigger_rejects_an_unknown_job(daemon):
+    response = create_app(daemon).test_client().post("/trigger", json={"job": "weekly"})
+    assert response.status_code == 404
+    assert daemon.recent_runs() == []
+
+def test_trigger_rejects_unknown_endpoints(daemon):
+    response = create_app(daemon).test_client().post("/trigger", json={"endpoints": ["fixtures"]})
+    assert response.status_code == 400
+    assert daemon.recent_runs() == []
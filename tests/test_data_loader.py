@@ -0,0 +1,204 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pandas as pd
+import psycopg2.errors
+import pytest
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from psycopg2.pool import ThreadedConnectionPool
+
+from scripts import copy_loader
+from scripts.copy_loader import CsvRowStream, PostgresCopyLoader
+from scripts.data_loader import CDC_KEYS, UPSERT_KEYS, build_cdc_sql, build_replace_today_sql, build_upsert_sql
+
+
+MATCH_COLUMNS = ["match_id", "status", "home_score_fulltime", "loaded_at"]
+
+
+# build_upsert_sql
+
+def test_upsert_inserts_from_staging_with_conflict_on_key():
+    sql = build_upsert_sql("fact_matches", "stg_fact_matches_1", MATCH_COLUMNS, ["match_id"])
+    assert sql.startswith("INSERT INTO fact_matches (match_id, status, home_score_fulltime, loaded_at) ")
+    assert "FROM stg_fact_matches_1" in sql
+    assert "ON CONFLICT (match_id) DO UPDATE" in sql
+
+def test_upsert_updates_only_non_key_columns():
+    sql = build_upsert_sql("fact_matches", "stg", MATCH_COLUMNS, ["match_id"])
+    assert "status = EXCLUDED.status" in sql
+    assert "home_score_fulltime = EXCLUDED.home_score_fulltime" in sql
+    assert "match_id = EXCLUDED.match_id" not in sql
+
+def test_upsert_skips_rows_whose_values_are_unchanged():
+    sql = build_upsert_sql("fact_matches", "stg", MATCH_COLUMNS, ["match_id"])
+    # loaded_at is refreshed on change but must not itself count as a change
+    assert ("WHERE (fact_matches.status, fact_matches.home_score_fulltime) "
+            "IS DISTINCT FROM (EXCLUDED.status, EXCLUDED.home_score_fulltime)") in sql
+
+def test_upsert_deduplicates_keys_within_the_batch():
+    sql = build_upsert_sql("dim_teams", "stg", ["team_id", "team_name"], ["team_id"])
+    assert "SELECT DISTINCT ON (team_id)" in sql
+
+def test_upsert_returns_changed_keys():
+    sql = build_upsert_sql("dim_teams", "stg", ["team_id", "team_name"], ["team_id"])
+    assert sql.endswith("RETURNING team_id")
+
+def test_insert_only_mode_does_nothing_on_conflict():
+    sql = build_upsert_sql("dim_dates", "stg", ["date_id", "full_date"], ["date_id"], update=False)
+    assert "ON CONFLICT (date_id) DO NOTHING" in sql
+    assert "DO UPDATE" not in sql
+
+def test_partitioned_fact_matches_conflicts_on_key_with_partition_columns():
+    columns = ["match_id", "competition_id", "season_id", "status", "loaded_at"]
+    sql = build_upsert_sql("fact_matches", "stg", columns, UPSERT_KEYS["fact_matches"])
+    assert "ON CONFLICT (match_id, competition_id, season_id) DO UPDATE SET status = EXCLUDED.status" in sql
+
+
+
+# build_replace_today_sql
+
+def test_replace_today_deletes_only_todays_rows_of_the_staged_competitions():
+    delete, insert = build_replace_today_sql("standings_snapshot", "stg", ["competition_id", "team_id", "points"])
+    assert delete.startswith("DELETE FROM standings_snapshot WHERE competition_id IN "
+                             "(SELECT DISTINCT competition_id FROM stg)")
+    assert "loaded_at >= current_date AND loaded_at < current_date + 1" in delete
+    assert insert == ("INSERT INTO standings_snapshot (competition_id, team_id, points) "
+                      "SELECT competition_id, team_id, points FROM stg")
+
+
+# build_cdc_sql
+
+SCORER_COLUMNS = ["competition_id", "season_id", "player_id", "goals", "assists", "loaded_at"]
+
+
+def test_cdc_hashes_non_key_values_only():
+    create = build_cdc_sql("scorers_scd", "stg", SCORER_COLUMNS, CDC_KEYS["dim_scorers"])[0]
+    assert "md5(ROW(goals, assists)::text) AS row_hash" in create
+    assert "SELECT DISTINCT ON (competition_id, season_id, player_id)" in create
+
+def test_cdc_closes_changed_versions_before_opening_new_ones():
+    close_changed, close_missing, insert = build_cdc_sql("scorers_scd", "stg", SCORER_COLUMNS,
+                                                         CDC_KEYS["dim_scorers"])[1:]
+    assert close_changed.startswith("UPDATE scorers_scd h SET valid_to = i.valid_from")
+    assert "h.row_hash <> i.row_hash" in close_changed
+    assert "IN (SELECT competition_id, season_id FROM incoming_snapshot)" in close_missing
+    assert "NOT EXISTS" in close_missing
+    assert insert.startswith("INSERT INTO scorers_scd (competition_id, season_id, player_id, goals, assists, "
+                             "row_hash, valid_from)")
+    # Unchanged rows still have a current version, so nothing is inserted for them
+    assert "WHERE h.valid_to IS NULL AND h.competition_id = i.competition_id" in insert
+
+
+# CsvRowStream
+
+def test_row_stream_distinguishes_null_from_empty_string():
+    # COPY reads the \N marker as NULL and an unquoted empty field as ''
+    stream = CsvRowStream([(1, None, "")])
+    assert stream.read() == "1,\\N,\n"
+
+def test_row_stream_serialises_dates_and_booleans():
+    stream = CsvRowStream([(date(2024, 5, 1), datetime(2024, 5, 1, 19, 30), True)])
+    assert stream.read() == "2024-05-01,2024-05-01T19:30:00,t\n"
+
+def test_row_stream_honours_read_size_and_counts_rows():
+    stream = CsvRowStream([(i, f"team {i}") for i in range(100)])
+    chunks = []
+    while True:
+        chunk = stream.read(64)
+        if not chunk:
+            break
+        assert len(chunk) <= 64
+        chunks.append(chunk)
+    assert "".join(chunks).count("\n") == 100
+    assert stream.row_count == 100
+
+
+# PostgresCopyLoader connection use
+
+class FakeCursor:
+    def __init__(self, barrier):
+        self.barrier = barrier
+        self.rowcount = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, statement, params=None):
+        pass
+
+    def fetchall(self):
+        return []
+
+    def copy_expert(self, statement, stream):
+        stream.read()
+        # Both merges hold their connection here at the same time
+        self.barrier.wait(timeout=5)
+
+
+class FakeConnection:
+    closed = False
+    info = SimpleNamespace(transaction_status=TRANSACTION_STATUS_IDLE)
+
+    def __init__(self, barrier):
+        self.barrier = barrier
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def cursor(self):
+        return FakeCursor(self.barrier)
+
+    def close(self):
+        self.closed = True
+
+
+def fake_pool(make_connection):
+    """ThreadedConnectionPool class whose connections come from make_connection()"""
+    class FakePool(ThreadedConnectionPool):
+        def _connect(self, key=None):
+            conn = make_connection()
+            if key is not None:
+                self._used[key] = conn
+                self._rused[id(conn)] = key
+            else:
+                self._pool.append(conn)
+            return conn
+    return FakePool
+
+
+def test_concurrent_upserts_need_one_connection_each(monkeypatch):
+    barrier = threading.Barrier(2)
+    monkeypatch.setattr(copy_loader, "ThreadedConnectionPool", fake_pool(lambda: FakeConnection(barrier)))
+    loader = PostgresCopyLoader(max_connections=2)
+    teams = pd.DataFrame({"team_id": [57], "team_name": ["Arsenal FC"]})
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = [pool.submit(loader.upsert_dataframe, teams, "dim_teams") for _ in range(2)]
+        # PoolError("connection pool exhausted") if the COPY took a second connection
+        assert [future.result() for future in results] == [[], []]
+
+
+class UnmigratedCursor(FakeCursor):
+    def execute(self, statement, params=None):
+        raise psycopg2.errors.UndefinedFunction("function ensure_match_partition(integer, integer) does not exist")
+
+
+class UnmigratedConnection(FakeConnection):
+    def cursor(self):
+        return UnmigratedCursor(self.barrier)
+
+
+def test_unpartitioned_fact_matches_stops_the_load(monkeypatch):
+    monkeypatch.setattr(copy_loader, "ThreadedConnectionPool", fake_pool(lambda: UnmigratedConnection(None)))
+    loader = PostgresCopyLoader(max_connections=1)
+    matches = pd.DataFrame({"match_id": [1], "competition_id": [2021], "season_id": [1564]})
+    with pytest.raises(RuntimeError, match="run migrate.py"):
+        loader.load_fact_matches(matches)
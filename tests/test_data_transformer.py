@@ -1,4 +1,7 @@
 import pytest
+from pyspark.sql.types import IntegerType
+
+from scripts.schemas import column_names
 
 
 
@@ -17,6 +20,14 @@ def test_transform_teams_row_count(transformer, raw_teams):
     df = transformer.transform_teams(raw_teams)
     assert df.count() == 2
 
+def test_transform_teams_column_order_matches_table(transformer, raw_teams):
+    df = transformer.transform_teams(raw_teams)
+    assert df.columns == column_names("dim_teams")
+
+def test_transform_teams_all_null_founded_keeps_integer_type(transformer, raw_teams_missing_optional):
+    df = transformer.transform_teams(raw_teams_missing_optional)
+    assert isinstance(df.schema["founded"].dataType, IntegerType)
+
 def test_transform_teams_optional_fields_default_to_empty_string(transformer, raw_teams_missing_optional):
     df = transformer.transform_teams(raw_teams_missing_optional)
     row = df.collect()[0]
@@ -39,13 +50,17 @@ EXPECTED_MATCH_COLUMNS = {
     "home_score_halftime", "away_score_halftime",
     "winner", "duration", "referees",
     "match_date", "match_timestamp", "day", "month", "year", "day_of_week",
-    "loaded_at",
+    "date_id", "loaded_at",
 }
 
 def test_transform_matches_columns(transformer, raw_matches):
     df = transformer.transform_matches(raw_matches)
     assert set(df.columns) == EXPECTED_MATCH_COLUMNS
 
+def test_transform_matches_column_order_matches_table(transformer, raw_matches):
+    df = transformer.transform_matches(raw_matches)
+    assert df.columns == column_names("fact_matches")
+
 def test_transform_matches_row_count(transformer, raw_matches):
     df = transformer.transform_matches(raw_matches)
     assert df.count() == 2
@@ -64,6 +79,11 @@ def test_transform_matches_computes_day_of_week(transformer, raw_matches):
     # 2023-08-11 is a Friday; Spark dayofweek: 1=Sun ... 6=Fri
     assert row["day_of_week"] == 6
 
+def test_transform_matches_computes_date_id(transformer, raw_matches):
+    df = transformer.transform_matches(raw_matches)
+    row = df.filter(df.match_id == 417406).collect()[0]
+    assert row["date_id"] == 20230811
+
 def test_transform_matches_referees_joined_as_string(transformer, raw_matches):
     df = transformer.transform_matches(raw_matches)
     row = df.filter(df.match_id == 417406).collect()[0]
@@ -100,63 +120,6 @@ def test_transform_standings_form_none_becomes_empty_string(transformer, raw_sta
 
 
 
-# create_date_dimension
-
-def test_create_date_dimension_date_id_calculation(transformer, raw_matches):
-    matches_df = transformer.transform_matches(raw_matches)
-    dates_df = transformer.create_date_dimension(matches_df)
-    row = dates_df.filter(dates_df.year == 2023).filter(dates_df.month == 8).filter(dates_df.day == 11).collect()[0]
-    # date_id = year*10000 + month*100 + day = 20230811
-    assert row["date_id"] == 20230811
-
-def test_create_date_dimension_deduplicates(transformer, spark):
-    # Two matches on the same date should produce only one date row
-    raw = {
-        "competition": {"id": 2021, "name": "Premier League"},
-        "matches": [
-            {
-                "id": 1, "season": {"id": 1}, "matchday": 1, "stage": "REGULAR_SEASON",
-                "utcDate": "2023-08-11T15:00:00Z", "status": "FINISHED",
-                "homeTeam": {"id": 1, "name": "A"}, "awayTeam": {"id": 2, "name": "B"},
-                "score": {"fullTime": {"home": 1, "away": 0}, "halfTime": {"home": 0, "away": 0},
-                          "winner": "HOME_TEAM", "duration": "REGULAR"},
-                "referees": [],
-            },
-            {
-                "id": 2, "season": {"id": 1}, "matchday": 1, "stage": "REGULAR_SEASON",
-                "utcDate": "2023-08-11T17:30:00Z", "status": "FINISHED",
-                "homeTeam": {"id": 3, "name": "C"}, "awayTeam": {"id": 4, "name": "D"},
-                "score": {"fullTime": {"home": 0, "away": 2}, "halfTime": {"home": 0, "away": 1},
-                          "winner": "AWAY_TEAM", "duration": "REGULAR"},
-                "referees": [],
-            },
-        ],
-    }
-    matches_df = transformer.transform_matches(raw)
-    dates_df = transformer.create_date_dimension(matches_df)
-    assert dates_df.count() == 1
-
-def test_create_date_dimension_filters_null_dates(transformer, spark):
-    # Match with no utcDate should not produce a date row
-    raw = {
-        "competition": {"id": 2021, "name": "Premier League"},
-        "matches": [
-            {
-                "id": 3, "season": {"id": 1}, "matchday": 1, "stage": "REGULAR_SEASON",
-                "utcDate": None, "status": "SCHEDULED",
-                "homeTeam": {"id": 1, "name": "A"}, "awayTeam": {"id": 2, "name": "B"},
-                "score": {"fullTime": {"home": None, "away": None}, "halfTime": {"home": None, "away": None},
-                          "winner": None, "duration": "REGULAR"},
-                "referees": [],
-            },
-        ],
-    }
-    matches_df = transformer.transform_matches(raw)
-    dates_df = transformer.create_date_dimension(matches_df)
-    assert dates_df.count() == 0
-
-
-
 # transform_scorers
 
 EXPECTED_SCORER_COLUMNS = {
@@ -0,0 +1,36 @@
+from datetime import date
+
+from scripts.date_dimension import calendar_frame, missing_ranges, payload_date_range
+from scripts.schemas import column_names
+
+
+def test_calendar_has_one_row_per_day_in_dim_dates_layout():
+    calendar = calendar_frame(date(2024, 2, 27), date(2024, 3, 1))
+    assert list(calendar.columns) == column_names("dim_dates")
+    assert calendar["date_id"].tolist() == [20240227, 20240228, 20240229, 20240301]
+    assert calendar["full_date"].iloc[2] == date(2024, 2, 29)
+
+def test_calendar_uses_spark_day_of_week_numbering():
+    # 2023-08-11 is a Friday; Spark dayofweek: 1=Sun ... 6=Fri
+    row = calendar_frame(date(2023, 8, 11), date(2023, 8, 11)).iloc[0]
+    assert (row["day"], row["month"], row["year"], row["day_of_week"]) == (11, 8, 2023, 6)
+
+def test_payload_date_range_spans_every_competition(raw_matches):
+    later = {"matches": [{"id": 9, "utcDate": "2024-05-19T15:00:00Z"}, {"id": 10, "utcDate": None}]}
+    raw_data = {"PL": {"matches": raw_matches}, "BL1": {"matches": later}, "PD": {"teams": {}}}
+    assert payload_date_range(raw_data) == (date(2023, 8, 11), date(2024, 5, 19))
+
+def test_payload_date_range_without_matches():
+    assert payload_date_range({"PL": {"matches": {"matches": []}}}) is None
+
+def test_missing_ranges_only_extends_past_the_stored_edges():
+    stored = (date(2000, 1, 1), date(2039, 12, 31))
+    assert missing_ranges(stored, stored) == []
+    assert missing_ranges(stored, (date(1999, 12, 30), date(2040, 1, 2))) == [
+        (date(1999, 12, 30), date(1999, 12, 31)),
+        (date(2040, 1, 1), date(2040, 1, 2)),
+    ]
+
+def test_missing_ranges_without_a_contiguous_calendar():
+    needed = (date(2000, 1, 1), date(2039, 12, 31))
+    assert missing_ranges(None, needed) == [needed]
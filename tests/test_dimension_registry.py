@@ -0,0 +1,30 @@
+from datetime import datetime, timedelta
+
+from scripts.dimension_registry import DimensionRegistry, content_hash
+
+NOW = datetime(2024, 9, 1, 6, 0)
+
+
+def test_content_hash_ignores_key_order():
+    assert content_hash([{"id": 57, "name": "Arsenal"}]) == content_hash([{"name": "Arsenal", "id": 57}])
+    assert content_hash([{"id": 57, "name": "Arsenal"}]) != content_hash([{"id": 57, "name": "Arsenal FC"}])
+
+def test_dimension_is_fresh_within_ttl_only(tmp_path):
+    registry = DimensionRegistry(str(tmp_path / "dimensions.json"), ttl=timedelta(hours=24))
+    assert not registry.is_fresh("dim_teams", "PL", NOW)
+    registry.record("dim_teams", "PL", "abc", NOW)
+    assert registry.is_fresh("dim_teams", "PL", NOW + timedelta(hours=23))
+    assert not registry.is_fresh("dim_teams", "PL", NOW + timedelta(hours=25))
+    assert not registry.is_fresh("dim_teams", "PD", NOW)
+
+def test_zero_ttl_always_refreshes(tmp_path):
+    registry = DimensionRegistry(str(tmp_path / "dimensions.json"), ttl=timedelta(0))
+    registry.record("dim_teams", "PL", "abc", NOW)
+    assert not registry.is_fresh("dim_teams", "PL", NOW)
+
+def test_unchanged_compares_the_recorded_hash(tmp_path):
+    path = str(tmp_path / "dimensions.json")
+    DimensionRegistry(path).record("dim_teams", "PL", "abc", NOW)
+    registry = DimensionRegistry(path)
+    assert registry.is_unchanged("dim_teams", "PL", "abc")
+    assert not registry.is_unchanged("dim_teams", "PL", "def")
@@ -0,0 +1,178 @@
+import copy
+import os
+from contextlib import contextmanager
+
+import pytest
+
+from scripts import etl_pipeline
+from scripts.etl_pipeline import run_etl_pipeline
+from scripts.pandas_transformer import PandasDataTransformer
+from scripts.run_state import RunStateStore
+from scripts.state_store import JsonStateStore
+
+COMPETITION_IDS = {"PL": 2021, "PD": 2014, "BL1": 2002}
+
+
+class FakeClient:
+    def __init__(self, payloads):
+        self.payloads = payloads
+
+    def extract_all(self, competitions, endpoints=None, max_workers=None, params=None):
+        return {code: {e: self.payloads[code][e] for e in endpoints[code]} for code in competitions}
+
+
+class FailingTransformer(PandasDataTransformer):
+    def __init__(self, failing_competition_id):
+        self.failing_competition_id = failing_competition_id
+
+    def transform_matches(self, raw_data):
+        if raw_data["competition"]["id"] == self.failing_competition_id:
+            raise ValueError("malformed matches payload")
+        return super().transform_matches(raw_data)
+
+
+class EmptyCalendarCursor:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, statement, params=None):
+        pass
+
+    def fetchone(self):
+        return None, None, 0
+
+
+class EmptyCalendarConnection(EmptyCalendarCursor):
+    def cursor(self):
+        return EmptyCalendarCursor()
+
+
+class RecordingLoader:
+    def __init__(self):
+        self.loads = []
+
+    @contextmanager
+    def connection(self):
+        yield EmptyCalendarConnection()
+
+    def maintain_partitions(self):
+        pass
+
+    def upsert_dataframe(self, df, table_name, update=True, count=None):
+        self.loads.append((table_name, None))
+        return []
+
+    def load_dim_teams(self, df, count=None):
+        # Teams carry no competition_id; loaded once per competition
+        self.loads.append(("dim_teams", None))
+
+    def load_fact_matches(self, df, count=None):
+        self.loads.append(("fact_matches", int(df["competition_id"].iloc[0])))
+        return []
+
+    def snapshot_exists_today(self, table_name, competition_id):
+        return False
+
+    def load_standings(self, df, count=None):
+        self.loads.append(("standings_snapshot", int(df["competition_id"].iloc[0])))
+
+    def load_scorers(self, df, count=None):
+        self.loads.append(("dim_scorers", int(df["competition_id"].iloc[0])))
+
+    def close(self):
+        pass
+
+    def tables_loaded_for(self, competition_id):
+        return {table for table, loaded_id in self.loads if loaded_id == competition_id}
+
+
+@pytest.fixture
+def payloads(raw_teams, raw_matches, raw_standings, raw_scorers):
+    payloads = {}
+    for code, competition_id in COMPETITION_IDS.items():
+        competition = {"teams": copy.deepcopy(raw_teams), "matches": copy.deepcopy(raw_matches),
+                       "standings": copy.deepcopy(raw_standings), "scorers": copy.deepcopy(raw_scorers)}
+        for endpoint in ("matches", "standings", "scorers"):
+            competition[endpoint]["competition"] = {"id": competition_id, "code": code}
+        payloads[code] = competition
+    return payloads
+
+
+@pytest.fixture
+def state_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(etl_pipeline, "STATE_DIR", str(tmp_path / "state"))
+    monkeypatch.setattr(etl_pipeline, "REPORTS_DIR", str(tmp_path / "reports"))
+    monkeypatch.setenv("ETL_LANDING_DIR", str(tmp_path / "landing"))
+    monkeypatch.setenv("ETL_METRICS_TEXTFILE", str(tmp_path / "reports" / "etl_pipeline.prom"))
+    return str(tmp_path / "state")
+
+
+def test_failing_competition_does_not_stop_the_others(payloads, state_dir):
+    loader = RecordingLoader()
+    succeeded = run_etl_pipeline(
+        competitions=list(COMPETITION_IDS), parallelism=3, api_client=FakeClient(payloads),
+        transformer=FailingTransformer(COMPETITION_IDS["BL1"]), loader=loader,
+    )
+
+    assert succeeded is False
+    for code in ("PL", "PD"):
+        assert {"fact_matches", "standings_snapshot", "dim_scorers"} <= loader.tables_loaded_for(COMPETITION_IDS[code])
+    assert loader.tables_loaded_for(COMPETITION_IDS["BL1"]) == set()
+    assert [table for table, _ in loader.loads].count("dim_teams") == 2
+    # The calendar is extended once for the whole run, not per competition
+    assert [table for table, _ in loader.loads].count("dim_dates") == 1
+
+    sync_state = JsonStateStore(os.path.join(state_dir, "match_sync.json"))
+    assert sync_state.get("PL") and sync_state.get("PD")
+    assert sync_state.get("BL1") is None
+
+    run_id = RunStateStore.latest_unfinished(state_dir)
+    run_state = RunStateStore(state_dir, run_id)
+    assert run_state.competition_done("PL") and run_state.competition_done("PD")
+    assert not run_state.competition_done("BL1")
+
+
+class RecordingClient(FakeClient):
+    def __init__(self, payloads):
+        super().__init__(payloads)
+        self.requested = []
+
+    def extract_all(self, competitions, endpoints=None, max_workers=None, params=None):
+        self.requested.append(endpoints)
+        return super().extract_all(competitions, endpoints, max_workers, params)
+
+
+def test_run_limited_to_endpoints_loads_only_those(payloads, state_dir):
+    loader = RecordingLoader()
+    client = RecordingClient(payloads)
+    assert run_etl_pipeline(competitions=["PL"], endpoints=["standings"], api_client=client,
+                            transformer=FailingTransformer(None), loader=loader)
+
+    assert client.requested == [{"PL": ["standings"]}]
+    assert loader.tables_loaded_for(COMPETITION_IDS["PL"]) == {"standings_snapshot"}
+    # Matches were not requested, so the next incremental window must not skip past them
+    assert JsonStateStore(os.path.join(state_dir, "match_sync.json")).get("PL") is None
+
+def test_matches_only_run_moves_the_sync_mark(payloads, state_dir):
+    loader = RecordingLoader()
+    assert run_etl_pipeline(competitions=["PL"], endpoints=["matches"], api_client=FakeClient(payloads),
+                            transformer=FailingTransformer(None), loader=loader)
+
+    assert loader.tables_loaded_for(COMPETITION_IDS["PL"]) == {"fact_matches"}
+    assert JsonStateStore(os.path.join(state_dir, "match_sync.json")).get("PL")
+
+def test_copy_pool_holds_a_connection_per_parallel_competition(payloads, state_dir, monkeypatch):
+    built = []
+
+    def copy_loader(spark=None, max_connections=None):
+        built.append(max_connections)
+        return RecordingLoader()
+
+    monkeypatch.setitem(etl_pipeline.LOADER_BACKENDS, "copy", copy_loader)
+    monkeypatch.setenv("POSTGRES_POOL_SIZE", "2")
+    assert run_etl_pipeline(competitions=list(COMPETITION_IDS), parallelism=3, loader_backend="copy",
+                            api_client=FakeClient(payloads), transformer=FailingTransformer(None))
+    assert built == [3]
@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from scripts.json_stream import JsonArrayStream, batches
+
+
+def chunked(payload, size):
+    body = json.dumps(payload, ensure_ascii=False).encode()
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+PAYLOAD = {
+    "filters": {"season": "2023"},
+    "resultSet": {"count": 40, "played": 12345},
+    "competition": {"id": 2021, "name": "Première Ligue ⚽"},
+    "matches": [{"id": i, "utcDate": "2023-08-11T19:00:00Z", "score": [i * 1.5, None]} for i in range(40)],
+    "trailing": 7,
+}
+
+
+@pytest.mark.parametrize("size", [1, 5, 64, 1 << 20])
+def test_elements_and_header_survive_any_chunk_boundary(size):
+    stream = JsonArrayStream(chunked(PAYLOAD, size), "matches")
+    assert list(stream) == PAYLOAD["matches"]
+    assert stream.header == {key: value for key, value in PAYLOAD.items() if key != "matches"}
+
+def test_header_before_the_array_is_available_with_the_first_element():
+    stream = JsonArrayStream(chunked(PAYLOAD, 16), "matches")
+    next(iter(stream))
+    assert stream.header["competition"]["id"] == 2021
+
+def test_buffer_holds_one_record_not_the_body():
+    stream = JsonArrayStream(chunked(PAYLOAD, 32), "matches")
+    longest = 0
+    for _ in stream:
+        longest = max(longest, len(stream.buffer))
+    assert longest < 200
+
+def test_empty_array_yields_nothing():
+    assert list(JsonArrayStream([b'{"matches": []}'], "matches")) == []
+
+@pytest.mark.parametrize("body", [b'{"count": 1}', b'{"matches": null}', b'{"matches": [{"id": 1},', b'{"matches": []} x'])
+def test_missing_array_or_malformed_body_raises(body):
+    with pytest.raises(ValueError):
+        list(JsonArrayStream([body], "matches"))
+
+def test_batches_are_fixed_size_with_a_short_tail():
+    assert [len(batch) for batch in batches(range(10), 4)] == [4, 4, 2]
@@ -0,0 +1,56 @@
+import gzip
+import json
+import os
+
+import pytest
+
+from scripts.landing_zone import LandingZone
+
+
+@pytest.fixture
+def landing(tmp_path):
+    return LandingZone(str(tmp_path / "landing"))
+
+
+@pytest.fixture
+def raw_data(raw_teams, raw_matches):
+    return {
+        "PL": {"teams": raw_teams, "matches": raw_matches},
+        "BL1": {"teams": {"teams": []}},
+    }
+
+
+def test_write_run_lands_gzip_json_per_competition_and_endpoint(landing, raw_data):
+    landing.write_run("20240601_120000", raw_data)
+    run_dir = landing.find_run_dir("20240601_120000")
+    path = os.path.join(run_dir, "PL", "teams.json.gz")
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        assert json.load(f) == raw_data["PL"]["teams"]
+
+def test_run_dir_is_partitioned_by_date(landing, raw_data):
+    landing.write_run("20240601_120000", raw_data)
+    partition = os.path.basename(os.path.dirname(landing.find_run_dir("20240601_120000")))
+    assert partition.startswith("dt=")
+
+def test_read_run_round_trips_all_competitions(landing, raw_data):
+    landing.write_run("20240601_120000", raw_data)
+    assert landing.read_run("20240601_120000") == raw_data
+
+def test_read_run_limits_to_requested_competitions(landing, raw_data):
+    landing.write_run("20240601_120000", raw_data)
+    assert list(landing.read_run("20240601_120000", ["PL"])) == ["PL"]
+
+def test_read_unknown_run_raises(landing):
+    with pytest.raises(FileNotFoundError):
+        landing.read_run("19990101_000000")
+
+def test_read_run_missing_competition_raises(landing, raw_data):
+    landing.write_run("20240601_120000", raw_data)
+    with pytest.raises(FileNotFoundError):
+        landing.read_run("20240601_120000", ["SA"])
+
+def test_run_ids_are_unique_and_sort_in_start_order():
+    run_ids = [LandingZone.new_run_id() for _ in range(100)]
+    assert len(set(run_ids)) == 100
+    # Timestamp part only; the suffix is random
+    assert sorted(run_ids, key=lambda run_id: run_id[:-5]) == run_ids
@@ -0,0 +1,96 @@
+import pytest
+
+from scripts import live_mode
+from scripts.live_mode import LiveMatchPoller, changed_matches, match_state, newly_finished
+from scripts.pandas_transformer import PandasDataTransformer
+
+COMPETITION = {"id": 2021, "code": "PL", "name": "Premier League"}
+
+
+def live_match(match_id, status="IN_PLAY", home=0, away=0):
+    return {
+        "id": match_id, "competition": COMPETITION, "season": {"id": 1564}, "matchday": 3,
+        "utcDate": "2024-08-31T14:00:00Z", "status": status,
+        "homeTeam": {"id": 57, "name": "Arsenal"}, "awayTeam": {"id": 61, "name": "Chelsea"},
+        "score": {"fullTime": {"home": home, "away": away}, "halfTime": {"home": 0, "away": 0},
+                  "winner": None, "duration": "REGULAR"},
+        "referees": [],
+    }
+
+
+class FakeClient:
+    requests_per_minute = 10
+
+    def __init__(self, standings=None):
+        self.live = []
+        self.matches = {}
+        self.standings = standings
+        self.standings_requests = []
+
+    def get_live_matches(self, competition_codes, status=None):
+        return {"matches": self.live}
+
+    def get_match(self, match_id):
+        return self.matches[match_id]
+
+    def get_standings(self, competition_code, use_cache=True):
+        self.standings_requests.append((competition_code, use_cache))
+        return self.standings
+
+
+class FakeLoader:
+    def __init__(self):
+        self.batches = []
+        self.standings_loads = []
+
+    def load_fact_matches(self, df, count=None):
+        self.batches.append(sorted(df["match_id"].tolist()))
+        return df["match_id"].tolist()
+
+    def load_standings(self, df, count=None, replace_today=False):
+        self.standings_loads.append(replace_today)
+
+
+@pytest.fixture
+def poller(monkeypatch, raw_standings):
+    refreshed = []
+    monkeypatch.setattr(live_mode, "refresh_aggregates", lambda loader, ids: refreshed.append(ids))
+    monkeypatch.setattr(live_mode, "materialize_season_standings", lambda *args: None)
+    poller = LiveMatchPoller(FakeClient(raw_standings), PandasDataTransformer(), FakeLoader(), competitions=["PL"])
+    poller.refreshed = refreshed
+    return poller
+
+
+def test_unseen_and_changed_matches_are_changed():
+    previous = {1: match_state(live_match(1)), 2: match_state(live_match(2))}
+    matches = [live_match(1), live_match(2, home=1), live_match(3)]
+    assert [m["id"] for m in changed_matches(previous, matches)] == [2, 3]
+
+def test_only_transitions_to_finished_count():
+    previous = {1: match_state(live_match(1)), 2: match_state(live_match(2, status="FINISHED"))}
+    matches = [live_match(1, status="FINISHED"), live_match(2, status="FINISHED")]
+    assert [m["id"] for m in newly_finished(previous, matches)] == [1]
+
+def test_poll_upserts_only_changed_matches(poller):
+    poller.client.live = [live_match(1), live_match(2)]
+    assert poller.poll() == {"live": 2, "changed": 2, "finished": 0}
+    poller.client.live = [live_match(1), live_match(2, home=1)]
+    assert poller.poll() == {"live": 2, "changed": 1, "finished": 0}
+    assert poller.loader.batches == [[1, 2], [2]]
+
+def test_finished_match_is_fetched_once_and_refreshes_standings(poller):
+    poller.client.live = [live_match(1), live_match(2)]
+    poller.poll()
+    poller.client.live = [live_match(2)]
+    poller.client.matches[1] = live_match(1, status="FINISHED", home=2, away=1)
+    assert poller.poll() == {"live": 1, "changed": 1, "finished": 1}
+    assert poller.refreshed == [[1]]
+    assert poller.client.standings_requests == [("PL", False)]
+    # Replaces today's snapshot rather than appending one per finished match
+    assert poller.loader.standings_loads == [True]
+    # No longer tracked, so not fetched again
+    assert 1 not in poller.state
+
+def test_interval_respects_the_api_quota():
+    poller = LiveMatchPoller(FakeClient(), PandasDataTransformer(), FakeLoader(), interval=1)
+    assert poller.interval == 6.0
@@ -0,0 +1,18 @@
+from scripts.migrate import MIGRATIONS_DIR, migration_files, pending_migrations, seeds_for
+
+
+def test_migrations_are_ordered_by_version():
+    versions = [version for version, _ in migration_files()]
+    assert versions == sorted(versions)
+    assert versions[:3] == ["001_partition_fact_matches", "002_partition_snapshots", "003_snapshot_retention"]
+
+def test_pending_migrations_skip_applied_versions():
+    pending = pending_migrations({"001_partition_fact_matches"})
+    assert "001_partition_fact_matches" not in [version for version, _ in pending]
+    assert all(path.startswith(MIGRATIONS_DIR) for _, path in pending)
+
+def test_seeds_run_for_the_migrations_that_need_them():
+    assert seeds_for(["003_snapshot_retention", "004_aggregate_tables"]) == ["aggregates"]
+    assert seeds_for(["001_partition_fact_matches"]) == []
+    # Listed once even when several applied migrations call for it
+    assert seeds_for(["005_standings_history", "008_standings_current_by_date"]) == ["standings_history"]
@@ -0,0 +1,67 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from scripts.pandas_transformer import PandasDataTransformer
+from scripts.schemas import column_names
+from tests.test_data_transformer import (
+    EXPECTED_MATCH_COLUMNS, EXPECTED_SCORER_COLUMNS,
+    EXPECTED_STANDING_COLUMNS, EXPECTED_TEAM_COLUMNS,
+)
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return PandasDataTransformer()
+
+
+
+# The pandas engine must honour the same contract as the Spark transformer
+
+def test_transform_teams_matches_spark_contract(engine, raw_teams, raw_teams_missing_optional):
+    df = engine.transform_teams(raw_teams)
+    assert set(df.columns) == EXPECTED_TEAM_COLUMNS
+    assert len(df) == 2
+
+    row = engine.transform_teams(raw_teams_missing_optional).iloc[0]
+    assert row["short_name"] == ""
+    assert row["website"] == ""
+
+def test_transform_matches_matches_spark_contract(engine, raw_matches):
+    df = engine.transform_matches(raw_matches)
+    assert set(df.columns) == EXPECTED_MATCH_COLUMNS
+    row = df[df.match_id == 417406].iloc[0]
+    assert row["match_date"] == date(2023, 8, 11)
+    assert (row["day"], row["month"], row["year"]) == (11, 8, 2023)
+    assert row["day_of_week"] == 6  # Friday, Spark numbering
+    assert row["date_id"] == 20230811
+    assert row["referees"] == "Michael Oliver"
+    assert df[df.match_id == 417407].iloc[0]["referees"] == ""
+
+def test_transform_matches_keeps_missing_scores_null(engine):
+    raw = {
+        "competition": {"id": 2021, "name": "Premier League"},
+        "matches": [{"id": 5, "utcDate": None, "status": "SCHEDULED",
+                     "score": {"fullTime": {"home": None, "away": None}, "halfTime": {}}}],
+    }
+    row = engine.transform_matches(raw).iloc[0]
+    assert pd.isna(row["home_score_fulltime"])
+    assert pd.isna(row["match_date"])
+
+def test_transform_standings_matches_spark_contract(engine, raw_standings):
+    df = engine.transform_standings(raw_standings)
+    assert set(df.columns) == EXPECTED_STANDING_COLUMNS
+    assert len(df) == 2
+    assert df[df.team_id == 61].iloc[0]["form"] == ""
+
+def test_transform_scorers_matches_spark_contract(engine, raw_scorers):
+    df = engine.transform_scorers(raw_scorers)
+    assert set(df.columns) == EXPECTED_SCORER_COLUMNS
+    assert len(df) == 2
+
+def test_outputs_follow_table_column_order(engine, raw_teams, raw_matches, raw_standings, raw_scorers):
+    assert list(engine.transform_teams(raw_teams).columns) == column_names("dim_teams")
+    assert list(engine.transform_matches(raw_matches).columns) == column_names("fact_matches")
+    assert list(engine.transform_standings(raw_standings).columns) == column_names("standings_snapshot")
+    assert list(engine.transform_scorers(raw_scorers).columns) == column_names("dim_scorers")
@@ -0,0 +1,66 @@
+import copy
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from scripts.pandas_transformer import PandasDataTransformer
+from scripts.parquet_sink import ParquetLakeSink, data_files
+
+
+@pytest.fixture
+def lake(tmp_path):
+    return ParquetLakeSink(str(tmp_path))
+
+
+@pytest.fixture
+def pandas_transformer():
+    return PandasDataTransformer()
+
+
+def test_matches_are_partitioned_by_competition_and_season(lake, pandas_transformer, raw_matches):
+    lake.write(pandas_transformer.transform_matches(raw_matches), "fact_matches")
+    files = data_files(lake.path, recursive=True)
+    assert len(files) == 1
+    assert "fact_matches/competition_id=2021/season_id=1564/" in files[0].replace("\\", "/")
+    table = lake.read_table("fact_matches")
+    assert table.num_rows == 2
+    assert str(table.schema.field("match_date").type) == "date32[day]"
+
+def test_writes_compact_into_one_file_keeping_the_latest_row(lake, pandas_transformer, raw_matches):
+    lake.write(pandas_transformer.transform_matches(raw_matches), "fact_matches")
+    update = copy.deepcopy(raw_matches)
+    update["matches"] = update["matches"][:1]
+    update["matches"][0]["score"]["fullTime"]["home"] = 5
+    lake.write(pandas_transformer.transform_matches(update), "fact_matches")
+
+    assert len(data_files(lake.path, recursive=True)) == 1
+    rows = {row["match_id"]: row for row in lake.read_table("fact_matches").to_pylist()}
+    assert len(rows) == 2
+    assert rows[update["matches"][0]["id"]]["home_score_fulltime"] == 5
+
+def test_new_columns_read_back_as_null_for_older_rows(lake, pandas_transformer, raw_teams):
+    teams = pandas_transformer.transform_teams(raw_teams)
+    lake.write(teams.iloc[:1], "dim_teams")
+    evolved = teams.iloc[1:].copy()
+    evolved["venue_capacity"] = 60000
+    lake.write(evolved, "dim_teams")
+
+    capacities = {row["team_id"]: row["venue_capacity"] for row in lake.read_table("dim_teams").to_pylist()}
+    assert sorted(capacities.values(), key=str) == [60000, None]
+
+def test_snapshots_keep_one_copy_per_day(lake, pandas_transformer, raw_standings):
+    standings = pandas_transformer.transform_standings(raw_standings)
+    lake.write(standings, "standings_snapshot")
+    lake.write(standings, "standings_snapshot")
+    table = lake.read_table("standings_snapshot")
+    assert table.num_rows == len(standings)
+    assert "snapshot_date" in table.column_names
+
+def test_parallel_writes_to_a_shared_dimension_keep_every_row(lake, pandas_transformer, raw_teams):
+    teams = pandas_transformer.transform_teams(raw_teams)
+    batches = [teams.assign(team_id=teams["team_id"] + offset) for offset in range(0, 2000, 100)]
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        list(pool.map(lambda batch: lake.write(batch, "dim_teams"), batches))
+
+    assert len(data_files(lake.path, recursive=True)) == 1
+    assert lake.read_table("dim_teams").num_rows == len(teams) * len(batches)
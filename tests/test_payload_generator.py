@@ -0,0 +1,51 @@
+from collections import Counter
+
+import pytest
+
+from benchmarks.payload_generator import generate_payloads, round_robin
+from scripts.validators import validate_raw_response
+
+
+@pytest.fixture(scope="module")
+def payloads():
+    return generate_payloads(competitions=2, seasons=2, teams_per_competition=6)
+
+
+def test_round_robin_plays_every_pairing_home_and_away():
+    fixtures = round_robin([1, 2, 3, 4, 5])
+    pairings = Counter((home, away) for _, home, away in fixtures)
+    assert len(pairings) == 20 and set(pairings.values()) == {1}
+    # Every team plays at most once per matchday
+    for matchday in {m for m, _, _ in fixtures}:
+        teams = [t for m, home, away in fixtures if m == matchday for t in (home, away)]
+        assert len(teams) == len(set(teams))
+
+def test_generates_competitions_times_seasons(payloads):
+    assert sorted(payloads) == ["SYN1_2015", "SYN1_2016", "SYN2_2015", "SYN2_2016"]
+    for unit in payloads.values():
+        assert len(unit["teams"]["teams"]) == 6
+        assert len(unit["matches"]["matches"]) == 30
+        assert len(unit["standings"]["standings"][0]["table"]) == 6
+        assert len(unit["scorers"]["scorers"]) == 10
+
+def test_payloads_pass_raw_validation(payloads):
+    for label, unit in payloads.items():
+        for endpoint, payload in unit.items():
+            validate_raw_response(payload, endpoint, label)
+
+def test_standings_agree_with_results(payloads):
+    unit = payloads["SYN1_2015"]
+    table = unit["standings"]["standings"][0]["table"]
+    assert sum(row["goalsFor"] for row in table) == sum(
+        m["score"]["fullTime"]["home"] + m["score"]["fullTime"]["away"] for m in unit["matches"]["matches"]
+    )
+    assert [row["position"] for row in table] == list(range(1, 7))
+    assert all(row["playedGames"] == 10 for row in table)
+
+def test_generation_is_deterministic():
+    assert generate_payloads(1, 1, 4, seed=7) == generate_payloads(1, 1, 4, seed=7)
+    assert generate_payloads(1, 1, 4, seed=7) != generate_payloads(1, 1, 4, seed=8)
+
+def test_match_ids_are_unique_across_competitions_and_seasons(payloads):
+    ids = [m["id"] for unit in payloads.values() for m in unit["matches"]["matches"]]
+    assert len(ids) == len(set(ids))
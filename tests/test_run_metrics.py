@@ -0,0 +1,66 @@
+import json
+import threading
+
+from scripts.run_metrics import RunMetrics, endpoint_labels
+
+
+def test_endpoint_labels_split_competition_and_endpoint():
+    assert endpoint_labels("competitions/PL/matches?dateFrom=2024-01-01") == ("PL", "matches")
+    assert endpoint_labels("competitions/PL") == ("PL", "competition")
+    assert endpoint_labels("competitions") == ("all", "competitions")
+
+def test_stage_time_adds_up_per_competition_and_stage():
+    metrics = RunMetrics("run")
+    with metrics.stage("validate", "PL"):
+        pass
+    with metrics.stage("validate", "PL"):
+        pass
+    stages = metrics.report()["stages"]
+    assert [(s["competition"], s["stage"]) for s in stages] == [("PL", "validate")]
+
+def test_measurements_are_attributed_to_the_threads_competition():
+    metrics = RunMetrics("run")
+
+    def load(code, rows):
+        with metrics.competition(code):
+            metrics.record_load("fact_matches", rows, 0.5)
+            metrics.record_rows("fact_matches", rows_in=rows, rows_out=rows - 1)
+
+    threads = [threading.Thread(target=load, args=(code, rows)) for code, rows in (("PL", 380), ("BL1", 306))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    loads = {l["competition"]: l for l in metrics.report()["loads"]}
+    assert loads["PL"]["rows_per_second"] == 760
+    assert loads["BL1"]["rows"] == 306
+    tables = {t["competition"]: t for t in metrics.report()["tables"]}
+    assert tables["BL1"] == {"competition": "BL1", "table": "fact_matches", "rows_in": 306, "rows_out": 305}
+
+def test_api_calls_aggregate_per_endpoint():
+    metrics = RunMetrics("run")
+    metrics.record_api_call("competitions/PL/teams", 0.2, 1000)
+    metrics.record_api_call("competitions/PL/teams", 0.0, 0, cached=True)
+    [call] = metrics.report()["api"]
+    assert call == {"competition": "PL", "endpoint": "teams", "requests": 2, "cached": 1,
+                    "seconds": 0.2, "bytes": 1000}
+
+def test_writes_json_report_and_prometheus_textfile(tmp_path):
+    metrics = RunMetrics("20240601_120000")
+    metrics.success = True
+    metrics.record_spark_jobs("PL", 12)
+    with metrics.stage("load", "PL"):
+        pass
+
+    metrics.write_json(str(tmp_path / "run.json"))
+    metrics.write_prometheus(str(tmp_path / "etl.prom"))
+
+    report = json.loads((tmp_path / "run.json").read_text())
+    assert report["run_id"] == "20240601_120000"
+    assert report["spark_jobs"] == {"PL": 12}
+    lines = (tmp_path / "etl.prom").read_text().splitlines()
+    assert "etl_run_success 1" in lines
+    assert 'etl_spark_jobs{competition="PL"} 12' in lines
+    assert "# TYPE etl_stage_duration_seconds gauge" in lines
+    assert not (tmp_path / "etl.prom.tmp").exists()
@@ -0,0 +1,53 @@
+import pytest
+
+from scripts.etl_pipeline import run_unit
+from scripts.run_state import COMPLETE, FAILED, LOAD_UNITS, RunStateStore
+
+
+@pytest.fixture
+def run_state(tmp_path):
+    state = RunStateStore(str(tmp_path), "20240601_120000")
+    state.start(competitions=["PL", "BL1"], incremental=True)
+    return state
+
+
+def test_start_records_options_for_a_resume(run_state, tmp_path):
+    reopened = RunStateStore(str(tmp_path), "20240601_120000")
+    assert reopened.exists()
+    assert reopened.options == {"competitions": ["PL", "BL1"], "incremental": True}
+
+def test_competition_is_done_once_every_load_unit_completed(run_state):
+    for stage in LOAD_UNITS[:-1]:
+        run_state.mark_done("BL1", stage)
+    assert not run_state.competition_done("BL1")
+    run_state.mark_done("BL1", "dim_dates")
+    assert run_state.competition_done("BL1")
+
+def test_extract_unit_keeps_its_landing_pointer(run_state):
+    run_state.mark_done("PL", "extract", landing="landing/dt=2024-06-01/run=20240601_120000")
+    assert run_state.is_done("PL", "extract") and not run_state.is_done("BL1", "extract")
+    assert run_state.unit("PL", "extract")["landing"].endswith("run=20240601_120000")
+
+def test_latest_unfinished_skips_completed_runs(tmp_path):
+    older = RunStateStore(str(tmp_path), "20240601_120000")
+    older.start(competitions=["PL"], incremental=False)
+    older.set_status(FAILED)
+    newer = RunStateStore(str(tmp_path), "20240602_120000")
+    newer.start(competitions=["PL"], incremental=False)
+    newer.set_status(COMPLETE)
+    assert RunStateStore.latest_unfinished(str(tmp_path)) == "20240601_120000"
+
+def test_run_unit_skips_completed_units_and_records_new_ones(run_state):
+    calls = []
+    run_state.mark_done("BL1", "dim_teams")
+    run_unit(run_state, "BL1", "dim_teams", lambda: calls.append("dim_teams"))
+    run_unit(run_state, "BL1", "dim_scorers", lambda: calls.append("dim_scorers"))
+    assert calls == ["dim_scorers"]
+    assert run_state.is_done("BL1", "dim_scorers")
+
+def test_run_unit_leaves_failed_units_unrecorded(run_state):
+    def fail():
+        raise RuntimeError("connection reset")
+    with pytest.raises(RuntimeError):
+        run_unit(run_state, "BL1", "dim_scorers", fail)
+    assert not run_state.is_done("BL1", "dim_scorers")
@@ -0,0 +1,154 @@
+from datetime import date
+
+import pandas as pd
+
+from scripts.schemas import column_names
+from scripts.standings_engine import (materialize_all_standings, materialize_season_standings, standings_as_of,
+                                      standings_by_matchday)
+
+TEAMS = {1: "Arsenal", 2: "Chelsea", 3: "Everton", 4: "Fulham"}
+
+
+def match(match_id, matchday, played_on, home, away, home_goals, away_goals, status="FINISHED"):
+    return {
+        "match_id": match_id, "competition_id": 2021, "season_id": 1564, "matchday": matchday,
+        "match_date": played_on, "match_timestamp": pd.Timestamp(played_on), "status": status,
+        "home_team_id": home, "home_team_name": TEAMS[home],
+        "away_team_id": away, "away_team_name": TEAMS[away],
+        "home_score_fulltime": home_goals, "away_score_fulltime": away_goals,
+    }
+
+
+def season_matches():
+    return pd.DataFrame([
+        match(1, 1, date(2024, 8, 17), 1, 2, 2, 0),
+        match(2, 1, date(2024, 8, 17), 3, 4, 1, 1),
+        match(3, 2, date(2024, 8, 24), 2, 3, 3, 1),
+        # Postponed on matchday 2, played after matchday 3
+        match(4, 2, date(2024, 9, 14), 4, 1, 0, 1),
+        match(5, 3, date(2024, 8, 31), 1, 3, 0, 0),
+        match(6, 3, date(2024, 8, 31), 2, 4, None, None, status="SCHEDULED"),
+    ])
+
+
+def row(table, matchday, team_id):
+    return table[(table["matchday"] == matchday) & (table["team_id"] == team_id)].iloc[0]
+
+
+def test_table_has_every_team_on_every_matchday_in_history_layout():
+    table = standings_by_matchday(season_matches())
+    assert list(table.columns) == column_names("standings_history")
+    assert len(table) == 4 * 3
+
+def test_points_and_goal_difference_accumulate():
+    table = standings_by_matchday(season_matches())
+    arsenal = row(table, 3, 1)
+    assert (arsenal["played_games"], arsenal["won"], arsenal["draw"], arsenal["lost"]) == (3, 2, 1, 0)
+    assert arsenal["points"] == 7
+    assert (arsenal["goals_for"], arsenal["goals_against"], arsenal["goal_difference"]) == (3, 0, 3)
+
+def test_unplayed_matches_are_not_counted():
+    table = standings_by_matchday(season_matches())
+    chelsea = row(table, 3, 2)
+    assert chelsea["played_games"] == 2
+    assert chelsea["points"] == 3
+
+def test_positions_follow_points_then_goal_difference():
+    table = standings_by_matchday(season_matches())
+    matchday_one = table[table["matchday"] == 1].set_index("team_id")["position"]
+    # Everton and Fulham are level on everything, so name decides
+    assert matchday_one.to_dict() == {1: 1, 3: 2, 4: 3, 2: 4}
+
+def test_form_is_most_recent_first_and_carried_over_idle_matchdays():
+    matches = season_matches()
+    table = standings_by_matchday(matches)
+    # In the order played: the postponed matchday-2 win came last
+    assert row(table, 3, 1)["form"] == "W,D,W"
+    assert row(table, 3, 2)["form"] == "W,L"
+    assert row(table, 1, 1)["form"] == "W"
+
+def test_form_length_is_configurable():
+    table = standings_by_matchday(season_matches(), form_length=2)
+    assert row(table, 3, 1)["form"] == "W,D"
+
+def test_as_of_date_excludes_matches_played_later():
+    table = standings_as_of(season_matches(), date(2024, 9, 1))
+    assert set(table["matchday"]) == {3}
+    # The postponed matchday-2 game was not yet played on 1 September
+    assert row(table, 3, 1)["points"] == 4
+    assert row(table, 3, 4)["played_games"] == 1
+
+def test_postponed_fixture_counts_from_the_first_table_after_it_was_played():
+    table = standings_by_matchday(pd.DataFrame([
+        match(1, 1, date(2024, 8, 17), 1, 2, 2, 0),
+        match(2, 1, date(2024, 8, 18), 2, 1, 1, 1),
+        # Matchday 1 fixture postponed to December
+        match(3, 1, date(2024, 12, 20), 3, 4, 1, 0),
+        match(4, 2, date(2024, 8, 24), 2, 3, 1, 1),
+        match(5, 2, date(2024, 8, 24), 4, 1, 0, 2),
+        match(6, 3, date(2024, 12, 21), 1, 3, 0, 0),
+        match(7, 3, date(2024, 12, 21), 2, 4, 1, 0),
+    ]))
+    assert row(table, 1, 3)["as_of_date"] == date(2024, 8, 18)
+    assert row(table, 1, 3)["played_games"] == 0
+    assert row(table, 2, 3)["played_games"] == 1
+    assert row(table, 3, 3)["as_of_date"] == date(2024, 12, 21)
+    assert (row(table, 3, 3)["played_games"], row(table, 3, 3)["points"]) == (3, 5)
+
+def test_fixture_played_after_the_last_matchday_extends_its_table():
+    table = standings_by_matchday(season_matches())
+    assert row(table, 2, 1)["as_of_date"] == date(2024, 8, 24)
+    assert row(table, 2, 4)["played_games"] == 1
+    assert row(table, 3, 1)["as_of_date"] == date(2024, 9, 14)
+
+def test_seasons_with_interleaved_dates_are_kept_apart():
+    other = season_matches().assign(competition_id=2002)
+    other["match_id"] += 100
+    # Shift the other league by a day so both leagues' matchday dates interleave
+    other["match_date"] = other["match_date"] + pd.Timedelta(days=1)
+    other["match_timestamp"] = other["match_timestamp"] + pd.Timedelta(days=1)
+    both = pd.concat([season_matches(), other], ignore_index=True)
+
+    table = standings_by_matchday(both)
+    single = standings_by_matchday(season_matches())
+    league = table[table["competition_id"] == 2021].reset_index(drop=True)
+    columns = ["matchday", "team_id", "position", "points", "played_games", "as_of_date", "form"]
+    assert league[columns].equals(single[columns])
+    assert row(table[table["competition_id"] == 2002], 3, 1)["as_of_date"] == date(2024, 9, 15)
+    assert set(standings_as_of(both, date(2024, 9, 1))["competition_id"]) == {2021, 2002}
+
+def test_no_finished_matches_gives_an_empty_table():
+    matches = season_matches()
+    matches["status"] = "SCHEDULED"
+    table = standings_by_matchday(matches)
+    assert table.empty
+    assert list(table.columns) == column_names("standings_history")
+
+
+class SeasonLoader:
+    def __init__(self, matches):
+        self.matches = matches
+        self.upserts = []
+
+    def loaded_seasons(self):
+        return sorted(set(zip(self.matches["competition_id"], self.matches["season_id"])))
+
+    def read_season_matches(self, competition_id, season_id):
+        season = (self.matches["competition_id"] == competition_id) & (self.matches["season_id"] == season_id)
+        return self.matches[season]
+
+    def upsert_dataframe(self, df, table_name, update=True, count=None):
+        self.upserts.append((table_name, count))
+        return []
+
+
+def test_materialize_upserts_the_whole_season():
+    loader = SeasonLoader(season_matches())
+    assert materialize_season_standings(loader, 2021, 1564) == 12
+    assert loader.upserts == [("standings_history", 12)]
+
+def test_materialize_all_rebuilds_every_loaded_season():
+    matches = pd.concat([season_matches(), season_matches().assign(season_id=2287)], ignore_index=True)
+    loader = SeasonLoader(matches)
+    assert materialize_all_standings(loader) == 24
+    assert loader.upserts == [("standings_history", 12), ("standings_history", 12)]
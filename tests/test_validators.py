@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+
+from scripts.validators import compute_metrics, validate_dataframe, validate_raw_response
+
+
+# validate_raw_response
+
+def test_raw_response_missing_key_raises():
+    with pytest.raises(ValueError, match="missing required key"):
+        validate_raw_response({"count": 0}, "matches", "PL")
+
+def test_raw_response_empty_list_raises_unless_allowed():
+    with pytest.raises(ValueError, match="empty list"):
+        validate_raw_response({"matches": []}, "matches", "PL")
+    validate_raw_response({"matches": []}, "matches", "PL", allow_empty=True)
+
+
+
+# compute_metrics / validate_dataframe
+
+@pytest.fixture
+def scorers_frame():
+    return pd.DataFrame({
+        "competition_id": pd.array([2021, 2021, None], dtype="Int64"),
+        "player_id": pd.array([7839, 3476, 44], dtype="Int64"),
+    })
+
+def test_compute_metrics_counts_rows_and_nulls_per_key(scorers_frame):
+    metrics = compute_metrics(scorers_frame, ["player_id", "competition_id"])
+    assert metrics == {"row_count": 3, "null_counts": {"player_id": 0, "competition_id": 1}}
+
+def test_validate_dataframe_returns_metrics_for_reuse(scorers_frame):
+    metrics = validate_dataframe(scorers_frame.dropna(), "player_id", "PL")
+    assert metrics["row_count"] == 2
+
+def test_validate_dataframe_rejects_nulls_in_any_key_column(scorers_frame):
+    with pytest.raises(ValueError, match="competition_id"):
+        validate_dataframe(scorers_frame, "player_id", "PL", key_columns=["competition_id"])
+
+def test_validate_dataframe_rejects_empty_frame():
+    with pytest.raises(ValueError, match="empty DataFrame"):
+        validate_dataframe(pd.DataFrame({"team_id": []}), "team_id", "PL")